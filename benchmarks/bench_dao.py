@@ -0,0 +1,107 @@
+"""
+DatabaseDAO 增删改查与 execute_sql 大结果集基准（需要本机MySQL，连不上时跳过）
+全部读写都在独立的基准库中进行，不经过 db_dao 单例，不会碰到工具自身库里的数据
+"""
+import time
+from config import DB_CONFIG
+from benchmarks.common import timeit, make_result, make_skipped
+
+BENCH_PREFIX = "__bench__"
+BENCH_DB = f"{DB_CONFIG['db']}_bench"
+
+
+def bench_dao():
+    """指向基准库的 DAO 实例（DatabaseDAO 子类，单例与 db_dao 互不影响）"""
+    from db.dao import DatabaseDAO
+
+    class BenchDAO(DatabaseDAO):
+        _instance = None
+        db_config = dict(DB_CONFIG, db=BENCH_DB)
+
+    return BenchDAO()
+
+
+def mysql_available():
+    """检测 DB_CONFIG 指向的MySQL是否可用，返回 (是否可用, 原因)"""
+    try:
+        import pymysql
+        conn = pymysql.connect(host=DB_CONFIG["host"], user=DB_CONFIG["user"], password=DB_CONFIG["password"],
+                               port=DB_CONFIG["port"], charset=DB_CONFIG["charset"], connect_timeout=3)
+        conn.close()
+        return True, ""
+    except Exception as e:
+        return False, str(e)
+
+
+def prepare_rows(row_count):
+    """在独立的基准库中准备 row_count 行测试数据（已存在则复用）"""
+    import pymysql
+    conn = pymysql.connect(host=DB_CONFIG["host"], user=DB_CONFIG["user"], password=DB_CONFIG["password"],
+                           port=DB_CONFIG["port"], charset=DB_CONFIG["charset"], autocommit=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {BENCH_DB} DEFAULT CHARACTER SET utf8mb4")
+        conn.select_db(BENCH_DB)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bench_rows (
+                id INT PRIMARY KEY,
+                name VARCHAR(64),
+                amount DECIMAL(12, 2),
+                remark VARCHAR(255),
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        cursor.execute("SELECT COUNT(*) FROM bench_rows")
+        existing = cursor.fetchone()[0]
+        batch = []
+        for i in range(existing, row_count):
+            batch.append((i, f"name_{i}", i * 1.5, "基准测试数据" * 4))
+            if len(batch) >= 5000:
+                cursor.executemany("INSERT INTO bench_rows (id, name, amount, remark) VALUES (%s, %s, %s, %s)", batch)
+                batch = []
+        if batch:
+            cursor.executemany("INSERT INTO bench_rows (id, name, amount, remark) VALUES (%s, %s, %s, %s)", batch)
+    finally:
+        conn.close()
+
+
+def run(repeat=5, crud_count=200, result_rows=(10000, 100000)):
+    ok, reason = mysql_available()
+    if not ok:
+        return [make_skipped("dao", "all", f"MySQL不可用：{reason}")]
+
+    dao = bench_dao()
+    results = []
+
+    # 增删改查：每项操作的单次耗时
+    names = [f"{BENCH_PREFIX}{i}_{int(time.time())}" for i in range(crud_count)]
+    add_samples, update_samples, delete_samples = [], [], []
+    for name in names:
+        start = time.perf_counter()
+        dao.add_api({"name": name, "url": "http://127.0.0.1/bench", "method": "GET",
+                        "params": "{}", "headers": "{}"})
+        add_samples.append((time.perf_counter() - start) * 1000)
+    results.append(make_result("dao", "add_api", add_samples))
+
+    results.append(make_result("dao", "get_all_apis", timeit(dao.get_all_apis, repeat=repeat)))
+
+    bench_apis = [api for api in dao.get_all_apis() if api["name"].startswith(BENCH_PREFIX)]
+    for api in bench_apis:
+        start = time.perf_counter()
+        dao.update_api(api["id"], dict(api, url="http://127.0.0.1/bench2"))
+        update_samples.append((time.perf_counter() - start) * 1000)
+    results.append(make_result("dao", "update_api", update_samples))
+
+    for api in bench_apis:
+        start = time.perf_counter()
+        dao.delete_api(api["id"])
+        delete_samples.append((time.perf_counter() - start) * 1000)
+    results.append(make_result("dao", "delete_api", delete_samples))
+
+    # execute_sql 大结果集
+    prepare_rows(max(result_rows))
+    for rows in result_rows:
+        sql = f"SELECT * FROM bench_rows ORDER BY id LIMIT {rows}"
+        samples = timeit(lambda: dao.execute_sql(BENCH_DB, sql), repeat=repeat)
+        results.append(make_result("dao", f"execute_sql_{rows}_rows", samples, rows=rows))
+    return results
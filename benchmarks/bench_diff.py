@@ -0,0 +1,55 @@
+"""数据对比基准：大JSON结构对比、按主键对比结果集（全部在内存 vs 分区写入临时文件）的耗时与峰值内存"""
+import tracemalloc
+from benchmarks.common import timeit, make_result
+from utils.diff_utils import diff_json, diff_row_batches
+
+
+def synthetic_body(items, changed_every=100):
+    """接口响应体：items 个对象的列表，每 changed_every 个修改一个字段"""
+    old = {"code": 0, "data": [{"id": i, "name": f"item{i}", "tags": ["a", "b"], "price": i * 1.5}
+                               for i in range(items)]}
+    new = {"code": 0, "data": [dict(item, price=item["price"] + 1) if item["id"] % changed_every == 0 else item
+                               for item in old["data"]]}
+    return old, new
+
+
+def synthetic_batches(rows, batch_size=5000, changed_every=0):
+    """模拟 iter_query：按批生成 (列名, 行)，changed_every>0 时每隔若干行修改一列、删除一行"""
+    columns = ["id", "name", "amount", "created"]
+    batch = []
+    for i in range(rows):
+        if changed_every and i % changed_every == 1:
+            continue
+        amount = i * 3 + (1 if changed_every and i % changed_every == 0 else 0)
+        batch.append((i, f"user{i}", amount, "2024-01-01 00:00:00"))
+        if len(batch) == batch_size:
+            yield columns, batch
+            batch = []
+    yield columns, batch
+
+
+def run(repeat=3, json_items=(1000, 50000), row_counts=(100000, 500000), spill_rows=50000):
+    results = []
+    for items in json_items:
+        old, new = synthetic_body(items)
+        samples = timeit(lambda: diff_json(old, new), repeat=repeat)
+        results.append(make_result("diff", f"json_{items}", samples, items=items,
+                                   changes=diff_json(old, new).total))
+
+    for rows in row_counts:
+        for mode, memory_rows in (("memory", rows * 4), ("spill", spill_rows)):
+            def run_diff():
+                return diff_row_batches(synthetic_batches(rows), synthetic_batches(rows, changed_every=1000),
+                                        ["id"], memory_rows=memory_rows)
+
+            samples = timeit(run_diff, repeat=repeat, warmup=0)
+            # 峰值内存单独跑一次（tracemalloc 会明显拖慢耗时）
+            tracemalloc.start()
+            result = run_diff()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append(make_result("diff", f"rows_{mode}_{rows}", samples, rows=rows,
+                                       peak_mb=round(peak / 1024 / 1024, 1), spilled=result["spilled"],
+                                       changes=result["total"],
+                                       rows_per_sec=round(rows * 2 / (min(samples) / 1000))))
+    return results
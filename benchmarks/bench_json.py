@@ -0,0 +1,98 @@
+"""
+JSON处理基准：对比旧流程（标准库多次解析/序列化）与 json_utils 编解码路径
+用法：python -m benchmarks.bench_json [--sizes 1,10,50] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import string
+import time
+from utils import json_utils
+from utils.json_utils import JsonBody
+
+
+def make_payload(size_mb, seed=42):
+    """生成约 size_mb MB 的接口响应样例（嵌套对象 + 中文 + 数字）"""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    items = []
+    size = 0
+    while size < target:
+        item = {
+            "id": len(items),
+            "name": "".join(rng.choices(string.ascii_letters, k=12)),
+            "title": "测试数据" + str(rng.randint(0, 9999)),
+            "price": round(rng.random() * 1000, 2),
+            "tags": [rng.choice(["a", "b", "c", "热门", "新品"]) for _ in range(3)],
+            "detail": {"stock": rng.randint(0, 500), "enabled": rng.random() > 0.5, "remark": None}
+        }
+        items.append(item)
+        size += 180
+    return json.dumps({"code": 0, "data": {"list": items, "total": len(items)}}, ensure_ascii=False)
+
+
+def legacy_path(text):
+    """旧流程：format_json 解析+缩进，提取时再解析一次"""
+    pretty = json.dumps(json.loads(text), ensure_ascii=False, indent=2)
+    parsed = json.loads(text)
+    return pretty, parsed["data"]["total"]
+
+
+def codec_path(text):
+    """新流程：JsonBody 解析一次，提取与展示共用"""
+    body = JsonBody(text)
+    total = body.data["data"]["total"]
+    return body.pretty(), total
+
+
+def codec_parse_only(text):
+    """新流程（未打开查看器）：只解析不格式化"""
+    return JsonBody(text).data["data"]["total"]
+
+
+def measure(func, text, repeat):
+    """取多次运行的最小耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def run(sizes=(1, 10, 50), repeat=3):
+    """运行基准，返回结果列表"""
+    results = []
+    for size_mb in sizes:
+        text = make_payload(size_mb)
+        legacy = measure(legacy_path, text, repeat)
+        codec = measure(codec_path, text, repeat)
+        parse_only = measure(codec_parse_only, text, repeat)
+        results.append({
+            "group": "json",
+            "name": f"json_{size_mb}mb",
+            "bytes": len(text.encode("utf-8")),
+            "backend": "orjson" if json_utils.orjson is not None else "json",
+            "legacy_ms": legacy,
+            "codec_ms": codec,
+            "codec_parse_only_ms": parse_only,
+            "median_ms": codec,  # 回归对比的主指标（新流程耗时）
+            "speedup": round(legacy / codec, 2) if codec else None
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON处理基准")
+    parser.add_argument("--sizes", default="1,10,50", help="负载大小（MB，逗号分隔）")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数（取最小值）")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"{'负载':<12}{'后端':<8}{'旧流程(ms)':>12}{'新流程(ms)':>12}{'仅解析(ms)':>12}{'加速比':>8}")
+    for r in run(sizes, args.repeat):
+        print(f"{r['name']:<12}{r['backend']:<8}{r['legacy_ms']:>12}{r['codec_ms']:>12}"
+              f"{r['codec_parse_only_ms']:>12}{r['speedup']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Mock服务基准：路由索引匹配耗时（对比逐条正则匹配）与批量运行接口的吞吐"""
+import re
+import time
+from benchmarks.common import timeit, make_result
+from utils.batch_utils import run_batch
+from utils.mock_server import MockServer, build_routes, url_path, is_param_segment
+
+
+def synthetic_apis(count):
+    """一半静态路径、一半带路径参数的接口"""
+    apis = []
+    for i in range(count):
+        if i % 2:
+            url = f"{{{{base_url}}}}/api/v1/service{i}/items/{{{{id}}}}/detail"
+        else:
+            url = f"{{{{base_url}}}}/api/v1/service{i}/items"
+        apis.append({"id": i, "name": f"接口{i}", "url": url, "method": "GET" if i % 3 else "POST"})
+    return apis
+
+
+def linear_routes(apis):
+    """旧做法：每个接口一条正则，请求时逐条匹配"""
+    routes = []
+    for api in apis:
+        segments = url_path(api["url"]).split("/")
+        pattern = "/".join("[^/]+" if is_param_segment(s) else re.escape(s) for s in segments)
+        routes.append((api["method"], re.compile(pattern + "$")))
+    return routes
+
+
+def linear_match(routes, method, path):
+    for route_method, pattern in routes:
+        if route_method == method and pattern.match(path):
+            return route_method
+    return None
+
+
+def run(repeat=5, route_counts=(100, 2000), lookups=20000, batch_sizes=(200,), latency_ms=5):
+    results = []
+    for count in route_counts:
+        apis = synthetic_apis(count)
+        table = build_routes(apis)
+        linear = linear_routes(apis)
+        # 请求均匀分布在全部接口上（静态与带参数的路径各半）
+        requests = []
+        for i in range(lookups):
+            api = apis[i % count]
+            requests.append((api["method"], url_path(api["url"]).replace("{{id}}", str(i))))
+
+        def indexed():
+            for method, path in requests:
+                table.match(method, path)
+
+        def legacy():
+            for method, path in requests:
+                linear_match(linear, method, path)
+
+        samples = timeit(indexed, repeat=repeat)
+        legacy_ms = min(timeit(legacy, repeat=1, warmup=0))
+        median = sorted(samples)[len(samples) // 2]
+        results.append(make_result("mock", f"route_match_{count}", samples, routes=count, lookups=lookups,
+                                   legacy_ms=round(legacy_ms, 3), speedup=round(legacy_ms / median, 2)))
+
+    # 批量运行：接口全部指向Mock服务，每个请求固定延迟，考察批量运行的并发效果
+    apis = synthetic_apis(max(batch_sizes))
+    table = build_routes(apis)
+    with MockServer(table, port=0, latency_ms=latency_ms) as server:
+        variables = {"base_url": server.url, "id": 1}
+        for size in batch_sizes:
+            selected = apis[:size]
+            start = time.perf_counter()
+            result = run_batch(selected, variables=variables)
+            elapsed = time.perf_counter() - start
+            latencies = [case["elapsed_ms"] for case in result["cases"]]
+            results.append(make_result("mock", f"batch_{size}", latencies, latency_ms=latency_ms,
+                                       passed=result["counts"]["passed"],
+                                       requests_per_sec=round(size / elapsed, 1)))
+    return results
@@ -0,0 +1,61 @@
+"""send_request 延迟与吞吐基准（本地HTTP替身服务）"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import timeit, make_result
+from benchmarks.local_server import LocalHttpServer
+from utils.http_transport import available_backends, get_transport
+from utils.request_utils import execute_request, execute_request_async
+
+
+def run(repeat=20, sizes_kb=(1, 100, 1024), concurrency=(1, 8, 32), total_requests=400):
+    results = []
+    with LocalHttpServer() as server:
+        # 单请求延迟（不同响应体大小）
+        for size_kb in sizes_kb:
+            url = f"{server.url}/json?size_kb={size_kb}"
+            samples = timeit(lambda: execute_request(url, "GET"), repeat=repeat)
+            results.append(make_result("request", f"get_{size_kb}kb", samples, size_kb=size_kb))
+
+        # POST JSON（参数解析 + 序列化路径）
+        params = '{"user": "{{user}}", "page": 1, "size": 20}'
+        samples = timeit(lambda: execute_request(f"{server.url}/echo", "POST", params,
+                                                 variables={"user": "bench"}), repeat=repeat)
+        results.append(make_result("request", "post_json", samples))
+
+        # 吞吐：固定请求总数，按并发线程数统计每秒请求数
+        url = f"{server.url}/json?size_kb=1"
+        for workers in concurrency:
+            latencies = []
+
+            def task():
+                start = time.perf_counter()
+                execute_request(url, "GET")
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(task) for _ in range(total_requests)]:
+                    future.result()
+            elapsed = time.perf_counter() - start
+            results.append(make_result("request", f"throughput_c{workers}", latencies,
+                                       concurrency=workers,
+                                       requests_per_sec=round(total_requests / elapsed, 1)))
+
+        # 吞吐：httpx 异步后端，全部请求同时提交到事件循环，并发由连接池上限控制
+        if "httpx" in available_backends():
+            transport = get_transport("httpx")
+            latencies = []
+
+            async def task_async():
+                start = time.perf_counter()
+                await execute_request_async(url, "GET", backend="httpx")
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            for future in [transport.submit(task_async()) for _ in range(total_requests)]:
+                future.result()
+            elapsed = time.perf_counter() - start
+            results.append(make_result("request", "throughput_httpx", latencies,
+                                       max_connections=transport.max_connections,
+                                       requests_per_sec=round(total_requests / elapsed, 1)))
+    return results
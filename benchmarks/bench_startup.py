@@ -0,0 +1,84 @@
+"""
+启动耗时基准：启动子进程直到主窗口首次绘制（time-to-first-window），与 STARTUP_BUDGET_MS 对比
+默认测源码运行（python main.py）；设置环境变量 TOOL_STARTUP_EXE 为打包产物路径时测可执行文件
+子进程通过 TOOL_STARTUP_PROBE 写出进程内计时后自动退出，无需人工关闭窗口
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import make_result, make_skipped
+from config import STARTUP_BUDGET_MS
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 写出计时后等待进程退出的秒数，超时强制结束
+EXIT_TIMEOUT = 10
+
+
+def launch_once(command, timeout):
+    """启动一次，返回 (从启动到写出计时文件的耗时ms, 进程内计时)"""
+    fd, probe_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.remove(probe_path)
+    env = dict(os.environ, TOOL_STARTUP_PROBE=probe_path)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # 错误输出写临时文件（管道写满会阻塞子进程）
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=stderr)
+        try:
+            while not os.path.exists(probe_path):
+                if process.poll() is not None:
+                    stderr.seek(0)
+                    error = stderr.read().decode(errors="replace").strip().splitlines()
+                    raise RuntimeError(error[-1] if error else f"进程退出，返回码 {process.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"{timeout} 秒内未显示主窗口")
+                time.sleep(0.002)
+            wall_ms = (time.perf_counter() - start) * 1000
+            with open(probe_path, "r", encoding="utf-8") as f:
+                timings = json.load(f)
+            return wall_ms, timings
+        finally:
+            try:
+                # 出错时不再等待，直接结束进程
+                process.wait(timeout=EXIT_TIMEOUT if os.path.exists(probe_path) else 0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            if os.path.exists(probe_path):
+                os.remove(probe_path)
+
+
+def run(repeat=5, warmup=1, timeout=60):
+    exe = os.environ.get("TOOL_STARTUP_EXE")
+    if exe:
+        command, name = [exe], f"first_window({os.path.basename(exe)})"
+    else:
+        try:
+            import PyQt6  # noqa: F401
+        except ImportError as e:
+            return [make_skipped("startup", "all", f"PyQt6不可用：{e}")]
+        command, name = [sys.executable, "main.py"], "first_window(source)"
+
+    try:
+        for _ in range(warmup):
+            launch_once(command, timeout)  # 预热文件系统缓存（打包产物首次解压尤其慢）
+        samples, in_process, deferred_loaded = [], [], set()
+        for _ in range(repeat):
+            wall_ms, timings = launch_once(command, timeout)
+            samples.append(wall_ms)
+            if "first_paint_ms" in timings:
+                in_process.append(timings["first_paint_ms"])
+            deferred_loaded.update(timings.get("deferred_loaded", []))
+    except RuntimeError as e:
+        return [make_skipped("startup", name, str(e))]
+
+    result = make_result("startup", name, samples, budget_ms=STARTUP_BUDGET_MS,
+                         deferred_loaded=sorted(deferred_loaded))
+    if in_process:
+        result["in_process_ms"] = round(sorted(in_process)[len(in_process) // 2], 3)
+    result["over_budget"] = result["median_ms"] > STARTUP_BUDGET_MS
+    return [result]
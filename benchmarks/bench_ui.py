@@ -0,0 +1,60 @@
+"""接口/SQL列表加载耗时基准（offscreen Qt，DAO 查询替换为内存数据，只测表格填充）"""
+import os
+from datetime import datetime
+from benchmarks.common import timeit, make_result, make_skipped
+
+
+def fake_apis(count):
+    now = datetime.now()
+    return [{"id": i, "name": f"接口_{i}", "url": f"https://api.example.com/v1/resource/{i}", "method": "GET",
+             "params": "{}", "headers": "{}", "create_time": now, "update_time": now} for i in range(count)]
+
+
+def fake_sql_scripts(count):
+    now = datetime.now()
+    return [{"id": i, "name": f"脚本_{i}", "description": "基准测试脚本", "db_name": "test_db",
+             "table_name": "user_info", "sql_content": "SELECT * FROM user_info LIMIT 10",
+             "create_time": now, "update_time": now} for i in range(count)]
+
+
+def run(repeat=3, row_counts=(1000, 10000)):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError as e:
+        return [make_skipped("ui", "all", f"PyQt6不可用：{e}")]
+    app = QApplication.instance() or QApplication([])
+
+    from db.dao import db_dao
+    db_dao.get_all_envs = lambda: []
+    results = []
+    try:
+        from ui.api_module import ApiModule
+        from ui.db_module import SqlScriptWidget
+        db_dao.get_all_apis = lambda: []
+        db_dao.get_all_sql_scripts = lambda: []
+        api_module = ApiModule()
+        sql_widget = SqlScriptWidget()
+        for count in row_counts:
+            apis = fake_apis(count)
+            scripts = fake_sql_scripts(count)
+            db_dao.get_all_apis = lambda: apis
+            db_dao.get_all_sql_scripts = lambda: scripts
+
+            def load_apis():
+                api_module.load_api_list()
+                app.processEvents()
+
+            def load_sqls():
+                sql_widget.load_sql_list()
+                app.processEvents()
+
+            results.append(make_result("ui", f"load_api_list_{count}", timeit(load_apis, repeat=repeat, warmup=0),
+                                       rows=count))
+            results.append(make_result("ui", f"load_sql_list_{count}", timeit(load_sqls, repeat=repeat, warmup=0),
+                                       rows=count))
+    finally:
+        # 去掉实例上的替身，恢复类方法
+        for name in ("get_all_apis", "get_all_sql_scripts", "get_all_envs"):
+            db_dao.__dict__.pop(name, None)
+    return results
@@ -0,0 +1,40 @@
+import statistics
+import time
+
+
+def timeit(func, repeat=5, warmup=1):
+    """重复执行 func，返回每次耗时（毫秒）列表"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    """耗时样本统计（毫秒）"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(len(ordered) * 0.95)) - 1)
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[max(p95_index, 0)], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3)
+    }
+
+
+def make_result(group, name, samples, **extra):
+    """统一的基准结果格式，median_ms 作为回归对比的主指标"""
+    result = {"group": group, "name": name}
+    result.update(summarize(samples))
+    result.update(extra)
+    return result
+
+
+def make_skipped(group, name, reason):
+    """记录跳过的基准（如本机没有MySQL）"""
+    return {"group": group, "name": name, "skipped": reason}
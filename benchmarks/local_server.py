@@ -0,0 +1,61 @@
+"""本地HTTP替身服务：为请求类基准提供稳定、无网络抖动的后端"""
+import json
+import threading
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+@lru_cache(maxsize=16)
+def json_payload(size_kb):
+    """约 size_kb KB 的JSON响应体（按大小缓存）"""
+    item = {"id": 0, "name": "benchmark", "title": "基准测试数据", "price": 12.5, "enabled": True}
+    per_item = len(json.dumps(item, ensure_ascii=False).encode("utf-8")) + 1
+    count = max(1, size_kb * 1024 // per_item)
+    items = [dict(item, id=i) for i in range(count)]
+    return json.dumps({"code": 0, "data": {"list": items, "total": count}}, ensure_ascii=False).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持keep-alive，贴近真实服务
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        size_kb = int(query.get("size_kb", ["1"])[0])
+        self._send(200, json_payload(size_kb))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b"{}"
+        self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalHttpServer:
+    """后台线程运行的本地HTTP服务（with 语句自动启停，端口0表示随机端口）"""
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
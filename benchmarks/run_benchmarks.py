@@ -0,0 +1,135 @@
+"""
+基准测试入口（无界面运行，结果保存为JSON便于回归对比）
+用法：
+  python -m benchmarks.run_benchmarks                         # 运行全部
+  python -m benchmarks.run_benchmarks --groups request,json   # 只运行部分分组
+  python -m benchmarks.run_benchmarks --quick                 # 缩小数据量，快速冒烟
+  python -m benchmarks.run_benchmarks --groups mock           # Mock服务路由与批量运行吞吐
+  python -m benchmarks.run_benchmarks --groups diff           # 数据对比（JSON结构对比、结果集分区对比的内存占用）
+  python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json --threshold 0.2
+  TOOL_STARTUP_EXE=dist/main/main.exe python -m benchmarks.run_benchmarks --groups startup   # 测打包产物启动耗时
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# 分组 -> (模块, 完整参数, 快速参数)
+SUITES = {
+    "json": ("benchmarks.bench_json", {"sizes": (1, 10, 50), "repeat": 3}, {"sizes": (1,), "repeat": 1}),
+    "request": ("benchmarks.bench_request", {}, {"repeat": 5, "sizes_kb": (1, 100), "concurrency": (1, 8),
+                                                 "total_requests": 100}),
+    "dao": ("benchmarks.bench_dao", {}, {"repeat": 2, "crud_count": 20, "result_rows": (10000,)}),
+    "ui": ("benchmarks.bench_ui", {}, {"repeat": 1, "row_counts": (1000,)}),
+    "startup": ("benchmarks.bench_startup", {}, {"repeat": 2, "warmup": 0}),
+    "mock": ("benchmarks.bench_mock", {}, {"repeat": 2, "route_counts": (100,), "lookups": 2000,
+                                           "batch_sizes": (50,)}),
+    "diff": ("benchmarks.bench_diff", {}, {"repeat": 1, "json_items": (1000,), "row_counts": (20000,),
+                                           "spill_rows": 5000})
+}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except Exception:
+        return ""
+
+
+def run_suites(groups, quick=False):
+    results = []
+    for group in groups:
+        module_name, full_kwargs, quick_kwargs = SUITES[group]
+        print(f"运行 {group} ...", flush=True)
+        try:
+            module = importlib.import_module(module_name)
+            results.extend(module.run(**(quick_kwargs if quick else full_kwargs)))
+        except ImportError as e:
+            results.append({"group": group, "name": "all", "skipped": f"缺少依赖：{e}"})
+        except Exception as e:
+            results.append({"group": group, "name": "all", "skipped": f"运行失败：{e}"})
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """与基线对比 median_ms，返回回归项列表"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["group"], r["name"]): r for r in json.load(f)["results"]}
+    regressions = []
+    print(f"\n与基线对比（{baseline_path}，阈值 {threshold:.0%}）：")
+    for result in results:
+        old = baseline.get((result["group"], result["name"]))
+        if not old or "median_ms" not in result or "median_ms" not in old or not old["median_ms"]:
+            continue
+        change = (result["median_ms"] - old["median_ms"]) / old["median_ms"]
+        flag = "回归" if change > threshold else ""
+        print(f"  {result['group']:<8}{result['name']:<28}{old['median_ms']:>10.2f} → {result['median_ms']:>10.2f} ms"
+              f"  {change:+.1%} {flag}")
+        if change > threshold:
+            regressions.append(result["name"])
+    return regressions
+
+
+def print_results(results):
+    print(f"\n{'分组':<8}{'名称':<28}{'中位数(ms)':>12}{'P95(ms)':>12}  备注")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['group']:<8}{r['name']:<28}{'-':>12}{'-':>12}  跳过：{r['skipped']}")
+            continue
+        note = f"{r['requests_per_sec']} req/s" if "requests_per_sec" in r else ""
+        if "speedup" in r:
+            note = f"旧流程 {r['legacy_ms']} ms，加速 {r['speedup']}x"
+        if "budget_ms" in r:
+            note = f"预算 {r['budget_ms']} ms" + ("，超出预算" if r["over_budget"] else "")
+            if r.get("deferred_loaded"):
+                note += f"，启动时已导入：{', '.join(r['deferred_loaded'])}"
+        print(f"{r['group']:<8}{r['name']:<28}{r['median_ms']:>12.2f}{r.get('p95_ms', r['median_ms']):>12.2f}  {note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多功能工具平台基准测试")
+    parser.add_argument("--groups", default=",".join(SUITES), help=f"分组（逗号分隔）：{','.join(SUITES)}")
+    parser.add_argument("--quick", action="store_true", help="缩小数据量快速运行")
+    parser.add_argument("--output", help="结果文件路径（默认 benchmarks/results/<时间>.json）")
+    parser.add_argument("--compare", help="基线结果文件，存在回归时退出码为1")
+    parser.add_argument("--threshold", type=float, default=0.2, help="回归阈值（中位数变慢比例）")
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = [g for g in groups if g not in SUITES]
+    if unknown:
+        parser.error(f"未知分组：{', '.join(unknown)}")
+
+    results = run_suites(groups, args.quick)
+    print_results(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "results": results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存：{output}")
+
+    over_budget = [r["name"] for r in results if r.get("over_budget")]
+    if over_budget:
+        print(f"\n超出启动耗时预算：{', '.join(over_budget)}")
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    if regressions or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,5 +11,52 @@ DB_CONFIG = {
 # 接口请求超时时间（秒）
 REQUEST_TIMEOUT = 10
 
+# HTTP客户端后端："requests"（阻塞，一个请求占一个线程）或 "httpx"（asyncio 单线程并发，需安装 httpx，HTTP/2 另需 h2）
+HTTP_BACKEND = "requests"
+# httpx 后端：连接池总连接数上限、空闲保持的连接数、是否启用HTTP/2（同一连接多路复用）
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 20
+HTTP2_ENABLED = True
+
+# Mock服务（python -m tool mock）默认监听地址与端口
+MOCK_HOST = "127.0.0.1"
+MOCK_PORT = 8800
+# 在界面运行接口时保存最近一次响应，供 Mock 服务回放（默认关闭，界面上勾选「录制响应」后才保存）
+MOCK_RECORD_RESPONSES = False
+# 录制的响应体上限（api_response_record.body 为 MEDIUMTEXT，按字节计），超出时不保存
+MOCK_RECORD_MAX_BYTES = 16 * 1024 * 1024 - 1
+
+# 工作流并发步骤数（无依赖关系的步骤同时执行的上限）
+WORKFLOW_MAX_WORKERS = 8
+
+# 结果文本区最多显示的响应体字符数（超出部分在JSON树中查看，避免大文本排版卡顿）
+RESULT_TEXT_LIMIT = 1000000
+
+# 批量运行接口/SQL脚本（命令行 python -m tool）的并发数
+BATCH_MAX_WORKERS = 8
+
+# 多库并行执行SQL的并发数（同时也是目标库连接池的连接数上限）
+SQL_MAX_PARALLEL = 8
+
+# 导出查询结果时每批读取/写入的行数（服务端游标流式读取，内存占用与总行数无关）
+EXPORT_BATCH_SIZE = 5000
+
+# 数据对比：最多列出的差异条数（各类差异的计数不受限制）
+DIFF_MAX_CHANGES = 1000
+# 对比查询结果时内存中最多缓存的行数（两侧合计），超出后按主键哈希分区写入临时文件，再逐个分区对比
+DIFF_MEMORY_ROWS = 200000
+DIFF_PARTITIONS = 64
+
+# 库表结构缓存（information_schema 元数据本地缓存文件及有效期，单位秒）
+SCHEMA_CACHE_PATH = "cache/schema_cache.json"
+SCHEMA_CACHE_TTL = 3600
+
+# 启动耗时预算（毫秒，从进程启动到主窗口首次绘制），启动基准超出时视为回归
+STARTUP_BUDGET_MS = 1500
+
+# 系统操作（环境变量/服务/开机自启）批次日志目录（用于回滚），以及单个系统命令的超时时间（秒）
+ACTIONS_JOURNAL_DIR = "cache/actions"
+ACTIONS_TIMEOUT = 120
+
 # 样式表路径
 QSS_PATH = "resources/qss/style.qss"
\ No newline at end of file
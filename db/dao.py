@@ -1,35 +1,74 @@
-import pymysql
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from config import DB_CONFIG
-from utils.common_utils import show_error
+from config import DB_CONFIG, EXPORT_BATCH_SIZE, SQL_MAX_PARALLEL, MOCK_RECORD_MAX_BYTES
+from db.pool import ConnectionPool
+from utils.explain_utils import build_plan_tree, summarize_plan
+from utils.json_utils import dumps, loads
+from utils.lazy_import import lazy_import
+from utils.metrics_utils import metrics
+from utils.notify_utils import notify_error, notify_warning
+from utils.schema_cache import get_schema_cache
+from utils.sql_utils import split_statements, statement_type, is_query, is_ddl, parse_target_dbs, EXPLAINABLE_TYPES
+from utils.template_utils import render_template
+
+# 首次访问数据库时才导入驱动（缩短启动时间）
+pymysql = lazy_import("pymysql")
+
+# 系统库（不加载其库表结构）
+SYSTEM_SCHEMAS = ("information_schema", "mysql", "performance_schema", "sys")
+# 录制响应时不保存的响应头（会话凭据，Mock 回放也不需要）
+RECORD_SKIP_HEADERS = {"set-cookie", "set-cookie2", "authorization", "proxy-authorization"}
+
+class QueryColumns(list):
+    """流式查询的列名列表，附带 cursor.description（导出 Parquet 时按 MySQL 列类型确定列类型）"""
+    def __init__(self, description):
+        super().__init__(desc[0] for desc in description)
+        self.description = description
 
 class DatabaseDAO:
-    _instance = None  # 单例模式
+    _instance = None  # 单例模式（每个子类单独一个实例）
+    db_config = DB_CONFIG  # 工具自身的库（子类可指向其他库，如基准测试用的独立库）
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.conn = None
-            cls._instance.init_db()
+            cls._instance.target_pools = {}  # {连接配置ID（默认连接为None）: 连接池}
+            cls._instance.profile_kwargs = {}  # {连接配置ID: pymysql 连接参数}
+            cls._instance._pool_lock = threading.Lock()
+            # 建库建表推迟到第一次访问数据库时（窗口先显示，不等待MySQL连接）
+            cls._instance._initialized = False
+            cls._instance._init_lock = threading.Lock()
         return cls._instance
 
+    def ensure_initialized(self):
+        """首次访问数据库时初始化（只执行一次，多线程同时访问时等待初始化完成）"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if not self._initialized:
+                with metrics.span("dao.init_db"):
+                    self.init_db()
+                self._initialized = True
+
     def init_db(self):
         """初始化数据库（创建库、表）"""
         try:
             # 1. 连接MySQL服务器（不指定数据库）
             conn = pymysql.connect(
-                host=DB_CONFIG["host"],
-                user=DB_CONFIG["user"],
-                password=DB_CONFIG["password"],
-                port=DB_CONFIG["port"],
-                charset=DB_CONFIG["charset"]
+                host=self.db_config["host"],
+                user=self.db_config["user"],
+                password=self.db_config["password"],
+                port=self.db_config["port"],
+                charset=self.db_config["charset"]
             )
             cursor = conn.cursor()
 
             # 2. 创建数据库（如果不存在）
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['db']} DEFAULT CHARACTER SET utf8mb4")
-            conn.select_db(DB_CONFIG["db"])
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.db_config['db']} DEFAULT CHARACTER SET utf8mb4")
+            conn.select_db(self.db_config["db"])
 
             # 3. 创建接口表
             create_api_table_sql = """
@@ -40,6 +79,7 @@ class DatabaseDAO:
                 method VARCHAR(20) NOT NULL COMMENT '请求方法（GET/POST等）',
                 params TEXT COMMENT '请求参数（JSON字符串）',
                 headers TEXT COMMENT '请求头（JSON字符串）',
+                assertions TEXT COMMENT '响应断言（JSON数组）',
                 create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
                 update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 UNIQUE KEY uk_name (name)
@@ -56,6 +96,8 @@ class DatabaseDAO:
                 db_name VARCHAR(100) NOT NULL COMMENT '目标库名',
                 table_name VARCHAR(100) COMMENT '目标表名',
                 sql_content TEXT NOT NULL COMMENT 'SQL内容',
+                target_dbs VARCHAR(1000) COMMENT '多库执行的目标库（库名列表或通配符，逗号分隔）',
+                connection_id INT COMMENT '连接配置ID（为空时使用默认连接）',
                 create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
                 update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 UNIQUE KEY uk_name (name)
@@ -63,53 +105,177 @@ class DatabaseDAO:
             """
             cursor.execute(create_sql_table_sql)
 
+            # 5. 创建环境配置表（dev/test/prod 等环境变量）
+            create_env_table_sql = """
+            CREATE TABLE IF NOT EXISTS env_profile (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                name VARCHAR(100) NOT NULL COMMENT '环境名称',
+                description VARCHAR(500) COMMENT '描述',
+                variables TEXT COMMENT '环境变量（JSON字符串）',
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+                update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_name (name)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='环境配置表';
+            """
+            cursor.execute(create_env_table_sql)
+
+            # 6. 创建接口工作流表（多个接口按依赖关系串联执行）
+            create_workflow_table_sql = """
+            CREATE TABLE IF NOT EXISTS api_workflow (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                name VARCHAR(100) NOT NULL COMMENT '工作流名称',
+                description VARCHAR(500) COMMENT '描述',
+                steps TEXT NOT NULL COMMENT '步骤定义（JSON数组）',
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+                update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_name (name)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='接口工作流表';
+            """
+            cursor.execute(create_workflow_table_sql)
+
+            # 7. 创建数据库连接配置表（SQL脚本可指定在哪个连接上执行）
+            create_connection_table_sql = """
+            CREATE TABLE IF NOT EXISTS db_connection (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                name VARCHAR(100) NOT NULL COMMENT '连接名称',
+                host VARCHAR(255) NOT NULL COMMENT '主机',
+                port INT NOT NULL DEFAULT 3306 COMMENT '端口',
+                user VARCHAR(100) NOT NULL COMMENT '用户名',
+                password VARCHAR(255) COMMENT '密码',
+                charset VARCHAR(20) DEFAULT 'utf8mb4' COMMENT '字符集',
+                use_ssl TINYINT(1) DEFAULT 0 COMMENT '是否使用SSL',
+                ssl_ca VARCHAR(500) COMMENT 'CA证书路径（为空时不校验服务器证书）',
+                pool_size INT DEFAULT 8 COMMENT '连接池大小',
+                description VARCHAR(500) COMMENT '描述',
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+                update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_name (name)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='数据库连接配置表';
+            """
+            cursor.execute(create_connection_table_sql)
+
+            # 8. 创建接口响应记录表（每个接口保存最近一次响应，供 Mock 服务回放）
+            create_response_record_table_sql = """
+            CREATE TABLE IF NOT EXISTS api_response_record (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                api_id INT NOT NULL COMMENT '接口ID',
+                status_code INT NOT NULL COMMENT '响应状态码',
+                headers TEXT COMMENT '响应头（JSON字符串）',
+                body MEDIUMTEXT COMMENT '响应体',
+                elapsed_ms DOUBLE COMMENT '请求耗时（毫秒）',
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+                update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_api_id (api_id)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='接口响应记录表';
+            """
+            cursor.execute(create_response_record_table_sql)
+
+            # 9. 旧版本创建的表补充新增的列
+            self._ensure_column(cursor, "api_info", "assertions",
+                                "TEXT COMMENT '响应断言（JSON数组）' AFTER headers")
+            self._ensure_column(cursor, "sql_script", "target_dbs",
+                                "VARCHAR(1000) COMMENT '多库执行的目标库（库名列表或通配符，逗号分隔）' AFTER sql_content")
+            self._ensure_column(cursor, "sql_script", "connection_id",
+                                "INT COMMENT '连接配置ID（为空时使用默认连接）' AFTER target_dbs")
+
             conn.commit()
             cursor.close()
             conn.close()
 
-            # 5. 连接目标数据库
+            # 10. 连接目标数据库
             self.connect_db()
         except Exception as e:
-            show_error("数据库初始化失败", f"原因：{str(e)}")
+            notify_error("数据库初始化失败", f"原因：{str(e)}", source="dao")
+
+    def _ensure_column(self, cursor, table_name, column_name, definition):
+        """列不存在时添加（兼容旧版本创建的表）"""
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s "
+            "AND COLUMN_NAME = %s", (self.db_config["db"], table_name, column_name))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}")
 
     def connect_db(self):
         """连接数据库"""
         try:
-            self.conn = pymysql.connect(**DB_CONFIG)
+            self.conn = pymysql.connect(**self.db_config)
             self.conn.autocommit(True)
         except Exception as e:
-            show_error("数据库连接失败", f"原因：{str(e)}")
+            notify_error("数据库连接失败", f"原因：{str(e)}", source="dao")
             self.conn = None
 
     def get_cursor(self):
-        """获取游标（自动重连）"""
+        """获取游标（首次调用时初始化，自动重连）"""
+        self.ensure_initialized()
         if not self.conn or self.conn._closed:
             self.connect_db()
         return self.conn.cursor(pymysql.cursors.DictCursor)
 
     # ------------------------------ 接口表操作 ------------------------------
+    @metrics.timed("dao.add_api")
     def add_api(self, api_data):
-        """添加接口：api_data = {name, url, method, params, headers}"""
+        """添加接口：api_data = {name, url, method, params, headers, assertions}"""
         try:
             cursor = self.get_cursor()
             sql = """
-            INSERT INTO api_info (name, url, method, params, headers)
-            VALUES (%s, %s, %s, %s, %s)
+            INSERT INTO api_info (name, url, method, params, headers, assertions)
+            VALUES (%s, %s, %s, %s, %s, %s)
             """
-            # 转换字典为JSON字符串
-            params_str = json.dumps(api_data.get("params", {}), ensure_ascii=False)
-            headers_str = json.dumps(api_data.get("headers", {}), ensure_ascii=False)
+            # 转换字典为JSON字符串（表单传入的JSON文本原样保存，避免二次编码）
+            params_str = self._dump_json(api_data.get("params", {}))
+            headers_str = self._dump_json(api_data.get("headers", {}))
+            assertions_str = self._dump_json(api_data.get("assertions", []))
             cursor.execute(
                 sql,
-                (api_data["name"], api_data["url"], api_data["method"], params_str, headers_str)
+                (api_data["name"], api_data["url"], api_data["method"], params_str, headers_str, assertions_str)
             )
             return True
         except pymysql.IntegrityError:
-            show_error("添加失败", f"接口名称「{api_data['name']}」已存在！")
+            notify_error("添加失败", f"接口名称「{api_data['name']}」已存在！", source="dao")
         except Exception as e:
-            show_error("添加接口失败", str(e))
+            notify_error("添加接口失败", str(e), source="dao")
         return False
 
+    @metrics.timed("dao.bulk_add_apis")
+    def bulk_add_apis(self, apis, chunk_size=1000):
+        """
+        批量添加接口（导入HAR/cURL用）：apis 为可迭代对象，按块 executemany 插入，整批一个事务
+        名称已存在的接口跳过（ON DUPLICATE KEY UPDATE id = id，不用 INSERT IGNORE，超长等数据错误照常报错而不是被截断）；
+        使用独立连接，可在后台线程调用；返回实际插入的数量，失败返回 None
+        """
+        # 已存在的行 id = id 不变，影响行数为0，executemany 的返回值即插入数量
+        sql = """
+        INSERT INTO api_info (name, url, method, params, headers)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = id
+        """
+        conn = None
+        try:
+            self.ensure_initialized()
+            conn = pymysql.connect(**self.db_config)
+            cursor = conn.cursor()
+            inserted = 0
+            rows = []
+            for api_data in apis:
+                rows.append((api_data["name"], api_data["url"], api_data["method"],
+                             self._dump_json(api_data.get("params", {})), self._dump_json(api_data.get("headers", {}))))
+                if len(rows) >= chunk_size:
+                    inserted += cursor.executemany(sql, rows)
+                    rows = []
+            if rows:
+                inserted += cursor.executemany(sql, rows)
+            conn.commit()
+            return inserted
+        except Exception as e:
+            if conn and conn.open:
+                conn.rollback()
+            notify_error("批量导入接口失败", str(e), source="dao")
+        finally:
+            if conn:
+                conn.close()
+        return None
+
+    @metrics.timed("dao.get_all_apis")
     def get_all_apis(self):
         """查询所有接口"""
         try:
@@ -117,9 +283,10 @@ class DatabaseDAO:
             cursor.execute("SELECT * FROM api_info ORDER BY update_time DESC")
             return cursor.fetchall()
         except Exception as e:
-            show_error("查询接口失败", str(e))
+            notify_error("查询接口失败", str(e), source="dao")
         return []
 
+    @metrics.timed("dao.get_api_by_id")
     def get_api_by_id(self, api_id):
         """根据ID查询接口"""
         try:
@@ -127,71 +294,135 @@ class DatabaseDAO:
             cursor.execute("SELECT * FROM api_info WHERE id = %s", (api_id,))
             return cursor.fetchone()
         except Exception as e:
-            show_error("查询接口失败", str(e))
+            notify_error("查询接口失败", str(e), source="dao")
         return None
 
+    @metrics.timed("dao.update_api")
     def update_api(self, api_id, api_data):
         """更新接口"""
         try:
             cursor = self.get_cursor()
             sql = """
-            UPDATE api_info SET name = %s, url = %s, method = %s, params = %s, headers = %s
+            UPDATE api_info SET name = %s, url = %s, method = %s, params = %s, headers = %s, assertions = %s
             WHERE id = %s
             """
-            params_str = json.dumps(api_data.get("params", {}), ensure_ascii=False)
-            headers_str = json.dumps(api_data.get("headers", {}), ensure_ascii=False)
+            params_str = self._dump_json(api_data.get("params", {}))
+            headers_str = self._dump_json(api_data.get("headers", {}))
+            assertions_str = self._dump_json(api_data.get("assertions", []))
             cursor.execute(
                 sql,
-                (api_data["name"], api_data["url"], api_data["method"], params_str, headers_str, api_id)
+                (api_data["name"], api_data["url"], api_data["method"], params_str, headers_str, assertions_str,
+                 api_id)
             )
             return cursor.rowcount > 0
         except pymysql.IntegrityError:
-            show_error("更新失败", f"接口名称「{api_data['name']}」已存在！")
+            notify_error("更新失败", f"接口名称「{api_data['name']}」已存在！", source="dao")
         except Exception as e:
-            show_error("更新接口失败", str(e))
+            notify_error("更新接口失败", str(e), source="dao")
         return False
 
+    @metrics.timed("dao.delete_api")
     def delete_api(self, api_id):
         """删除接口"""
         try:
             cursor = self.get_cursor()
             cursor.execute("DELETE FROM api_info WHERE id = %s", (api_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM api_response_record WHERE api_id = %s", (api_id,))
+            return deleted
+        except Exception as e:
+            notify_error("删除接口失败", str(e), source="dao")
+        return False
+
+    # ------------------------------ 接口响应记录表操作 ------------------------------
+    @metrics.timed("dao.save_response_record")
+    def save_response_record(self, api_id, result):
+        """
+        保存接口最近一次响应（result 为 execute_request 的结果，同一接口覆盖旧记录）
+        不保存 Set-Cookie 等凭据类响应头，超过 MOCK_RECORD_MAX_BYTES 的响应体不保存；使用独立连接，可在后台线程调用
+        """
+        body = result["text"]
+        size = len(body.encode("utf-8"))
+        if size > MOCK_RECORD_MAX_BYTES:
+            notify_warning("未保存响应记录", f"响应体 {size // 1024 // 1024} MB，超过录制上限", source="dao")
+            return False
+        headers = {name: value for name, value in (result.get("headers") or {}).items()
+                   if name.lower() not in RECORD_SKIP_HEADERS}
+        sql = """
+        INSERT INTO api_response_record (api_id, status_code, headers, body, elapsed_ms)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE status_code = VALUES(status_code), headers = VALUES(headers),
+            body = VALUES(body), elapsed_ms = VALUES(elapsed_ms)
+        """
+        conn = None
+        try:
+            self.ensure_initialized()
+            conn = pymysql.connect(**self.db_config)
+            conn.cursor().execute(sql, (api_id, result["status_code"], self._dump_json(headers), body,
+                                        result.get("elapsed_ms")))
+            conn.commit()
+            return True
         except Exception as e:
-            show_error("删除接口失败", str(e))
+            notify_error("保存响应记录失败", str(e), source="dao")
+        finally:
+            if conn:
+                conn.close()
         return False
 
+    @metrics.timed("dao.get_response_records")
+    def get_response_records(self, api_ids=None):
+        """查询接口的响应记录（api_ids 为空时查询全部），返回 {接口ID: 记录}"""
+        try:
+            cursor = self.get_cursor()
+            if api_ids is None:
+                cursor.execute("SELECT * FROM api_response_record")
+            elif api_ids:
+                cursor.execute("SELECT * FROM api_response_record WHERE api_id IN %s", (list(api_ids),))
+            else:
+                return {}
+            return {record["api_id"]: record for record in cursor.fetchall()}
+        except Exception as e:
+            notify_error("查询响应记录失败", str(e), source="dao")
+        return {}
+
     # ------------------------------ SQL脚本表操作 ------------------------------
+    @metrics.timed("dao.add_sql_script")
     def add_sql_script(self, sql_data):
-        """添加SQL脚本：sql_data = {name, description, db_name, table_name, sql_content}"""
+        """添加SQL脚本：sql_data = {name, description, db_name, table_name, sql_content, target_dbs, connection_id}"""
         try:
             cursor = self.get_cursor()
             sql = """
-            INSERT INTO sql_script (name, description, db_name, table_name, sql_content)
-            VALUES (%s, %s, %s, %s, %s)
+            INSERT INTO sql_script (name, description, db_name, table_name, sql_content, target_dbs, connection_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
             """
             cursor.execute(
                 sql,
-                (sql_data["name"], sql_data["description"], sql_data["db_name"],
-                 sql_data["table_name"], sql_data["sql_content"])
+                (sql_data["name"], sql_data["description"], sql_data["db_name"], sql_data["table_name"],
+                 sql_data["sql_content"], sql_data.get("target_dbs", ""), sql_data.get("connection_id"))
             )
             return True
         except pymysql.IntegrityError:
-            show_error("添加失败", f"SQL脚本名称「{sql_data['name']}」已存在！")
+            notify_error("添加失败", f"SQL脚本名称「{sql_data['name']}」已存在！", source="dao")
         except Exception as e:
-            show_error("添加SQL脚本失败", str(e))
+            notify_error("添加SQL脚本失败", str(e), source="dao")
         return False
 
+    @metrics.timed("dao.get_all_sql_scripts")
     def get_all_sql_scripts(self):
         """查询所有SQL脚本"""
         try:
             cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM sql_script ORDER BY update_time DESC")
+            cursor.execute("""
+            SELECT s.*, c.name AS connection_name FROM sql_script s
+            LEFT JOIN db_connection c ON c.id = s.connection_id
+            ORDER BY s.update_time DESC
+            """)
             return cursor.fetchall()
         except Exception as e:
-            show_error("查询SQL脚本失败", str(e))
+            notify_error("查询SQL脚本失败", str(e), source="dao")
         return []
 
+    @metrics.timed("dao.get_sql_script_by_id")
     def get_sql_script_by_id(self, script_id):
         """根据ID查询SQL脚本"""
         try:
@@ -199,29 +430,32 @@ class DatabaseDAO:
             cursor.execute("SELECT * FROM sql_script WHERE id = %s", (script_id,))
             return cursor.fetchone()
         except Exception as e:
-            show_error("查询SQL脚本失败", str(e))
+            notify_error("查询SQL脚本失败", str(e), source="dao")
         return None
 
+    @metrics.timed("dao.update_sql_script")
     def update_sql_script(self, script_id, sql_data):
         """更新SQL脚本"""
         try:
             cursor = self.get_cursor()
             sql = """
-            UPDATE sql_script SET name = %s, description = %s, db_name = %s, table_name = %s, sql_content = %s
+            UPDATE sql_script SET name = %s, description = %s, db_name = %s, table_name = %s, sql_content = %s,
+                target_dbs = %s, connection_id = %s
             WHERE id = %s
             """
             cursor.execute(
                 sql,
-                (sql_data["name"], sql_data["description"], sql_data["db_name"],
-                 sql_data["table_name"], sql_data["sql_content"], script_id)
+                (sql_data["name"], sql_data["description"], sql_data["db_name"], sql_data["table_name"],
+                 sql_data["sql_content"], sql_data.get("target_dbs", ""), sql_data.get("connection_id"), script_id)
             )
             return cursor.rowcount > 0
         except pymysql.IntegrityError:
-            show_error("更新失败", f"SQL脚本名称「{sql_data['name']}」已存在！")
+            notify_error("更新失败", f"SQL脚本名称「{sql_data['name']}」已存在！", source="dao")
         except Exception as e:
-            show_error("更新SQL脚本失败", str(e))
+            notify_error("更新SQL脚本失败", str(e), source="dao")
         return False
 
+    @metrics.timed("dao.delete_sql_script")
     def delete_sql_script(self, script_id):
         """删除SQL脚本"""
         try:
@@ -229,41 +463,558 @@ class DatabaseDAO:
             cursor.execute("DELETE FROM sql_script WHERE id = %s", (script_id,))
             return cursor.rowcount > 0
         except Exception as e:
-            show_error("删除SQL脚本失败", str(e))
+            notify_error("删除SQL脚本失败", str(e), source="dao")
         return False
 
-    def execute_sql(self, db_name, sql_content):
-        """执行SQL脚本（连接目标库）"""
-        target_conn = None
+    # ------------------------------ 环境配置表操作 ------------------------------
+    @metrics.timed("dao.add_env")
+    def add_env(self, env_data):
+        """添加环境：env_data = {name, description, variables}"""
         try:
-            # 连接目标数据库
-            target_conn = pymysql.connect(
-                host=DB_CONFIG["host"],
-                user=DB_CONFIG["user"],
-                password=DB_CONFIG["password"],
-                port=DB_CONFIG["port"],
-                db=db_name,
-                charset=DB_CONFIG["charset"]
-            )
-            cursor = target_conn.cursor(pymysql.cursors.DictCursor)
+            cursor = self.get_cursor()
+            sql = """
+            INSERT INTO env_profile (name, description, variables)
+            VALUES (%s, %s, %s)
+            """
+            variables_str = self._dump_json(env_data.get("variables", {}))
+            cursor.execute(sql, (env_data["name"], env_data.get("description", ""), variables_str))
+            return True
+        except pymysql.IntegrityError:
+            notify_error("添加失败", f"环境名称「{env_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("添加环境失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.get_all_envs")
+    def get_all_envs(self):
+        """查询所有环境"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("SELECT * FROM env_profile ORDER BY name")
+            return cursor.fetchall()
+        except Exception as e:
+            notify_error("查询环境失败", str(e), source="dao")
+        return []
+
+    @metrics.timed("dao.update_env")
+    def update_env(self, env_id, env_data):
+        """更新环境"""
+        try:
+            cursor = self.get_cursor()
+            sql = """
+            UPDATE env_profile SET name = %s, description = %s, variables = %s
+            WHERE id = %s
+            """
+            variables_str = self._dump_json(env_data.get("variables", {}))
+            cursor.execute(sql, (env_data["name"], env_data.get("description", ""), variables_str, env_id))
+            return cursor.rowcount > 0
+        except pymysql.IntegrityError:
+            notify_error("更新失败", f"环境名称「{env_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("更新环境失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.delete_env")
+    def delete_env(self, env_id):
+        """删除环境"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("DELETE FROM env_profile WHERE id = %s", (env_id,))
+            return cursor.rowcount > 0
+        except Exception as e:
+            notify_error("删除环境失败", str(e), source="dao")
+        return False
+
+    # ------------------------------ 接口工作流表操作 ------------------------------
+    @metrics.timed("dao.add_workflow")
+    def add_workflow(self, workflow_data):
+        """添加工作流：workflow_data = {name, description, steps}"""
+        try:
+            cursor = self.get_cursor()
+            sql = """
+            INSERT INTO api_workflow (name, description, steps)
+            VALUES (%s, %s, %s)
+            """
+            steps_str = self._dump_json(workflow_data.get("steps", []))
+            cursor.execute(sql, (workflow_data["name"], workflow_data.get("description", ""), steps_str))
+            return True
+        except pymysql.IntegrityError:
+            notify_error("添加失败", f"工作流名称「{workflow_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("添加工作流失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.get_all_workflows")
+    def get_all_workflows(self):
+        """查询所有工作流"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("SELECT * FROM api_workflow ORDER BY update_time DESC")
+            return cursor.fetchall()
+        except Exception as e:
+            notify_error("查询工作流失败", str(e), source="dao")
+        return []
+
+    @metrics.timed("dao.update_workflow")
+    def update_workflow(self, workflow_id, workflow_data):
+        """更新工作流"""
+        try:
+            cursor = self.get_cursor()
+            sql = """
+            UPDATE api_workflow SET name = %s, description = %s, steps = %s
+            WHERE id = %s
+            """
+            steps_str = self._dump_json(workflow_data.get("steps", []))
+            cursor.execute(sql, (workflow_data["name"], workflow_data.get("description", ""), steps_str, workflow_id))
+            return cursor.rowcount > 0
+        except pymysql.IntegrityError:
+            notify_error("更新失败", f"工作流名称「{workflow_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("更新工作流失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.delete_workflow")
+    def delete_workflow(self, workflow_id):
+        """删除工作流"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("DELETE FROM api_workflow WHERE id = %s", (workflow_id,))
+            return cursor.rowcount > 0
+        except Exception as e:
+            notify_error("删除工作流失败", str(e), source="dao")
+        return False
+
+    # ------------------------------ 数据库连接配置表操作 ------------------------------
+    @metrics.timed("dao.add_connection")
+    def add_connection(self, connection_data):
+        """添加连接配置：connection_data = {name, host, port, user, password, charset, use_ssl, ssl_ca, pool_size, description}"""
+        try:
+            cursor = self.get_cursor()
+            sql = """
+            INSERT INTO db_connection (name, host, port, user, password, charset, use_ssl, ssl_ca, pool_size, description)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(sql, self._connection_values(connection_data))
+            return True
+        except pymysql.IntegrityError:
+            notify_error("添加失败", f"连接名称「{connection_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("添加连接失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.get_all_connections")
+    def get_all_connections(self):
+        """查询所有连接配置"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("SELECT * FROM db_connection ORDER BY name")
+            return cursor.fetchall()
+        except Exception as e:
+            notify_error("查询连接失败", str(e), source="dao")
+        return []
+
+    @metrics.timed("dao.update_connection")
+    def update_connection(self, connection_id, connection_data):
+        """更新连接配置（关闭旧的连接池，下次使用时按新配置创建）"""
+        try:
+            cursor = self.get_cursor()
+            sql = """
+            UPDATE db_connection SET name = %s, host = %s, port = %s, user = %s, password = %s, charset = %s,
+                use_ssl = %s, ssl_ca = %s, pool_size = %s, description = %s
+            WHERE id = %s
+            """
+            cursor.execute(sql, self._connection_values(connection_data) + (connection_id,))
+            self._drop_connection(connection_id)
+            return cursor.rowcount > 0
+        except pymysql.IntegrityError:
+            notify_error("更新失败", f"连接名称「{connection_data['name']}」已存在！", source="dao")
+        except Exception as e:
+            notify_error("更新连接失败", str(e), source="dao")
+        return False
+
+    @metrics.timed("dao.delete_connection")
+    def delete_connection(self, connection_id):
+        """删除连接配置（使用该连接的SQL脚本改为默认连接）"""
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("UPDATE sql_script SET connection_id = NULL WHERE connection_id = %s", (connection_id,))
+            cursor.execute("DELETE FROM db_connection WHERE id = %s", (connection_id,))
+            self._drop_connection(connection_id)
+            return cursor.rowcount > 0
+        except Exception as e:
+            notify_error("删除连接失败", str(e), source="dao")
+        return False
+
+    @staticmethod
+    def _connection_values(connection_data):
+        return (connection_data["name"], connection_data["host"], int(connection_data.get("port") or 3306),
+                connection_data["user"], connection_data.get("password", ""),
+                connection_data.get("charset") or "utf8mb4", 1 if connection_data.get("use_ssl") else 0,
+                connection_data.get("ssl_ca", ""), int(connection_data.get("pool_size") or SQL_MAX_PARALLEL),
+                connection_data.get("description", ""))
+
+    @staticmethod
+    def _profile_kwargs(profile):
+        """连接配置 -> pymysql 连接参数（不指定库）"""
+        kwargs = {
+            "host": profile["host"],
+            "port": int(profile.get("port") or 3306),
+            "user": profile["user"],
+            "password": profile.get("password") or "",
+            "charset": profile.get("charset") or "utf8mb4",
+            "connect_timeout": 10
+        }
+        if profile.get("use_ssl"):
+            # 指定CA证书时校验服务器证书，否则只加密不校验
+            kwargs["ssl"] = {"ca": profile["ssl_ca"]} if profile.get("ssl_ca") else {"check_hostname": False}
+        return kwargs
+
+    def test_connection(self, connection_data):
+        """测试连接配置，返回服务器版本；失败抛出异常"""
+        conn = pymysql.connect(**self._profile_kwargs(connection_data))
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT VERSION()")
+            return cursor.fetchone()[0]
+        finally:
+            conn.close()
+
+    def _connect_kwargs(self, connection_id=None):
+        """
+        连接参数（connection_id 为空时使用工具自身的库连接 db_config）
+        连接配置用独立连接读取并缓存，可在后台线程调用；配置不存在时抛出异常
+        """
+        if not connection_id:
+            return {key: self.db_config[key] for key in ("host", "user", "password", "port", "charset")}
+        with self._pool_lock:
+            kwargs = self.profile_kwargs.get(connection_id)
+        if kwargs is None:
+            self.ensure_initialized()
+            meta_conn = pymysql.connect(**self.db_config)
+            try:
+                cursor = meta_conn.cursor(pymysql.cursors.DictCursor)
+                cursor.execute("SELECT * FROM db_connection WHERE id = %s", (connection_id,))
+                profile = cursor.fetchone()
+            finally:
+                meta_conn.close()
+            if not profile:
+                raise ValueError(f"连接配置不存在（ID：{connection_id}）")
+            kwargs = self._profile_kwargs(profile)
+            kwargs["pool_size"] = profile.get("pool_size") or SQL_MAX_PARALLEL
+            with self._pool_lock:
+                self.profile_kwargs[connection_id] = kwargs
+        kwargs = dict(kwargs)
+        kwargs.pop("pool_size", None)
+        return kwargs
+
+    def _drop_connection(self, connection_id):
+        """连接配置修改/删除后，关闭其连接池并清除缓存"""
+        with self._pool_lock:
+            self.profile_kwargs.pop(connection_id, None)
+            pool = self.target_pools.pop(connection_id, None)
+        if pool:
+            pool.close_all()
+        get_schema_cache(connection_id).invalidate()
+
+    @staticmethod
+    def _dump_json(value):
+        """字典/列表转JSON字符串（已是字符串则原样保存）"""
+        if isinstance(value, str):
+            return value
+        return dumps(value)
+
+    def _connect_target(self, db_name, connection_id=None):
+        """单独连接目标数据库（不经过连接池，用于流式读取、性能分析等独占连接的操作）"""
+        return pymysql.connect(db=db_name, **self._connect_kwargs(connection_id))
+
+    def _get_target_pool(self, connection_id=None):
+        """目标库连接池（每个连接配置一个，首次使用时创建；连接不绑定库，执行时 select_db）"""
+        connection_id = connection_id or None
+        with self._pool_lock:
+            pool = self.target_pools.get(connection_id)
+        if pool is None:
+            kwargs = self._connect_kwargs(connection_id)
+            with self._pool_lock:
+                pool_size = self.profile_kwargs.get(connection_id, {}).get("pool_size", SQL_MAX_PARALLEL)
+                pool = self.target_pools.setdefault(connection_id, ConnectionPool(max_size=pool_size, **kwargs))
+        return pool
+
+    def _run_sql(self, db_name, sql_content, connection_id=None):
+        """在目标库执行SQL（连接取自连接池），返回结果字典；出错抛出异常"""
+        timing = {}
+        start = time.perf_counter()
+        with self._get_target_pool(connection_id).connection(db_name) as conn:
+            timing["connect"] = round((time.perf_counter() - start) * 1000, 2)
+            metrics.observe("sql.connect", timing["connect"], db=db_name)
+            cursor = conn.cursor(pymysql.cursors.DictCursor)
             # 执行SQL（支持多语句）
-            cursor.execute(sql_content)
-            # 获取结果（查询返回数据，其他返回影响行数）
-            if sql_content.strip().upper().startswith("SELECT"):
-                result = cursor.fetchall()
+            with metrics.span("sql.execute", db=db_name) as span:
+                cursor.execute(sql_content)
+            timing["execute"] = span["ms"]
+            # 获取结果（有结果集返回数据，其他返回影响行数）
+            if cursor.description is not None:
+                with metrics.span("sql.fetch", db=db_name) as span:
+                    result = cursor.fetchall()
+                timing["fetch"] = span["ms"]
                 columns = [desc[0] for desc in cursor.description]
-                return {"type": "query", "columns": columns, "data": result}
+                return {"type": "query", "columns": columns, "data": result, "timing": timing}
+            conn.commit()
+            # 执行了DDL时库表结构缓存失效
+            if any(is_ddl(statement) for statement in split_statements(sql_content)):
+                get_schema_cache(connection_id).invalidate(db_name)
+            return {"type": "execute", "affected_rows": cursor.rowcount, "timing": timing}
+
+    def execute_sql(self, db_name, sql_content, variables=None, connection_id=None):
+        """
+        执行SQL脚本（连接目标库；variables：环境变量，用于替换{{变量}}；connection_id：连接配置，为空时用默认连接）
+        结果中的 timing 为各阶段耗时：connect（从连接池获取）/ execute / fetch（毫秒）
+        """
+        db_name = render_template(db_name, variables)
+        sql_content = render_template(sql_content, variables)
+        try:
+            return self._run_sql(db_name, sql_content, connection_id)
+        except Exception as e:
+            notify_error("SQL执行失败", str(e), source="dao")
+        return None
+
+    def resolve_target_dbs(self, target_dbs, connection_id=None):
+        """多库执行的目标库：库名原样保留，通配符匹配服务器上现有的库（排除系统库）；出错抛出异常"""
+        names, patterns = parse_target_dbs(target_dbs)
+        if patterns:
+            with self._get_target_pool(connection_id).connection() as conn:
+                cursor = conn.cursor()
+                conditions = " OR ".join(["SCHEMA_NAME LIKE %s"] * len(patterns))
+                cursor.execute(
+                    f"SELECT SCHEMA_NAME FROM information_schema.SCHEMATA WHERE ({conditions}) "
+                    f"AND SCHEMA_NAME NOT IN %s ORDER BY SCHEMA_NAME", (*patterns, SYSTEM_SCHEMAS))
+                for (name,) in cursor.fetchall():
+                    if name not in names:
+                        names.append(name)
+        return names
+
+    def _run_sql_on(self, db_name, sql_content, connection_id=None):
+        """多库执行中的单个库（出错记录到结果中，不抛出）"""
+        start = time.perf_counter()
+        try:
+            result = self._run_sql(db_name, sql_content, connection_id)
+            result["error"] = ""
+        except Exception as e:
+            result = {"type": "error", "error": str(e), "timing": {}}
+        result["db"] = db_name
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def execute_sql_multi(self, target_dbs, sql_content, variables=None, connection_id=None,
+                          max_workers=SQL_MAX_PARALLEL, on_result=None):
+        """
+        多库并行执行同一SQL脚本（连接池 + 有界并发），单个库失败不影响其他库
+        target_dbs：库名列表，或逗号分隔的库名/通配符文本（如 "shard_%"）
+        on_result(单库结果)：每个库执行完成时回调（在工作线程中调用）
+        返回 {results: [每个库的结果，按库顺序], merged: 合并后的查询结果或None, total_ms}，失败返回 None
+        """
+        sql_content = render_template(sql_content, variables)
+        start = time.perf_counter()
+        try:
+            if isinstance(target_dbs, str):
+                db_names = self.resolve_target_dbs(render_template(target_dbs, variables), connection_id)
             else:
-                target_conn.commit()
-                return {"type": "execute", "affected_rows": cursor.rowcount}
+                db_names = [render_template(name, variables) for name in target_dbs]
         except Exception as e:
-            if target_conn:
-                target_conn.rollback()
-            show_error("SQL执行失败", str(e))
+            notify_error("解析目标库失败", str(e), source="dao")
+            return None
+        if not db_names:
+            notify_error("SQL执行失败", "没有匹配的目标库", source="dao")
+            return None
+
+        results = []
+        with metrics.span("sql.execute_multi"):
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(db_names)))) as executor:
+                futures = [executor.submit(self._run_sql_on, name, sql_content, connection_id) for name in db_names]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+        order = {name: index for index, name in enumerate(db_names)}
+        results.sort(key=lambda r: order[r["db"]])
+        return {"results": results, "merged": self._merge_results(results),
+                "total_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    @staticmethod
+    def _merge_results(results):
+        """合并各库的查询结果：首列 _db 为来源库，列取各库列名的并集，行为元组"""
+        queries = [r for r in results if r["type"] == "query"]
+        if not queries:
+            return None
+        columns = []
+        for result in queries:
+            columns.extend(c for c in result["columns"] if c not in columns)
+        data = [(result["db"],) + tuple(row.get(c) for c in columns) for result in queries for row in result["data"]]
+        return {"columns": ["_db"] + columns, "data": data}
+
+    def explain_sql(self, db_name, sql_content, variables=None, profile=False, connection_id=None):
+        """
+        分析SQL脚本：逐条语句执行 EXPLAIN FORMAT=JSON，只读查询额外实际执行并计时
+        profile=True 时开启 SHOW PROFILE 采集各阶段耗时（MySQL 8 中已废弃但仍可用）
+        返回 {"statements": [{sql, type, plan, summary, elapsed_ms, rows, profile, error}], "timing": {...}}
+        """
+        target_conn = None
+        db_name = render_template(db_name, variables)
+        sql_content = render_template(sql_content, variables)
+        statements = []
+        timing = {}
+        try:
+            with metrics.span("sql.connect", db=db_name) as span:
+                target_conn = self._connect_target(db_name, connection_id)
+            timing["connect"] = span["ms"]
+            cursor = target_conn.cursor(pymysql.cursors.DictCursor)
+            if profile:
+                cursor.execute("SET profiling = 1")
+            with metrics.span("sql.explain", db=db_name) as span:
+                for sql in split_statements(sql_content):
+                    statements.append(self._explain_statement(cursor, db_name, sql, profile))
+            timing["explain"] = span["ms"]
+            return {"statements": statements, "timing": timing}
+        except Exception as e:
+            notify_error("SQL分析失败", str(e), source="dao")
         finally:
             if target_conn:
+                # 分析过程中不提交任何修改
+                target_conn.rollback()
                 target_conn.close()
         return None
 
+    @staticmethod
+    def _explain_statement(cursor, db_name, sql, profile):
+        """分析单条语句（出错只记录到该语句，不影响其他语句）"""
+        item = {"sql": sql, "type": statement_type(sql), "plan": None, "summary": None,
+                "elapsed_ms": None, "rows": None, "profile": [], "error": ""}
+        try:
+            if item["type"] in EXPLAINABLE_TYPES:
+                cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+                row = cursor.fetchone()
+                plan = loads(next(iter(row.values()))) if row else None
+                item["plan"] = build_plan_tree(plan)
+                item["summary"] = summarize_plan(item["plan"])
+            # 只实际执行只读查询，写操作仅分析执行计划
+            if is_query(sql):
+                with metrics.span("sql.analyze", db=db_name) as span:
+                    cursor.execute(sql)
+                    item["rows"] = len(cursor.fetchall())
+                item["elapsed_ms"] = span["ms"]
+                if profile:
+                    cursor.execute("SHOW PROFILES")
+                    profiles = cursor.fetchall()
+                    if profiles:
+                        cursor.execute(f"SHOW PROFILE FOR QUERY {int(profiles[-1]['Query_ID'])}")
+                        item["profile"] = [
+                            {"status": r["Status"], "ms": round(float(r["Duration"]) * 1000, 3)}
+                            for r in cursor.fetchall()
+                        ]
+        except Exception as e:
+            item["error"] = str(e)
+        return item
+
+    def iter_query(self, db_name, sql_content, variables=None, connection_id=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        流式查询：服务端游标（SSCursor）逐批读取，内存占用与结果总行数无关
+        生成 (列名列表 QueryColumns, 行元组列表)；出错直接抛出异常，由调用方处理
+        注意：必须把结果读完或关闭生成器，连接才会释放
+        """
+        db_name = render_template(db_name, variables)
+        sql_content = render_template(sql_content, variables)
+        with metrics.span("sql.connect", db=db_name):
+            target_conn = self._connect_target(db_name, connection_id)
+        try:
+            cursor = target_conn.cursor(pymysql.cursors.SSCursor)
+            with metrics.span("sql.execute", db=db_name):
+                cursor.execute(sql_content)
+            if cursor.description is None:
+                raise ValueError("该语句没有返回结果集")
+            columns = QueryColumns(cursor.description)
+            # 第一批即使为空也返回，保证调用方能拿到列名
+            first = True
+            while True:
+                with metrics.span("sql.fetch_batch", db=db_name):
+                    rows = cursor.fetchmany(batch_size)
+                if not rows and not first:
+                    break
+                first = False
+                yield columns, rows
+                if not rows:
+                    break
+            cursor.close()
+        finally:
+            target_conn.close()
+
+    # ------------------------------ 库表结构（information_schema） ------------------------------
+    @metrics.timed("dao.load_schema_metadata")
+    def load_schema_metadata(self, db_name=None, connection_id=None):
+        """
+        加载库、表、列、索引元数据（db_name 为空时加载全部业务库），共4次查询，不逐表查询
+        使用独立连接，可在后台线程调用；返回 {库名: {表名: {...}}}，失败返回 None
+        """
+        conn = None
+        if db_name:
+            where, args = "= %s", (db_name,)
+        else:
+            where, args = "NOT IN %s", (SYSTEM_SCHEMAS,)
+        try:
+            conn = self._connect_target("information_schema", connection_id)
+            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(f"SELECT SCHEMA_NAME AS db FROM SCHEMATA WHERE SCHEMA_NAME {where}", args)
+            schema = {row["db"]: {} for row in cursor.fetchall()}
+
+            cursor.execute(f"""
+            SELECT TABLE_SCHEMA AS db, TABLE_NAME AS tbl, TABLE_TYPE AS type, TABLE_ROWS AS row_count,
+                   TABLE_COMMENT AS comment
+            FROM TABLES WHERE TABLE_SCHEMA {where}
+            """, args)
+            for row in cursor.fetchall():
+                schema.setdefault(row["db"], {})[row["tbl"]] = {
+                    "type": "视图" if row["type"] == "VIEW" else "表",
+                    "rows": row["row_count"],
+                    "comment": row["comment"] or "",
+                    "columns": [],
+                    "indexes": {}
+                }
+
+            cursor.execute(f"""
+            SELECT TABLE_SCHEMA AS db, TABLE_NAME AS tbl, COLUMN_NAME AS name, COLUMN_TYPE AS type,
+                   IS_NULLABLE AS nullable, COLUMN_KEY AS col_key, COLUMN_COMMENT AS comment
+            FROM COLUMNS WHERE TABLE_SCHEMA {where}
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+            """, args)
+            for row in cursor.fetchall():
+                table = schema.get(row["db"], {}).get(row["tbl"])
+                if table is not None:
+                    table["columns"].append({
+                        "name": row["name"],
+                        "type": row["type"],
+                        "nullable": row["nullable"] == "YES",
+                        "key": row["col_key"] or "",
+                        "comment": row["comment"] or ""
+                    })
+
+            cursor.execute(f"""
+            SELECT TABLE_SCHEMA AS db, TABLE_NAME AS tbl, INDEX_NAME AS name, NON_UNIQUE AS non_unique,
+                   COLUMN_NAME AS col
+            FROM STATISTICS WHERE TABLE_SCHEMA {where}
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+            """, args)
+            for row in cursor.fetchall():
+                table = schema.get(row["db"], {}).get(row["tbl"])
+                if table is not None:
+                    index = table["indexes"].setdefault(
+                        row["name"], {"unique": not int(row["non_unique"]), "columns": []})
+                    index["columns"].append(row["col"])
+            return schema
+        except Exception as e:
+            notify_error("加载库表结构失败", str(e), source="dao")
+        finally:
+            if conn:
+                conn.close()
+        return None
+
 # 单例实例
 db_dao = DatabaseDAO()
\ No newline at end of file
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from utils.lazy_import import lazy_import
+
+pymysql = lazy_import("pymysql")
+
+# MySQL 5.7.3+ 的 COM_RESET_CONNECTION 命令（pymysql.constants.COMMAND 中没有定义）
+COM_RESET_CONNECTION = 0x1F
+
+
+class PoolTimeout(Exception):
+    """等待空闲连接超时"""
+
+
+class ConnectionPool:
+    """
+    线程安全的 pymysql 连接池：最多 max_size 个连接，用完归还复用
+    连接不绑定数据库，取出时按需 select_db，同一个池可服务同一服务器上的多个库
+    """
+    def __init__(self, max_size=8, idle_check_seconds=30, **connect_kwargs):
+        self.max_size = max_size
+        self.idle_check_seconds = idle_check_seconds
+        self.connect_kwargs = connect_kwargs
+        # 后进先出，优先复用刚归还的连接，长时间空闲的连接自然沉底
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _new_connection(self):
+        conn = pymysql.connect(**self.connect_kwargs)
+        conn.last_used = time.monotonic()
+        return conn
+
+    def acquire(self, timeout=None):
+        """取出一个连接（池满时等待，超时抛出 PoolTimeout）"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._new_connection()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    conn = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise PoolTimeout(f"等待数据库连接超时（连接池上限 {self.max_size}）")
+            # 空闲较久的连接先检测是否断开（服务器 wait_timeout 等），断开则自动重连
+            if time.monotonic() - conn.last_used > self.idle_check_seconds:
+                try:
+                    conn.ping(reconnect=True)
+                except Exception:
+                    self._discard(conn)
+                    continue
+            return conn
+
+    def release(self, conn, broken=False):
+        """归还连接（出错的连接直接关闭）"""
+        if broken or conn.open is False:
+            self._discard(conn)
+            return
+        conn.last_used = time.monotonic()
+        self._idle.put(conn)
+
+    @staticmethod
+    def reset_session(conn):
+        """
+        清除会话状态（COM_RESET_CONNECTION）：回滚未提交事务，清除会话变量、用户变量、临时表、表锁、预处理语句等，
+        避免上一个脚本的 SET / CREATE TEMPORARY TABLE 等影响下一个复用该连接的脚本
+        会话变量会恢复为服务器默认值，之后重新设置连接参数中的字符集与自动提交；失败时抛出异常
+        """
+        # pymysql 没有提供重置会话的公开接口；发送命令前会自动读完多语句未读取的结果集
+        conn._execute_command(COM_RESET_CONNECTION, b"")
+        conn._read_ok_packet()
+        conn.set_character_set(conn.charset, conn.collation)
+        conn.autocommit(conn.autocommit_mode)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self, db_name=None, timeout=None):
+        """
+        with pool.connection("test_db") as conn: ...（出错时回滚，连接仍归还）
+        归还前重置会话：结束未提交的事务（如只读查询开启的快照），并清除脚本留下的会话状态；重置失败的连接直接丢弃
+        """
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            if db_name:
+                conn.select_db(db_name)
+            yield conn
+        except (pymysql.OperationalError, pymysql.InterfaceError):
+            # 连接层面的错误，丢弃该连接
+            broken = True
+            raise
+        finally:
+            if not broken:
+                try:
+                    self.reset_session(conn)
+                except Exception:
+                    broken = True
+            self.release(conn, broken)
+
+    def close_all(self):
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self):
+        return {"max_size": self.max_size, "created": self._created, "idle": self._idle.qsize()}
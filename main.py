@@ -1,9 +1,72 @@
+import json
+import os
 import sys
+import time
+
+# 启动计时起点（在导入 PyQt6 和各页面模块之前）
+STARTED_AT = time.perf_counter()
+
+# 系统操作批次在（提权的）子进程中执行：不启动界面，也不导入 PyQt6
+if __name__ == "__main__" and len(sys.argv) > 2 and sys.argv[1] == "--apply-actions":
+    from utils.system_actions import apply_admin_steps
+    sys.exit(apply_admin_steps(sys.argv[2]))
+
 from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from config import STARTUP_BUDGET_MS
+from utils.metrics_utils import metrics
+
+# 设置后输出启动耗时并退出：值为 1 时打印到标准输出，否则写入该路径（打包后无控制台时使用文件）
+STARTUP_PROBE_ENV = "TOOL_STARTUP_PROBE"
+# 应当延迟到首次使用才导入的模块，启动阶段被导入说明延迟导入失效
+DEFERRED_MODULES = ("requests", "pymysql", "openpyxl", "pyarrow")
+
+
+def elapsed_ms():
+    return round((time.perf_counter() - STARTED_AT) * 1000, 2)
+
+
+class StartupProbe(QObject):
+    """启动计时：主窗口第一次绘制时记为 time-to-first-window"""
+    def __init__(self, app, window, timings):
+        super().__init__(window)
+        self.app = app
+        self.timings = timings
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and "first_paint_ms" not in self.timings:
+            self.timings["first_paint_ms"] = elapsed_ms()
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        self.timings["budget_ms"] = STARTUP_BUDGET_MS
+        self.timings["deferred_loaded"] = [name for name in DEFERRED_MODULES if name in sys.modules]
+        metrics.observe("app.first_window", self.timings["first_paint_ms"])
+        probe = os.environ.get(STARTUP_PROBE_ENV)
+        if not probe:
+            return
+        text = json.dumps(self.timings, ensure_ascii=False)
+        if probe == "1":
+            print(text, flush=True)
+        else:
+            # 先写临时文件再改名，基准进程看到文件时内容已完整
+            with open(probe + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(probe + ".tmp", probe)
+        self.app.quit()
+
 
 if __name__ == "__main__":
+    timings = {}
     app = QApplication(sys.argv)
+    timings["app_ms"] = elapsed_ms()
+    from ui.main_window import MainWindow
+    timings["import_ms"] = elapsed_ms()
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    timings["window_ms"] = elapsed_ms()
+    probe = StartupProbe(app, window, timings)
+    sys.exit(app.exec())
@@ -1,4 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
+# 单文件版（启动时先解压到临时目录；追求启动速度请用 main_onedir.spec）
+import sys
+
+sys.path.insert(0, SPECPATH)
+from spec_options import EXCLUDES, HIDDEN_IMPORTS, OPTIMIZE
 
 
 a = Analysis(
@@ -6,13 +11,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=HIDDEN_IMPORTS,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
-    optimize=0,
+    optimize=OPTIMIZE,
 )
 pyz = PYZ(a.pure)
 
@@ -26,7 +31,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX 压缩的 Qt 动态库每次启动都要解压，且容易被杀毒软件拦截扫描
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
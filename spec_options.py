@@ -0,0 +1,35 @@
+"""
+PyInstaller 打包公共配置（main.spec / main_onedir.spec / tool_platform.spec 共用）
+  pyinstaller main_onedir.spec   # 推荐：目录版，启动时无需解压，启动最快
+  pyinstaller main.spec          # 单文件版，每次启动先解压到临时目录
+"""
+
+# 程序只用到 QtCore / QtGui / QtWidgets，其余 Qt 模块及其插件、动态库都不打包
+QT_EXCLUDES = ["PyQt6." + name for name in (
+    "Qt3DAnimation", "Qt3DCore", "Qt3DExtras", "Qt3DInput", "Qt3DLogic", "Qt3DRender",
+    "QtBluetooth", "QtCharts", "QtDataVisualization", "QtDBus", "QtDesigner", "QtHelp",
+    "QtMultimedia", "QtMultimediaWidgets", "QtNetwork", "QtNfc", "QtOpenGL", "QtOpenGLWidgets",
+    "QtPdf", "QtPdfWidgets", "QtPositioning", "QtPrintSupport", "QtQml", "QtQuick", "QtQuick3D",
+    "QtQuickWidgets", "QtRemoteObjects", "QtSensors", "QtSerialPort", "QtSpatialAudio", "QtSql",
+    "QtSvg", "QtSvgWidgets", "QtTest", "QtTextToSpeech", "QtWebChannel", "QtWebEngineCore",
+    "QtWebEngineQuick", "QtWebEngineWidgets", "QtWebSockets", "QtXml", "uic"
+)]
+
+# 未使用的标准库与开发工具
+STDLIB_EXCLUDES = [
+    "tkinter", "turtle", "turtledemo", "idlelib", "unittest", "doctest", "pydoc", "pydoc_data",
+    "lib2to3", "test", "distutils", "setuptools", "pip", "ensurepip", "venv", "xmlrpc", "curses",
+    "sqlite3", "pdb"
+]
+
+# 仅在基准测试/开发时使用的模块
+DEV_EXCLUDES = ["benchmarks", "pytest"]
+
+EXCLUDES = QT_EXCLUDES + STDLIB_EXCLUDES + DEV_EXCLUDES
+
+# 通过 utils.lazy_import 延迟导入的模块，PyInstaller 静态分析不到，需要显式声明
+# pyarrow（Parquet导出）体积上百MB，默认不打包，需要时加入此列表
+HIDDEN_IMPORTS = ["pymysql", "requests", "openpyxl", "ijson", "httpx", "h2"]
+
+# 字节码优化级别：2 去掉 assert 与文档字符串（程序运行不依赖二者）
+OPTIMIZE = 2
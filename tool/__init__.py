@@ -0,0 +1 @@
+"""命令行工具：python -m tool（不依赖 PyQt6，供CI/定时任务运行已保存的接口和SQL脚本）"""
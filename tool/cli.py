@@ -0,0 +1,151 @@
+"""
+命令行入口（复用 DAO 与请求模块，不导入 PyQt6）
+用法：
+  python -m tool run-api 登录 "用户*" --env dev
+  python -m tool run-sql 日报统计 --var date=2024-01-01
+  python -m tool run-batch --api "*" --sql "巡检*" --format junit --output report.xml
+  python -m tool mock --env dev --port 8800 --latency 50 --error-rate 0.05
+名称支持通配符；退出码：0 全部通过，1 有失败或出错，2 参数错误或找不到接口/脚本
+"""
+import argparse
+import sys
+from config import BATCH_MAX_WORKERS, HTTP_BACKEND, MOCK_HOST, MOCK_PORT
+
+
+def parse_vars(values):
+    """--var KEY=VALUE 列表转字典"""
+    variables = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"变量格式应为 KEY=VALUE：{value}")
+        variables[key.strip()] = val
+    return variables
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--env", help="使用的环境（环境配置中的名称）")
+    common.add_argument("--var", action="append", default=[], metavar="KEY=VALUE",
+                        help="变量（可重复，覆盖环境中的同名变量）")
+    common.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="并发数")
+    common.add_argument("--backend", choices=("requests", "httpx"), default=HTTP_BACKEND,
+                        help="HTTP后端（httpx：异步并发、支持HTTP/2，需安装 httpx）")
+    common.add_argument("--format", choices=("text", "json", "junit"), default="text", help="结果格式")
+    common.add_argument("--output", help="结果写入文件（默认输出到标准输出）")
+
+    parser = argparse.ArgumentParser(prog="python -m tool", description="多功能工具平台命令行")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_api = subparsers.add_parser("run-api", parents=[common], help="运行已保存的接口")
+    run_api.add_argument("names", nargs="+", help="接口名称（支持通配符）")
+    run_sql = subparsers.add_parser("run-sql", parents=[common], help="运行已保存的SQL脚本")
+    run_sql.add_argument("names", nargs="+", help="SQL脚本名称（支持通配符）")
+    run_batch = subparsers.add_parser("run-batch", parents=[common], help="同时运行一批接口和SQL脚本")
+    run_batch.add_argument("--api", action="append", default=[], help="接口名称（支持通配符，可重复）")
+    run_batch.add_argument("--sql", action="append", default=[], help="SQL脚本名称（支持通配符，可重复）")
+
+    mock = subparsers.add_parser("mock", help="按已保存的接口和录制的响应启动本地Mock服务")
+    mock.add_argument("names", nargs="*", help="只提供这些接口（支持通配符，默认全部）")
+    mock.add_argument("--env", help="渲染URL中 {{变量}} 使用的环境（如 {{base_url}}）")
+    mock.add_argument("--var", action="append", default=[], metavar="KEY=VALUE", help="变量（可重复）")
+    mock.add_argument("--host", default=MOCK_HOST, help="监听地址")
+    mock.add_argument("--port", type=int, default=MOCK_PORT, help="监听端口（0 为随机端口）")
+    mock.add_argument("--latency", type=float, default=0, help="每个请求的固定延迟（毫秒）")
+    mock.add_argument("--jitter", type=float, default=0, help="随机附加的延迟上限（毫秒）")
+    mock.add_argument("--replay-latency", action="store_true", help="按录制时的请求耗时延迟（替代 --latency）")
+    mock.add_argument("--error-rate", type=float, default=0.0, help="返回错误响应的比例（0~1）")
+    mock.add_argument("--error-status", type=int, default=500, help="错误响应的状态码")
+    mock.add_argument("--seed", type=int, help="随机种子（故障注入可复现）")
+    return parser
+
+
+def load_variables(env_name, variables):
+    """环境变量与 --var 合并（--var 优先），环境不存在返回 None"""
+    from utils.batch_utils import load_env_variables
+    if not env_name:
+        return variables
+    env_variables = load_env_variables(env_name)
+    if env_variables is None:
+        print(f"环境不存在：{env_name}", file=sys.stderr)
+        return None
+    return {**env_variables, **variables}
+
+
+def run_mock(args, variables):
+    """启动Mock服务（Ctrl+C 停止）"""
+    from utils.mock_server import MockServer, load_routes
+
+    routes = load_routes(args.names, variables)
+    if not routes.count:
+        print("没有可提供的接口", file=sys.stderr)
+        return 2
+    server = MockServer(routes, host=args.host, port=args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+                        error_rate=args.error_rate, error_status=args.error_status,
+                        replay_latency=args.replay_latency, seed=args.seed)
+    try:
+        server.serve_forever(lambda s: print(f"Mock服务已启动：{s.url}（{routes.count} 个接口，Ctrl+C 停止）",
+                                             flush=True))
+    except OSError as e:
+        print(f"Mock服务启动失败：{e}", file=sys.stderr)
+        return 2
+    print(f"已停止，共处理 {server.stats['requests']} 个请求（未匹配 {server.stats['not_found']}，"
+          f"注入错误 {server.stats['injected_errors']}）", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        variables = parse_vars(args.var)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command == "mock":
+        if not 0 <= args.error_rate <= 1:
+            parser.error("--error-rate 应在 0~1 之间")
+        variables = load_variables(args.env, variables)
+        return 2 if variables is None else run_mock(args, variables)
+
+    api_names = args.names if args.command == "run-api" else getattr(args, "api", [])
+    sql_names = args.names if args.command == "run-sql" else getattr(args, "sql", [])
+    if not api_names and not sql_names:
+        parser.error("run-batch 至少需要一个 --api 或 --sql")
+
+    # 解析完参数再导入（--help 等不需要连接数据库）
+    from db.dao import db_dao
+    from utils.batch_utils import select_by_names, run_batch
+    from utils.http_transport import available_backends
+    from tool.report import FORMATTERS, case_line
+
+    if api_names and args.backend not in available_backends():
+        print(f"HTTP后端不可用（未安装依赖）：{args.backend}", file=sys.stderr)
+        return 2
+
+    variables = load_variables(args.env, variables)
+    if variables is None:
+        return 2
+
+    apis, missing = select_by_names(db_dao.get_all_apis(), api_names) if api_names else ([], [])
+    scripts, missing_sql = select_by_names(db_dao.get_all_sql_scripts(), sql_names) if sql_names else ([], [])
+    missing = [f"接口「{name}」" for name in missing] + [f"SQL脚本「{name}」" for name in missing_sql]
+    if missing:
+        print(f"未找到：{'、'.join(missing)}", file=sys.stderr)
+        return 2
+
+    # 文本格式边运行边输出；输出到文件时明细也写入文件
+    lines = []
+    on_case = None
+    if args.format == "text":
+        on_case = (lambda case: lines.append(case_line(case))) if args.output else \
+            (lambda case: print(case_line(case), flush=True))
+    result = run_batch(apis, scripts, variables, max_workers=args.workers, on_case=on_case,
+                       backend=args.backend)
+    lines.append(FORMATTERS[args.format](result))
+    text = "\n".join(lines)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"结果已保存：{args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0 if result["success"] else 1
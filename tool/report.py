@@ -0,0 +1,56 @@
+import xml.etree.ElementTree as ET
+from utils.json_utils import dumps
+
+# 文本输出中各状态的标记
+STATUS_TEXT = {"passed": "PASS", "failed": "FAIL", "error": "ERROR"}
+
+
+def case_line(case):
+    """单个用例的一行文本"""
+    line = f"{STATUS_TEXT[case['status']]:<6}{case['kind']:<5}{case['name']}  {case['elapsed_ms']} ms"
+    return f"{line}  {case['message']}" if case["message"] else line
+
+
+def to_text(result):
+    """汇总文本（用例明细已在运行过程中逐行输出）"""
+    counts = result["counts"]
+    text = (f"共 {len(result['cases'])} 项：通过 {counts['passed']}，失败 {counts['failed']}，"
+            f"出错 {counts['error']}，总耗时 {result['total_ms']} ms")
+    outcomes = [outcome for case in result["cases"] for outcome in case["detail"].get("assertions", ())]
+    if outcomes:
+        failed = sum(1 for outcome in outcomes if not outcome["passed"])
+        text += f"；断言 {len(outcomes)} 条，未通过 {failed} 条"
+    return text
+
+
+def to_json(result):
+    return dumps(result, pretty=True)
+
+
+def to_junit(result, suite_name="tool"):
+    """JUnit XML（CI 系统可直接展示）：接口/SQL脚本各一个 testsuite"""
+    root = ET.Element("testsuites", name=suite_name, tests=str(len(result["cases"])),
+                      failures=str(result["counts"]["failed"]), errors=str(result["counts"]["error"]),
+                      time=f"{result['total_ms'] / 1000:.3f}")
+    suites = {}
+    for case in result["cases"]:
+        suite = suites.get(case["kind"])
+        if suite is None:
+            suite = suites[case["kind"]] = ET.SubElement(root, "testsuite", name=f"{suite_name}.{case['kind']}")
+            suite.set("tests", "0")
+            suite.set("failures", "0")
+            suite.set("errors", "0")
+        suite.set("tests", str(int(suite.get("tests")) + 1))
+        element = ET.SubElement(suite, "testcase", classname=f"{suite_name}.{case['kind']}", name=case["name"],
+                                time=f"{case['elapsed_ms'] / 1000:.3f}")
+        if case["status"] != "passed":
+            tag = "failure" if case["status"] == "failed" else "error"
+            suite.set(f"{tag}s", str(int(suite.get(f"{tag}s")) + 1))
+            ET.SubElement(element, tag, message=case["message"][:200]).text = case["message"]
+        if case["detail"]:
+            ET.SubElement(element, "system-out").text = dumps(case["detail"])
+    ET.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding="unicode")
+
+
+FORMATTERS = {"text": to_text, "json": to_json, "junit": to_junit}
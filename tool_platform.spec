@@ -1,4 +1,8 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
+
+sys.path.insert(0, SPECPATH)
+from spec_options import EXCLUDES, HIDDEN_IMPORTS, OPTIMIZE
 
 block_cipher = None
 
@@ -10,15 +14,16 @@ a = Analysis(
         ('resources/icon/app.ico', 'resources/icon'),  # 若没有图标可删除此行
         ('resources/qss/style.qss', 'resources/qss')
     ],
-    hiddenimports=['pymysql', 'requests'],  # 确保隐藏依赖被识别
+    hiddenimports=HIDDEN_IMPORTS,  # 确保隐藏（延迟导入）依赖被识别
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    optimize=OPTIMIZE,
 )
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
@@ -33,7 +38,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,  # 若UPX报错，可改为False
+    upx=False,  # UPX 压缩的动态库每次启动都要解压，拖慢启动
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,  # 关闭黑窗口（调试时可改为True）
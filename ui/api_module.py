@@ -1,11 +1,51 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QTextEdit,
-                             QComboBox, QSplitter, QTextBrowser, QMessageBox)
-from PyQt6.QtCore import Qt, QSize
+                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit,
+                             QComboBox, QSplitter, QTabWidget, QCheckBox)
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QIcon
 from db.dao import db_dao
-from utils.request_utils import send_request
-from utils.common_utils import format_json, copy_to_clipboard, validate_required_fields
+from utils.metrics_utils import metrics
+from utils.request_utils import execute_request, describe_request_error
+from utils.assert_utils import compile_assertions
+from utils.common_utils import (format_json, copy_to_clipboard, validate_required_fields, show_info, show_confirm,
+                                show_error, show_dialog_error)
+from ui.code_editor import CodeEditor
+from ui.env_module import EnvSelector
+from ui.workflow_module import WorkflowManagerDialog
+from ui.import_dialog import ApiImportDialog
+from ui.json_tree import JsonTreeView
+from ui.workers import TaskWorker
+from config import RESULT_TEXT_LIMIT, MOCK_RECORD_RESPONSES
+
+def run_api_request(api_data, variables, record=False):
+    """
+    后台线程：发送请求、解析响应体、生成显示文本并检查断言，record 为真时保存响应供 Mock 服务回放
+    超大响应体不格式化，只截取原文开头；请求失败时返回 {error}
+    """
+    try:
+        result = execute_request(api_data["url"], api_data["method"], api_data["params"], api_data["headers"],
+                                 variables)
+    except Exception as e:
+        return {"error": describe_request_error(e)}
+    body = result["body"]
+    if len(body) > RESULT_TEXT_LIMIT:
+        body_text = body.text[:RESULT_TEXT_LIMIT]
+        body.data  # 在后台线程解析并缓存，JSON树直接使用解析结果
+    else:
+        body_text = body.pretty()
+    outcome = {"result": result, "body_text": body_text, "assertions": None, "assertion_error": ""}
+    if record:
+        # 保存最近一次响应，供 Mock 服务（python -m tool mock）回放
+        db_dao.save_response_record(api_data["id"], result)
+    try:
+        assertions = compile_assertions(api_data.get("assertions"))
+    except ValueError as e:
+        outcome["assertion_error"] = str(e)
+        return outcome
+    if assertions is not None:
+        outcome["assertions"] = assertions.evaluate(result)
+    return outcome
+
 
 class ApiDialog(QDialog):
     """接口新建/编辑对话框"""
@@ -40,17 +80,25 @@ class ApiDialog(QDialog):
         form_layout.addRow("请求方法*", self.method_combo)
 
         # 请求参数（JSON格式）
-        self.params_edit = QTextEdit()
+        self.params_edit = CodeEditor("json")
         self.params_edit.setPlaceholderText('{"key1": "value1", "key2": "value2"}（无参数留空）')
         self.params_edit.setMinimumHeight(80)
         form_layout.addRow("请求参数", self.params_edit)
 
         # 请求头（JSON格式）
-        self.headers_edit = QTextEdit()
+        self.headers_edit = CodeEditor("json")
         self.headers_edit.setPlaceholderText('{"Content-Type": "application/json"}（无请求头留空）')
         self.headers_edit.setMinimumHeight(80)
         form_layout.addRow("请求头", self.headers_edit)
 
+        # 响应断言（JSON数组，批量运行/命令行运行时逐条检查）
+        self.assertions_edit = CodeEditor("json")
+        self.assertions_edit.setPlaceholderText(
+            '[{"type": "status", "expected": 200}, {"type": "jsonpath", "path": "$.code", "expected": 0},\n'
+            ' {"type": "latency", "max_ms": 500}]（类型：status / jsonpath / regex / latency / schema，无断言留空）')
+        self.assertions_edit.setMinimumHeight(80)
+        form_layout.addRow("响应断言", self.assertions_edit)
+
         layout.addLayout(form_layout)
 
         # 按钮区域
@@ -72,8 +120,10 @@ class ApiDialog(QDialog):
             self.name_edit.setText(self.api_data["name"])
             self.url_edit.setText(self.api_data["url"])
             self.method_combo.setCurrentText(self.api_data["method"])
-            self.params_edit.setText(format_json(self.api_data["params"]))
-            self.headers_edit.setText(format_json(self.api_data["headers"]))
+            self.params_edit.setPlainText(format_json(self.api_data["params"]))
+            self.headers_edit.setPlainText(format_json(self.api_data["headers"]))
+            if self.api_data.get("assertions") and self.api_data["assertions"] != "[]":
+                self.assertions_edit.setPlainText(format_json(self.api_data["assertions"]))
 
     def get_data(self):
         """获取表单数据"""
@@ -82,7 +132,8 @@ class ApiDialog(QDialog):
             "url": self.url_edit.text().strip(),
             "method": self.method_combo.currentText(),
             "params": self.params_edit.toPlainText().strip() or "{}",
-            "headers": self.headers_edit.toPlainText().strip() or "{}"
+            "headers": self.headers_edit.toPlainText().strip() or "{}",
+            "assertions": self.assertions_edit.toPlainText().strip() or "[]"
         }
 
     def accept(self):
@@ -92,15 +143,22 @@ class ApiDialog(QDialog):
             "接口名称": data["name"],
             "接口URL": data["url"],
             "请求方法": data["method"]
-        }):
+        }, parent=self):
+            try:
+                compile_assertions(data["assertions"])
+            except ValueError as e:
+                show_dialog_error(self, "断言格式错误", str(e))
+                return
             super().accept()
 
 class ApiModule(QWidget):
     """接口模块主页面"""
     def __init__(self):
         super().__init__()
+        self.run_worker = None
         self.init_ui()
-        self.load_api_list()
+        # 窗口显示后再查询列表（首次查询需要连接MySQL，不阻塞首屏）
+        QTimer.singleShot(0, self.load_api_list)
 
     def init_ui(self):
         self.setWindowTitle("接口管理")
@@ -112,14 +170,23 @@ class ApiModule(QWidget):
         btn_layout = QHBoxLayout()
         self.add_btn = QPushButton("新建接口")
         self.refresh_btn = QPushButton("刷新列表")
+        self.import_btn = QPushButton("导入")
+        self.workflow_btn = QPushButton("工作流")
         self.add_btn.clicked.connect(self.add_api)
+        self.import_btn.clicked.connect(self.import_apis)
         self.refresh_btn.clicked.connect(self.load_api_list)
+        self.workflow_btn.clicked.connect(self.open_workflows)
         # 按钮样式（通过QSS美化，这里只设置图标占位）
         self.add_btn.setIcon(QIcon.fromTheme("list-add"))
         self.refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.refresh_btn)
+        btn_layout.addWidget(self.import_btn)
+        btn_layout.addWidget(self.workflow_btn)
         btn_layout.addStretch()
+        # 环境选择（URL/参数/请求头中的 {{变量}} 按当前环境替换）
+        self.env_selector = EnvSelector()
+        btn_layout.addWidget(self.env_selector)
         layout.addLayout(btn_layout)
 
         # 分割器（列表 + 结果区域）
@@ -146,15 +213,22 @@ class ApiModule(QWidget):
         self.copy_btn.clicked.connect(self.copy_result)
         self.clear_btn.clicked.connect(self.clear_result)
         self.copy_btn.setEnabled(False)
+        self.record_check = QCheckBox("录制响应")
+        self.record_check.setChecked(MOCK_RECORD_RESPONSES)
+        self.record_check.setToolTip("运行接口时保存响应（不含 Set-Cookie 等凭据类响应头），供 Mock 服务回放")
         result_btn_layout.addWidget(self.copy_btn)
         result_btn_layout.addWidget(self.clear_btn)
         result_btn_layout.addStretch()
+        result_btn_layout.addWidget(self.record_check)
         result_layout.addLayout(result_btn_layout)
 
-        # 结果显示文本框
-        self.result_browser = QTextBrowser()
-        self.result_browser.setReadOnly(True)
-        result_layout.addWidget(self.result_browser)
+        # 结果显示：文本 + JSON树（大响应体在树中按需展开）
+        self.result_tabs = QTabWidget()
+        self.result_browser = CodeEditor("json", read_only=True)
+        self.json_tree = JsonTreeView()
+        self.result_tabs.addTab(self.result_browser, "文本")
+        self.result_tabs.addTab(self.json_tree, "JSON树")
+        result_layout.addWidget(self.result_tabs)
         splitter.addWidget(result_widget)
         splitter.setSizes([300, 200])  # 初始高度比例
 
@@ -163,8 +237,14 @@ class ApiModule(QWidget):
 
     def load_api_list(self):
         """加载接口列表"""
+        with metrics.span("ui.load_api_list.query"):
+            apis = db_dao.get_all_apis()
+        with metrics.span("ui.load_api_list.populate"):
+            self.fill_api_table(apis)
+
+    def fill_api_table(self, apis):
+        """填充接口表格"""
         self.api_table.setRowCount(0)
-        apis = db_dao.get_all_apis()
         for api in apis:
             row = self.api_table.rowCount()
             self.api_table.insertRow(row)
@@ -203,7 +283,7 @@ class ApiModule(QWidget):
             data = dialog.get_data()
             if db_dao.add_api(data):
                 self.load_api_list()
-                copy_to_clipboard("接口添加成功！")
+                show_info("提示", "接口添加成功！")
 
     def edit_api(self, api_data):
         """编辑接口"""
@@ -212,41 +292,87 @@ class ApiModule(QWidget):
             data = dialog.get_data()
             if db_dao.update_api(api_data["id"], data):
                 self.load_api_list()
-                copy_to_clipboard("接口更新成功！")
+                show_info("提示", "接口更新成功！")
 
     def delete_api(self, api_id):
         """删除接口"""
-        if QMessageBox.question(self, "确认删除", "是否删除该接口？",
-                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
+        if show_confirm(self, "确认删除", "是否删除该接口？"):
             if db_dao.delete_api(api_id):
                 self.load_api_list()
-                copy_to_clipboard("接口删除成功！")
+                show_info("提示", "接口删除成功！")
+
+    def import_apis(self):
+        """从 HAR 文件 / cURL 命令批量导入接口"""
+        if ApiImportDialog(self).exec():
+            self.load_api_list()
+
+    def open_workflows(self):
+        """打开工作流管理（使用当前环境变量运行）"""
+        WorkflowManagerDialog(self, self.env_selector.get_variables()).exec()
 
     def run_api(self, api_data):
-        """运行接口"""
+        """运行接口（请求、解析、格式化和断言都在后台线程，界面只负责显示）"""
+        if self.run_worker and self.run_worker.isRunning():
+            show_info("提示", "上一个请求尚未结束")
+            return
         self.result_browser.clear()
-        self.result_browser.append(f"=== 开始请求接口：{api_data['name']} ===")
-        self.result_browser.append(f"URL：{api_data['url']}")
-        self.result_browser.append(f"方法：{api_data['method']}")
-        self.result_browser.append(f"参数：{format_json(api_data['params'])}")
-        self.result_browser.append(f"请求头：{format_json(api_data['headers'])}")
-        self.result_browser.append("--- 响应结果 ---")
-
-        # 发送请求
-        result = send_request(
-            url=api_data["url"],
-            method=api_data["method"],
-            params=api_data["params"],
-            headers=api_data["headers"]
-        )
-
-        if result:
-            self.result_browser.append(f"状态码：{result['status_code']}")
-            self.result_browser.append(f"响应头：{format_json(result['headers'])}")
-            self.result_browser.append(f"响应体：{format_json(result['text'])}")
-        self.result_browser.append("=== 请求结束 ===")
+        self.json_tree.clear()
+        self.result_browser.appendPlainText(f"=== 开始请求接口：{api_data['name']} ===")
+        self.result_browser.appendPlainText(f"环境：{self.env_selector.env_combo.currentText()}")
+        self.result_browser.appendPlainText(f"URL：{api_data['url']}")
+        self.result_browser.appendPlainText(f"方法：{api_data['method']}")
+        self.result_browser.appendPlainText(f"参数：{format_json(api_data['params'])}")
+        self.result_browser.appendPlainText(f"请求头：{format_json(api_data['headers'])}")
+        self.result_browser.appendPlainText("--- 响应结果 ---")
+        self.run_worker = TaskWorker(run_api_request, api_data, self.env_selector.get_variables(),
+                                     self.record_check.isChecked(), parent=self)
+        self.run_worker.succeeded.connect(lambda outcome: self.show_result(api_data, outcome))
+        self.run_worker.failed.connect(lambda msg: self.show_result(api_data, {"error": msg}))
+        self.run_worker.start()
+
+    def show_result(self, api_data, outcome):
+        """显示请求结果（run_api_request 的返回值）"""
+        if outcome.get("error"):
+            self.result_browser.appendPlainText(f"请求失败：{outcome['error']}")
+            show_error("请求失败", outcome["error"])
+        else:
+            result = outcome["result"]
+            self.result_browser.appendPlainText(f"状态码：{result['status_code']}")
+            timing = result["timing"]
+            self.result_browser.appendPlainText(
+                f"耗时：总计 {timing['total']} ms（DNS {timing['dns']} / 连接 {timing['connect']} / "
+                f"首字节 {timing['ttfb']} / 下载 {timing['download']}）")
+            self.result_browser.appendPlainText(f"响应头：{format_json(result['headers'])}")
+            body = result["body"]
+            if len(body) > RESULT_TEXT_LIMIT:
+                # 超大响应体只在文本区显示原文开头部分，完整内容在JSON树中查看
+                self.result_browser.appendPlainText(
+                    f"响应体（{len(body)} 字符，仅显示前 {RESULT_TEXT_LIMIT} 字符原文，完整内容见「JSON树」）：")
+                self.result_tabs.setCurrentWidget(self.json_tree)
+            else:
+                self.result_browser.appendPlainText("响应体：")
+            self.result_browser.appendPlainText(outcome["body_text"])
+            self.json_tree.set_json(body)
+            self.show_assertions(outcome)
+        self.result_browser.appendPlainText("=== 请求结束 ===")
         self.copy_btn.setEnabled(True)
 
+    def show_assertions(self, outcome):
+        """显示接口断言的检查结果"""
+        if outcome["assertion_error"]:
+            self.result_browser.appendPlainText(f"断言格式错误：{outcome['assertion_error']}")
+            return
+        outcomes = outcome["assertions"]
+        if outcomes is None:
+            return
+        failed = sum(1 for item in outcomes if not item["passed"])
+        self.result_browser.appendPlainText(f"--- 断言（{len(outcomes)} 条，未通过 {failed} 条）---")
+        for item in outcomes:
+            if item["passed"]:
+                self.result_browser.appendPlainText(f"通过：{item['assertion']}")
+            else:
+                self.result_browser.appendPlainText(f"失败：{item['assertion']}（{item['message']}）")
+
     def copy_result(self):
         """复制结果"""
         copy_to_clipboard(self.result_browser.toPlainText())
@@ -254,4 +380,5 @@ class ApiModule(QWidget):
     def clear_result(self):
         """清空结果"""
         self.result_browser.clear()
+        self.json_tree.clear()
         self.copy_btn.setEnabled(False)
\ No newline at end of file
@@ -1,38 +1,274 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLineEdit, QComboBox, QLabel, QSplitter, QTextBrowser, QGroupBox, QAbstractItemView)
+from PyQt6.QtCore import Qt, QSize, QTimer
+from utils.common_utils import show_info, show_error, show_confirm
+from utils.system_actions import (ActionError, prepare_actions, preview, execute, rollback, list_journals,
+                                  ACTIONS, SCOPE_USER, SCOPE_MACHINE, APPLIED, REVERTED, ROLLED_BACK)
+from ui.workers import TaskWorker
+
+# 操作类型 -> (显示名称, [(操作, 显示名称)], 是否有范围, 值输入框提示)
+KIND_OPTIONS = {
+    "env": ("环境变量", [("set", "设置"), ("delete", "删除")], True, "变量值（含 %PATH% 等引用时按可展开字符串保存）"),
+    "service": ("服务", [("start", "启动"), ("stop", "停止"), ("restart", "重启"), ("auto", "设为自动启动"),
+                         ("manual", "设为手动启动"), ("disabled", "禁用")], False, ""),
+    "autostart": ("开机自启", [("add", "添加"), ("remove", "移除")], True, "启动命令（程序完整路径及参数）"),
+}
+STATUS_TEXT = {"pending": "未执行", APPLIED: "已完成", ROLLED_BACK: "失败（已回滚）", "failed": "失败",
+               REVERTED: "已回滚"}
+
 
 class CmdModule(QWidget):
-    """CMD脚本模块（待开发）"""
+    """
+    系统操作：环境变量、服务、开机自启
+    多项修改先加入批次，预览确认后整批执行（需要管理员权限时只弹一次授权），可整批回滚
+    """
     def __init__(self):
         super().__init__()
+        self.actions = []
+        self.worker = None
         self.init_ui()
+        QTimer.singleShot(0, self.load_history)
 
     def init_ui(self):
         self.setWindowTitle("CMD脚本管理")
         layout = QVBoxLayout()
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # 添加操作
+        form_group = QGroupBox("添加操作")
+        form_layout = QHBoxLayout(form_group)
+        self.kind_combo = QComboBox()
+        for kind, (text, _, _, _) in KIND_OPTIONS.items():
+            self.kind_combo.addItem(text, kind)
+        self.op_combo = QComboBox()
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem("当前用户", SCOPE_USER)
+        self.scope_combo.addItem("系统（需管理员）", SCOPE_MACHINE)
+        self.name_edit = QLineEdit()
+        self.value_edit = QLineEdit()
+        self.add_btn = QPushButton("加入批次")
+        self.kind_combo.currentIndexChanged.connect(self.on_kind_changed)
+        self.op_combo.currentIndexChanged.connect(self.on_op_changed)
+        self.add_btn.clicked.connect(self.add_action)
+        form_layout.addWidget(self.kind_combo)
+        form_layout.addWidget(self.op_combo)
+        form_layout.addWidget(self.scope_combo)
+        form_layout.addWidget(self.name_edit, 1)
+        form_layout.addWidget(self.value_edit, 2)
+        form_layout.addWidget(self.add_btn)
+        layout.addWidget(form_group)
+        self.on_kind_changed()
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # 当前批次
+        batch_widget = QWidget()
+        batch_layout = QVBoxLayout(batch_widget)
+        batch_layout.setContentsMargins(0, 0, 0, 0)
+        batch_btn_layout = QHBoxLayout()
+        batch_btn_layout.addWidget(QLabel("当前批次（按顺序执行，任一项失败时自动回滚已完成的项）"))
+        batch_btn_layout.addStretch()
+        self.remove_btn = QPushButton("移除所选")
+        self.clear_btn = QPushButton("清空")
+        self.preview_btn = QPushButton("预览")
+        self.run_btn = QPushButton("执行")
+        self.remove_btn.clicked.connect(self.remove_actions)
+        self.clear_btn.clicked.connect(self.clear_actions)
+        self.preview_btn.clicked.connect(self.preview_actions)
+        self.run_btn.clicked.connect(self.run_actions)
+        for btn in (self.remove_btn, self.clear_btn, self.preview_btn, self.run_btn):
+            batch_btn_layout.addWidget(btn)
+        batch_layout.addLayout(batch_btn_layout)
+        self.batch_table = QTableWidget()
+        self.batch_table.setColumnCount(2)
+        self.batch_table.setHorizontalHeaderLabels(["操作", "需要管理员"])
+        self.batch_table.horizontalHeader().setStretchLastSection(False)
+        self.batch_table.horizontalHeader().setSectionResizeMode(0, self.batch_table.horizontalHeader().ResizeMode.Stretch)
+        self.batch_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.batch_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        batch_layout.addWidget(self.batch_table)
+        splitter.addWidget(batch_widget)
+
+        # 预览 / 执行结果
+        self.output_browser = QTextBrowser()
+        splitter.addWidget(self.output_browser)
+
+        # 历史批次
+        history_widget = QWidget()
+        history_layout = QVBoxLayout(history_widget)
+        history_layout.setContentsMargins(0, 0, 0, 0)
+        history_btn_layout = QHBoxLayout()
+        history_btn_layout.addWidget(QLabel("历史批次"))
+        history_btn_layout.addStretch()
+        self.refresh_btn = QPushButton("刷新")
+        self.refresh_btn.clicked.connect(self.load_history)
+        history_btn_layout.addWidget(self.refresh_btn)
+        history_layout.addLayout(history_btn_layout)
+        self.history_table = QTableWidget()
+        self.history_table.setColumnCount(5)
+        self.history_table.setHorizontalHeaderLabels(["时间", "批次", "状态", "说明", "操作"])
+        self.history_table.horizontalHeader().setStretchLastSection(True)
+        self.history_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        history_layout.addWidget(self.history_table)
+        splitter.addWidget(history_widget)
+        splitter.setSizes([200, 150, 200])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    # ------------------------------ 编辑批次 ------------------------------
+    def on_kind_changed(self):
+        kind = self.kind_combo.currentData()
+        _, ops, has_scope, value_tip = KIND_OPTIONS[kind]
+        self.op_combo.blockSignals(True)
+        self.op_combo.clear()
+        for op, text in ops:
+            self.op_combo.addItem(text, op)
+        self.op_combo.blockSignals(False)
+        self.scope_combo.setVisible(has_scope)
+        self.name_edit.setPlaceholderText({"env": "变量名，例如 JAVA_HOME", "service": "服务名，例如 MySQL80",
+                                           "autostart": "自启动项名称"}[kind])
+        self.value_edit.setPlaceholderText(value_tip)
+        self.on_op_changed()
+
+    def on_op_changed(self):
+        # 只有 设置环境变量 / 添加自启动项 需要填写值
+        self.value_edit.setVisible(self.op_combo.currentData() in ("set", "add"))
+
+    def add_action(self):
+        kind = self.kind_combo.currentData()
+        action = {"kind": kind, "op": self.op_combo.currentData(), "name": self.name_edit.text().strip()}
+        if KIND_OPTIONS[kind][2]:
+            action["scope"] = self.scope_combo.currentData()
+        if action["op"] == "set":
+            action["value"] = self.value_edit.text()
+        elif action["op"] == "add":
+            action["command"] = self.value_edit.text().strip()
+        try:
+            prepare_actions([action])
+        except ActionError as e:
+            show_error("操作无效", str(e).split("：", 1)[-1])
+            return
+        self.actions.append(action)
+        self.name_edit.clear()
+        self.value_edit.clear()
+        self.fill_batch_table()
+
+    def fill_batch_table(self):
+        self.batch_table.setRowCount(0)
+        for action in prepare_actions(self.actions) if self.actions else []:
+            handler = ACTIONS[action["kind"]]
+            row = self.batch_table.rowCount()
+            self.batch_table.insertRow(row)
+            self.batch_table.setItem(row, 0, QTableWidgetItem(handler.describe(action)))
+            self.batch_table.setItem(row, 1, QTableWidgetItem("是" if handler.needs_admin(action) else ""))
+
+    def remove_actions(self):
+        rows = sorted({index.row() for index in self.batch_table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            del self.actions[row]
+        self.fill_batch_table()
+
+    def clear_actions(self):
+        self.actions = []
+        self.fill_batch_table()
+
+    # ------------------------------ 预览与执行 ------------------------------
+    def start_worker(self, func, *args, on_done=None):
+        """后台执行（读取服务状态、等待授权窗口和系统命令都可能较慢）"""
+        if self.worker and self.worker.isRunning():
+            return False
+        self.set_busy(True)
+        self.worker = TaskWorker(func, *args, parent=self)
+        self.worker.succeeded.connect(on_done)
+        self.worker.failed.connect(lambda msg: show_error("操作失败", msg))
+        self.worker.finished.connect(lambda: self.set_busy(False))
+        self.worker.start()
+        return True
+
+    def set_busy(self, busy):
+        for btn in (self.preview_btn, self.run_btn, self.add_btn, self.remove_btn, self.clear_btn):
+            btn.setEnabled(not busy)
+
+    def preview_actions(self):
+        """预览（dry-run）：列出每项的当前值与修改后的值，不做任何修改"""
+        if not self.actions:
+            show_error("提示", "请先添加操作")
+            return
+        self.start_worker(preview, list(self.actions), on_done=self.show_preview)
+
+    def show_preview(self, result):
+        self.output_browser.clear()
+        self.output_browser.append("=== 预览（未做任何修改） ===")
+        for index, step in enumerate(result["steps"], 1):
+            admin = "［管理员］" if step["admin"] else ""
+            self.output_browser.append(f"{index}. {admin}{step['description']}")
+            if step["error"]:
+                self.output_browser.append(f"    无法读取当前状态：{step['error']}")
+            else:
+                self.output_browser.append(f"    {step['current']}  →  {step['target']}")
+        if result["admin"]:
+            self.output_browser.append("执行时将请求一次管理员授权，整批在同一个提权进程中执行：")
+        else:
+            self.output_browser.append("无需管理员权限，直接执行：")
+        self.output_browser.append(result["command"])
+
+    def run_actions(self):
+        if not self.actions:
+            show_error("提示", "请先添加操作")
+            return
+        if not show_confirm(self, "确认执行", f"执行当前批次的 {len(self.actions)} 项修改？"):
+            return
+        self.start_worker(execute, list(self.actions), on_done=self.on_executed)
+
+    def on_executed(self, journal):
+        self.show_journal(journal)
+        if journal["status"] == APPLIED:
+            self.clear_actions()
+            show_info("执行完成", journal["title"])
+        else:
+            show_error("执行失败", journal["error"])
+        self.load_history()
+
+    def show_journal(self, journal):
+        self.output_browser.clear()
+        self.output_browser.append(f"=== {journal['title']}：{STATUS_TEXT.get(journal['status'], journal['status'])} ===")
+        for index, step in enumerate(journal["steps"], 1):
+            line = f"{index}. [{STATUS_TEXT.get(step['status'], step['status'])}] " \
+                   f"{ACTIONS[step['action']['kind']].describe(step['action'])}"
+            self.output_browser.append(f"{line}  {step['error']}" if step["error"] else line)
+        if journal["error"]:
+            self.output_browser.append(f"原因：{journal['error']}")
+
+    # ------------------------------ 历史与回滚 ------------------------------
+    def load_history(self):
+        journals = list_journals()
+        self.history_table.setRowCount(0)
+        for journal in journals:
+            row = self.history_table.rowCount()
+            self.history_table.insertRow(row)
+            self.history_table.setItem(row, 0, QTableWidgetItem(journal["created"]))
+            self.history_table.setItem(row, 1, QTableWidgetItem(journal["title"]))
+            self.history_table.setItem(row, 2, QTableWidgetItem(STATUS_TEXT.get(journal["status"], journal["status"])))
+            self.history_table.setItem(row, 3, QTableWidgetItem(journal["error"]))
+            btn_layout = QHBoxLayout()
+            btn_layout.setContentsMargins(0, 0, 0, 0)
+            detail_btn = QPushButton("详情")
+            detail_btn.setFixedSize(QSize(60, 25))
+            detail_btn.clicked.connect(lambda _, j=journal: self.show_journal(j))
+            btn_layout.addWidget(detail_btn)
+            if journal["status"] == APPLIED:
+                rollback_btn = QPushButton("回滚")
+                rollback_btn.setFixedSize(QSize(60, 25))
+                rollback_btn.clicked.connect(lambda _, j=journal: self.rollback_journal(j))
+                btn_layout.addWidget(rollback_btn)
+            btn_widget = QWidget()
+            btn_widget.setLayout(btn_layout)
+            self.history_table.setCellWidget(row, 4, btn_widget)
 
-        # 提示文本
-        tip_label = QLabel("CMD脚本功能\n待后续版本开发")
-        font = QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        tip_label.setFont(font)
-        tip_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        tip_label.setStyleSheet("color: #666;")
-        layout.addWidget(tip_label)
-
-        # 占位按钮
-        btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(20)
-        self.feedback_btn = QPushButton("提交需求反馈")
-        self.check_update_btn = QPushButton("检查更新")
-        self.feedback_btn.setFixedSize(150, 40)
-        self.check_update_btn.setFixedSize(150, 40)
-        btn_layout.addWidget(self.feedback_btn)
-        btn_layout.addWidget(self.check_update_btn)
-        layout.addLayout(btn_layout)
-
-        self.setLayout(layout)
\ No newline at end of file
+    def rollback_journal(self, journal):
+        """整批恢复该批次修改前的状态"""
+        if not show_confirm(self, "确认回滚", f"恢复批次「{journal['title']}」修改前的状态？"):
+            return
+        self.start_worker(rollback, journal["path"], on_done=self.on_executed)
@@ -0,0 +1,319 @@
+import re
+from PyQt6.QtWidgets import QPlainTextEdit, QWidget, QTextEdit
+from PyQt6.QtCore import Qt, QRect, QSize, QTimer
+from PyQt6.QtGui import QColor, QFont, QFontDatabase, QPainter, QSyntaxHighlighter, QTextCharFormat, QTextFormat
+from utils.sql_utils import SQL_KEYWORDS
+
+# 超过该字符数的文本（setPlainText / 粘贴 / 追加）分批高亮：每次定时器回调高亮 HIGHLIGHT_CHUNK_BLOCKS 行，界面不卡顿
+LARGE_TEXT_CHARS = 200000
+HIGHLIGHT_CHUNK_BLOCKS = 500
+# 单行只高亮前面这么多字符（压缩成一行的大JSON不逐字符着色）
+MAX_HIGHLIGHT_LINE = 10000
+
+# 多行注释 /* */ 内部的块状态
+_IN_COMMENT = 1
+# 统计括号时先去掉字符串，避免字符串中的括号影响折叠范围
+_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+
+_SQL_WORDS = sorted({word for keyword in SQL_KEYWORDS for word in keyword.split()} |
+                    {"INTO", "BY", "INDEX", "KEY", "WITH", "CREATE", "ALTER", "DROP", "TABLE", "IF", "TRUE", "FALSE",
+                     "INTERVAL", "CROSS", "OUTER", "FULL", "ALL", "ANY", "CAST", "PROCEDURE", "FUNCTION", "VIEW",
+                     "TRIGGER", "BEGIN", "COMMIT", "ROLLBACK", "DATABASE", "USE", "SHOW", "FOR", "RETURNS"},
+                    key=len, reverse=True)
+_SQL_PATTERN = re.compile(
+    r"(?P<comment>--[^\n]*|#[^\n]*)"
+    r"|(?P<comment_start>/\*)"
+    r"|(?P<variable>\{\{[^}]*\}\})"
+    r"|(?P<string>'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<identifier>`[^`]*`)"
+    r"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    r"|(?P<keyword>\b(?:" + "|".join(_SQL_WORDS) + r")\b)",
+    re.IGNORECASE)
+_JSON_PATTERN = re.compile(
+    r"(?P<variable>\{\{[^}]*\}\})"
+    r"|(?P<key>\"(?:[^\"\\]|\\.)*\"(?=\s*:))"
+    r"|(?P<string>\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)"
+    r"|(?P<literal>\b(?:true|false|null)\b)")
+
+
+def _char_format(color, bold=False, italic=False):
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(QFont.Weight.Bold)
+    fmt.setFontItalic(italic)
+    return fmt
+
+
+def bracket_delta(text):
+    """一行中 左括号数 - 右括号数（不含字符串中的括号）"""
+    text = _QUOTED.sub("", text)
+    return sum(text.count(c) for c in "{[(") - sum(text.count(c) for c in "}])")
+
+
+class _Highlighter(QSyntaxHighlighter):
+    """
+    按行（文本块）增量高亮：编辑时 Qt 只重新高亮改动的行（及多行注释状态发生变化的后续行）
+    大文本调用 defer() 后，未高亮的行先跳过，由定时器从前往后分批补上
+    """
+    PATTERN = None
+    FORMATS = {}
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.ready_blocks = None  # 已可高亮的行数上限（None 表示全部）
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.highlight_chunk)
+
+    def defer(self, from_block=0):
+        """从第 from_block 行起改为分批高亮"""
+        self.ready_blocks = from_block if self.ready_blocks is None else min(self.ready_blocks, from_block)
+        self.timer.start(0)
+
+    def highlight_chunk(self):
+        block = self.document().findBlockByNumber(self.ready_blocks)
+        self.ready_blocks += HIGHLIGHT_CHUNK_BLOCKS
+        while block.isValid() and block.blockNumber() < self.ready_blocks:
+            self.rehighlightBlock(block)
+            block = block.next()
+        if block.isValid():
+            self.timer.start(0)
+        else:
+            self.ready_blocks = None
+
+    def highlightBlock(self, text):
+        if self.ready_blocks is not None and self.currentBlock().blockNumber() >= self.ready_blocks:
+            # 尚未轮到：沿用上一行的状态，等定时器补上
+            self.setCurrentBlockState(self.previousBlockState())
+            return
+        self.highlight(text[:MAX_HIGHLIGHT_LINE])
+
+    def highlight(self, text):
+        for match in self.PATTERN.finditer(text):
+            self.setFormat(match.start(), match.end() - match.start(), self.FORMATS[match.lastgroup])
+
+
+class SqlHighlighter(_Highlighter):
+    """SQL：关键字、字符串、数字、`标识符`、{{变量}}、单行/多行注释"""
+    PATTERN = _SQL_PATTERN
+    FORMATS = {
+        "keyword": _char_format("#0033b3", bold=True),
+        "string": _char_format("#067d17"),
+        "identifier": _char_format("#871094"),
+        "number": _char_format("#1750eb"),
+        "variable": _char_format("#b7791f", bold=True),
+        "comment": _char_format("#8c8c8c", italic=True),
+    }
+
+    def highlight(self, text):
+        self.setCurrentBlockState(0)
+        comment = self.FORMATS["comment"]
+        pos = 0
+        if self.previousBlockState() == _IN_COMMENT:
+            end = text.find("*/")
+            if end < 0:
+                self.setFormat(0, len(text), comment)
+                self.setCurrentBlockState(_IN_COMMENT)
+                return
+            self.setFormat(0, end + 2, comment)
+            pos = end + 2
+        while True:
+            match = self.PATTERN.search(text, pos)
+            if match is None:
+                return
+            if match.lastgroup == "comment_start":
+                end = text.find("*/", match.end())
+                if end < 0:
+                    self.setFormat(match.start(), len(text) - match.start(), comment)
+                    self.setCurrentBlockState(_IN_COMMENT)
+                    return
+                self.setFormat(match.start(), end + 2 - match.start(), comment)
+                pos = end + 2
+                continue
+            self.setFormat(match.start(), match.end() - match.start(), self.FORMATS[match.lastgroup])
+            pos = match.end()
+
+
+class JsonHighlighter(_Highlighter):
+    """JSON：键、字符串、数字、true/false/null、{{变量}}"""
+    PATTERN = _JSON_PATTERN
+    FORMATS = {
+        "key": _char_format("#871094"),
+        "string": _char_format("#067d17"),
+        "number": _char_format("#1750eb"),
+        "literal": _char_format("#0033b3", bold=True),
+        "variable": _char_format("#b7791f", bold=True),
+    }
+
+
+HIGHLIGHTERS = {"sql": SqlHighlighter, "json": JsonHighlighter}
+
+
+class _Gutter(QWidget):
+    """左侧行号栏（含折叠标记），绘制和点击都交给编辑器"""
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+
+    def sizeHint(self):
+        return QSize(self.editor.gutter_width(), 0)
+
+    def paintEvent(self, event):
+        self.editor.paint_gutter(event)
+
+    def mousePressEvent(self, event):
+        self.editor.gutter_clicked(event.position().y())
+
+
+class CodeEditor(QPlainTextEdit):
+    """
+    代码编辑器/结果文本区：等宽字体、行号、按括号折叠（点击行号栏的 ▾/▸），language 为 sql/json 时语法高亮
+    大文本（超过 LARGE_TEXT_CHARS）的高亮分批进行，粘贴或载入几MB的SQL/JSON时界面仍可操作
+    """
+    FOLD_MARK_WIDTH = 14
+
+    def __init__(self, language=None, read_only=False, parent=None):
+        super().__init__(parent)
+        self.highlighter = HIGHLIGHTERS[language](self.document()) if language else None
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setTabStopDistance(self.fontMetrics().horizontalAdvance(" ") * 4)
+        self.setReadOnly(read_only)
+        self.gutter = _Gutter(self)
+        self.blockCountChanged.connect(self.update_gutter_width)
+        self.updateRequest.connect(self.update_gutter)
+        if not read_only:
+            self.cursorPositionChanged.connect(self.highlight_current_line)
+        self.update_gutter_width()
+
+    # ------------------------------ 文本 ------------------------------
+    def setPlainText(self, text):
+        text = text or ""
+        if self.highlighter and len(text) > LARGE_TEXT_CHARS:
+            self.highlighter.defer(0)
+        super().setPlainText(text)
+
+    def appendPlainText(self, text):
+        if self.highlighter and len(text) > LARGE_TEXT_CHARS:
+            self.highlighter.defer(self.blockCount())
+        super().appendPlainText(text)
+
+    def insertFromMimeData(self, source):
+        if self.highlighter and source.hasText() and len(source.text()) > LARGE_TEXT_CHARS:
+            self.highlighter.defer(self.textCursor().blockNumber())
+        super().insertFromMimeData(source)
+
+    # ------------------------------ 行号栏 ------------------------------
+    def gutter_width(self):
+        digits = len(str(max(1, self.blockCount())))
+        return 10 + self.fontMetrics().horizontalAdvance("9") * digits + self.FOLD_MARK_WIDTH
+
+    def update_gutter_width(self, *_):
+        self.setViewportMargins(self.gutter_width(), 0, 0, 0)
+
+    def update_gutter(self, rect, dy):
+        if dy:
+            self.gutter.scroll(0, dy)
+        else:
+            self.gutter.update(0, rect.y(), self.gutter.width(), rect.height())
+        if rect.contains(self.viewport().rect()):
+            self.update_gutter_width()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        rect = self.contentsRect()
+        self.gutter.setGeometry(QRect(rect.left(), rect.top(), self.gutter_width(), rect.height()))
+
+    def visible_blocks(self):
+        """当前可见的 (行, 顶部y, 底部y)"""
+        block = self.firstVisibleBlock()
+        top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
+        height = self.viewport().height()
+        while block.isValid() and top <= height:
+            bottom = top + self.blockBoundingRect(block).height()
+            if block.isVisible():
+                yield block, top, bottom
+            block = block.next()
+            top = bottom
+
+    def paint_gutter(self, event):
+        painter = QPainter(self.gutter)
+        painter.fillRect(event.rect(), QColor("#f5f7fa"))
+        painter.setFont(self.font())
+        number_width = self.gutter.width() - self.FOLD_MARK_WIDTH - 4
+        line_height = self.fontMetrics().height()
+        current = self.textCursor().blockNumber()
+        for block, top, bottom in self.visible_blocks():
+            if bottom < event.rect().top():
+                continue
+            painter.setPen(QColor("#2d3748" if block.blockNumber() == current else "#a0aec0"))
+            painter.drawText(0, int(top), number_width, line_height, Qt.AlignmentFlag.AlignRight,
+                             str(block.blockNumber() + 1))
+            if self.is_folded(block):
+                mark = "▸"
+            elif self.is_foldable(block):
+                mark = "▾"
+            else:
+                continue
+            painter.setPen(QColor("#4a5568"))
+            painter.drawText(number_width + 4, int(top), self.FOLD_MARK_WIDTH, line_height,
+                             Qt.AlignmentFlag.AlignCenter, mark)
+
+    def gutter_clicked(self, y):
+        for block, top, bottom in self.visible_blocks():
+            if top <= y < bottom:
+                self.toggle_fold(block)
+                return
+
+    def highlight_current_line(self):
+        selection = QTextEdit.ExtraSelection()
+        selection.format.setBackground(QColor("#f0f6ff"))
+        selection.format.setProperty(QTextFormat.Property.FullWidthSelection, True)
+        selection.cursor = self.textCursor()
+        selection.cursor.clearSelection()
+        self.setExtraSelections([selection])
+
+    # ------------------------------ 折叠 ------------------------------
+    def is_foldable(self, block):
+        """该行打开的括号在后面的行才闭合"""
+        return block.next().isValid() and len(block.text()) <= MAX_HIGHLIGHT_LINE and bracket_delta(block.text()) > 0
+
+    @staticmethod
+    def is_folded(block):
+        return block.next().isValid() and not block.next().isVisible()
+
+    @staticmethod
+    def fold_end(block):
+        """与该行括号闭合的行（未闭合返回 None）"""
+        depth = bracket_delta(block.text())
+        block = block.next()
+        while block.isValid():
+            depth += bracket_delta(block.text())
+            if depth <= 0:
+                return block
+            block = block.next()
+        return None
+
+    def toggle_fold(self, block):
+        """折叠/展开该行到括号闭合行之间的内容（闭合行保留显示）"""
+        if self.is_folded(block):
+            visible = True
+            end = block.next()
+            while end.isValid() and not end.isVisible():
+                end = end.next()
+        elif self.is_foldable(block):
+            visible = False
+            end = self.fold_end(block)
+            if end is None or end == block.next():
+                return
+        else:
+            return
+        inner = block.next()
+        while inner.isValid() and inner != end:
+            inner.setVisible(visible)
+            inner = inner.next()
+        self.document().markContentsDirty(block.position(), end.position() - block.position())
+        self.viewport().update()
+        self.gutter.update()
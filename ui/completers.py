@@ -0,0 +1,110 @@
+import re
+from PyQt6.QtWidgets import QCompleter
+from PyQt6.QtCore import Qt, QEvent, QStringListModel, QTimer
+from PyQt6.QtGui import QTextCursor
+from utils.schema_cache import schema_cache
+
+# 光标前的 [限定名.]前缀，如 "user_in" 或 "test_db.us"
+_PREFIX_PATTERN = re.compile(r"(?:([A-Za-z0-9_$]+)\.)?([A-Za-z0-9_$]*)$")
+# 弹出补全的最少字符数（Ctrl+空格 强制弹出）
+MIN_PREFIX_LENGTH = 2
+
+
+class SchemaNameCompleter(QCompleter):
+    """输入框补全（库名/表名），补全项来自库表结构缓存，缓存更新后自动重建列表"""
+    def __init__(self, line_edit, words_func):
+        super().__init__(line_edit)
+        self.words_func = words_func
+        self.words = None
+        self.setModel(QStringListModel(self))
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setFilterMode(Qt.MatchFlag.MatchContains)
+        # 先连接再 setCompleter，保证每次输入先刷新补全列表
+        line_edit.textEdited.connect(self.refresh_model)
+        line_edit.setCompleter(self)
+        self.refresh_model()
+
+    def refresh_model(self):
+        words = self.words_func()
+        if words != self.words:
+            self.words = words
+            self.model().setStringList(words)
+
+
+def attach_name_completers(db_edit, table_edit, cache_func=lambda: schema_cache):
+    """库名、表名输入框补全（表名按当前填写的库名补全；cache_func 返回当前连接的库表结构缓存）"""
+    SchemaNameCompleter(db_edit, lambda: cache_func().databases())
+    SchemaNameCompleter(table_edit, lambda: cache_func().tables(db_edit.text().strip()))
+
+
+class SqlCompleter(QCompleter):
+    """
+    SQL编辑器补全（QTextEdit/QPlainTextEdit）：关键字、库名、当前库的表名和列名
+    "库名." 后补全该库的表，"表名." 后补全该表的列；回车/Tab 确认，Ctrl+空格 强制弹出
+    """
+    def __init__(self, editor, db_name_func=None, cache_func=lambda: schema_cache):
+        super().__init__(editor)
+        self.editor = editor
+        self.db_name_func = db_name_func or (lambda: "")
+        self.cache_func = cache_func
+        self.model_key = None
+        self.setModel(QStringListModel(self))
+        self.setWidget(editor)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+        self.activated.connect(self.insert_completion)
+        editor.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.editor and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            if self.popup().isVisible() and key in (Qt.Key.Key_Enter, Qt.Key.Key_Return, Qt.Key.Key_Tab,
+                                                    Qt.Key.Key_Backtab, Qt.Key.Key_Escape):
+                # 交给补全弹窗处理，编辑器不再插入换行/制表符
+                return True
+            if key == Qt.Key.Key_Space and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+                self.update_popup(force=True)
+                return True
+            if event.text() or key in (Qt.Key.Key_Backspace, Qt.Key.Key_Delete):
+                # 等编辑器处理完按键后再计算前缀
+                QTimer.singleShot(0, self.update_popup)
+        return super().eventFilter(obj, event)
+
+    def words_for(self, qualifier):
+        """补全候选：限定名是库则补全表，是表则补全列，否则补全关键字/库/表/列"""
+        db_name = self.db_name_func()
+        cache = self.cache_func()
+        if qualifier:
+            if qualifier in cache.databases():
+                return cache.tables(qualifier)
+            return cache.columns(db_name, qualifier)
+        return cache.completion_words(db_name)
+
+    def update_popup(self, force=False):
+        cursor = self.editor.textCursor()
+        line = cursor.block().text()[:cursor.positionInBlock()]
+        qualifier, prefix = _PREFIX_PATTERN.search(line).groups()
+        if not force and not qualifier and len(prefix) < MIN_PREFIX_LENGTH:
+            self.popup().hide()
+            return
+        cache = self.cache_func()
+        key = (id(cache), cache.version, self.db_name_func(), qualifier)
+        if key != self.model_key:
+            self.model_key = key
+            self.model().setStringList(self.words_for(qualifier))
+        self.setCompletionPrefix(prefix)
+        if self.completionCount() == 0 or (self.completionCount() == 1 and self.currentCompletion() == prefix):
+            self.popup().hide()
+            return
+        self.popup().setCurrentIndex(self.completionModel().index(0, 0))
+        rect = self.editor.cursorRect()
+        rect.setWidth(self.popup().sizeHintForColumn(0) + self.popup().verticalScrollBar().sizeHint().width())
+        self.complete(rect)
+
+    def insert_completion(self, text):
+        """用补全项替换光标前的前缀"""
+        cursor = self.editor.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Left, QTextCursor.MoveMode.KeepAnchor,
+                            len(self.completionPrefix()))
+        cursor.insertText(text)
+        self.editor.setTextCursor(cursor)
@@ -0,0 +1,248 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QSpinBox, QCheckBox,
+                             QComboBox, QFileDialog)
+from PyQt6.QtCore import QSize
+from config import DB_CONFIG, SQL_MAX_PARALLEL
+from db.dao import db_dao
+from utils.common_utils import show_info, show_confirm, show_dialog_error, validate_required_fields
+from ui.workers import TaskWorker
+
+DEFAULT_CONNECTION_TEXT = f"默认连接（{DB_CONFIG['host']}:{DB_CONFIG['port']}）"
+
+
+class ConnectionDialog(QDialog):
+    """数据库连接新建/编辑对话框"""
+    def __init__(self, parent=None, connection_data=None):
+        super().__init__(parent)
+        self.connection_data = connection_data
+        self.worker = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("编辑连接" if self.connection_data else "新建连接")
+        self.setMinimumSize(500, 450)
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        form_layout.setSpacing(15)
+        form_layout.setContentsMargins(20, 20, 20, 20)
+
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("例如：生产只读从库")
+        form_layout.addRow("连接名称*", self.name_edit)
+
+        self.host_edit = QLineEdit()
+        self.host_edit.setPlaceholderText("例如：10.0.0.12")
+        form_layout.addRow("主机*", self.host_edit)
+
+        self.port_spin = QSpinBox()
+        self.port_spin.setRange(1, 65535)
+        self.port_spin.setValue(3306)
+        form_layout.addRow("端口", self.port_spin)
+
+        self.user_edit = QLineEdit()
+        form_layout.addRow("用户名*", self.user_edit)
+
+        self.password_edit = QLineEdit()
+        self.password_edit.setEchoMode(QLineEdit.EchoMode.Password)
+        form_layout.addRow("密码", self.password_edit)
+
+        self.charset_edit = QLineEdit("utf8mb4")
+        form_layout.addRow("字符集", self.charset_edit)
+
+        # SSL（指定CA证书时校验服务器证书）
+        ssl_layout = QHBoxLayout()
+        self.ssl_check = QCheckBox("使用SSL")
+        self.ssl_ca_edit = QLineEdit()
+        self.ssl_ca_edit.setPlaceholderText("CA证书路径（可选）")
+        self.ssl_ca_btn = QPushButton("选择")
+        self.ssl_ca_btn.clicked.connect(self.choose_ssl_ca)
+        ssl_layout.addWidget(self.ssl_check)
+        ssl_layout.addWidget(self.ssl_ca_edit)
+        ssl_layout.addWidget(self.ssl_ca_btn)
+        form_layout.addRow("SSL", ssl_layout)
+
+        self.pool_size_spin = QSpinBox()
+        self.pool_size_spin.setRange(1, 64)
+        self.pool_size_spin.setValue(SQL_MAX_PARALLEL)
+        form_layout.addRow("连接池大小", self.pool_size_spin)
+
+        self.desc_edit = QLineEdit()
+        self.desc_edit.setPlaceholderText("请输入连接描述（可选）")
+        form_layout.addRow("描述", self.desc_edit)
+
+        layout.addLayout(form_layout)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setContentsMargins(20, 0, 20, 20)
+        self.test_btn = QPushButton("测试连接")
+        self.save_btn = QPushButton("保存")
+        self.cancel_btn = QPushButton("取消")
+        self.test_btn.clicked.connect(self.test_connection)
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.test_btn)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+        if self.connection_data:
+            data = self.connection_data
+            self.name_edit.setText(data["name"])
+            self.host_edit.setText(data["host"])
+            self.port_spin.setValue(int(data.get("port") or 3306))
+            self.user_edit.setText(data["user"])
+            self.password_edit.setText(data.get("password") or "")
+            self.charset_edit.setText(data.get("charset") or "utf8mb4")
+            self.ssl_check.setChecked(bool(data.get("use_ssl")))
+            self.ssl_ca_edit.setText(data.get("ssl_ca") or "")
+            self.pool_size_spin.setValue(int(data.get("pool_size") or SQL_MAX_PARALLEL))
+            self.desc_edit.setText(data.get("description") or "")
+
+    def choose_ssl_ca(self):
+        path, _ = QFileDialog.getOpenFileName(self, "选择CA证书", "", "证书 (*.pem *.crt);;所有文件 (*)")
+        if path:
+            self.ssl_ca_edit.setText(path)
+            self.ssl_check.setChecked(True)
+
+    def get_data(self):
+        """获取表单数据"""
+        return {
+            "name": self.name_edit.text().strip(),
+            "host": self.host_edit.text().strip(),
+            "port": self.port_spin.value(),
+            "user": self.user_edit.text().strip(),
+            "password": self.password_edit.text(),
+            "charset": self.charset_edit.text().strip() or "utf8mb4",
+            "use_ssl": self.ssl_check.isChecked(),
+            "ssl_ca": self.ssl_ca_edit.text().strip(),
+            "pool_size": self.pool_size_spin.value(),
+            "description": self.desc_edit.text().strip()
+        }
+
+    def test_connection(self):
+        """后台测试连接（避免连不上时界面卡住）"""
+        if self.worker and self.worker.isRunning():
+            return
+        self.test_btn.setEnabled(False)
+        self.test_btn.setText("测试中...")
+        self.worker = TaskWorker(db_dao.test_connection, self.get_data(), parent=self)
+        self.worker.succeeded.connect(lambda version: show_info("连接成功", f"服务器版本：{version}"))
+        self.worker.failed.connect(lambda msg: show_dialog_error(self, "连接失败", msg))
+        self.worker.finished.connect(self.reset_test_btn)
+        self.worker.start()
+
+    def reset_test_btn(self):
+        self.test_btn.setEnabled(True)
+        self.test_btn.setText("测试连接")
+
+    def accept(self):
+        """保存前验证"""
+        data = self.get_data()
+        if validate_required_fields({"连接名称": data["name"], "主机": data["host"], "用户名": data["user"]}, parent=self):
+            super().accept()
+
+    def done(self, result):
+        # 测试连接未结束时等待线程退出，避免对话框销毁时线程仍在运行
+        if self.worker and self.worker.isRunning():
+            self.worker.wait()
+        super().done(result)
+
+
+class ConnectionManagerDialog(QDialog):
+    """数据库连接管理（列表 + 增删改）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+        self.load_connection_list()
+
+    def init_ui(self):
+        self.setWindowTitle("连接管理")
+        self.setMinimumSize(800, 400)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        btn_layout = QHBoxLayout()
+        self.add_btn = QPushButton("新建连接")
+        self.add_btn.clicked.connect(self.add_connection)
+        btn_layout.addWidget(self.add_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        self.connection_table = QTableWidget()
+        self.connection_table.setColumnCount(6)
+        self.connection_table.setHorizontalHeaderLabels(["ID", "连接名称", "地址", "用户名", "描述", "操作"])
+        self.connection_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.connection_table)
+
+        self.setLayout(layout)
+
+    def load_connection_list(self):
+        """加载连接列表"""
+        self.connection_table.setRowCount(0)
+        for connection in db_dao.get_all_connections():
+            row = self.connection_table.rowCount()
+            self.connection_table.insertRow(row)
+            address = f"{connection['host']}:{connection['port']}" + ("（SSL）" if connection.get("use_ssl") else "")
+            self.connection_table.setItem(row, 0, QTableWidgetItem(str(connection["id"])))
+            self.connection_table.setItem(row, 1, QTableWidgetItem(connection["name"]))
+            self.connection_table.setItem(row, 2, QTableWidgetItem(address))
+            self.connection_table.setItem(row, 3, QTableWidgetItem(connection["user"]))
+            self.connection_table.setItem(row, 4, QTableWidgetItem(connection.get("description") or ""))
+            btn_layout = QHBoxLayout()
+            edit_btn = QPushButton("编辑")
+            delete_btn = QPushButton("删除")
+            edit_btn.clicked.connect(lambda _, c=connection: self.edit_connection(c))
+            delete_btn.clicked.connect(lambda _, c=connection: self.delete_connection(c["id"]))
+            edit_btn.setFixedSize(QSize(60, 25))
+            delete_btn.setFixedSize(QSize(60, 25))
+            btn_layout.addWidget(edit_btn)
+            btn_layout.addWidget(delete_btn)
+            btn_widget = QWidget()
+            btn_widget.setLayout(btn_layout)
+            self.connection_table.setCellWidget(row, 5, btn_widget)
+
+    def add_connection(self):
+        """新建连接"""
+        dialog = ConnectionDialog(self)
+        if dialog.exec() and db_dao.add_connection(dialog.get_data()):
+            self.load_connection_list()
+
+    def edit_connection(self, connection_data):
+        """编辑连接"""
+        dialog = ConnectionDialog(self, connection_data)
+        if dialog.exec() and db_dao.update_connection(connection_data["id"], dialog.get_data()):
+            self.load_connection_list()
+
+    def delete_connection(self, connection_id):
+        """删除连接"""
+        if show_confirm(self, "确认删除", "是否删除该连接？使用该连接的SQL脚本将改为默认连接。"):
+            if db_dao.delete_connection(connection_id):
+                self.load_connection_list()
+
+
+class ConnectionCombo(QComboBox):
+    """连接选择下拉框（第一项为默认连接，数据为连接配置ID，默认连接为None）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumWidth(180)
+        self.load_connections()
+
+    def load_connections(self, selected_id=None):
+        """加载连接列表（未指定时保留当前选中项）"""
+        selected_id = selected_id if selected_id is not None else self.current_id()
+        self.blockSignals(True)
+        self.clear()
+        self.addItem(DEFAULT_CONNECTION_TEXT, None)
+        for connection in db_dao.get_all_connections():
+            self.addItem(f"{connection['name']}（{connection['host']}:{connection['port']}）", connection["id"])
+        index = self.findData(selected_id) if selected_id else 0
+        self.setCurrentIndex(max(index, 0))
+        self.blockSignals(False)
+
+    def current_id(self):
+        """当前选中的连接配置ID（默认连接为None）"""
+        return self.currentData() if self.count() else None
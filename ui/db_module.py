@@ -1,13 +1,29 @@
+import threading
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QTextEdit,
-                             QTabWidget, QSplitter, QTextBrowser, QMessageBox, QLabel)
-from PyQt6.QtCore import Qt, QSize
+                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit,
+                             QTabWidget, QSplitter, QLabel, QFileDialog, QProgressDialog)
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon
 from db.dao import db_dao
-from utils.common_utils import copy_to_clipboard, validate_required_fields
+from utils.metrics_utils import metrics
+from utils.common_utils import copy_to_clipboard, validate_required_fields, show_info, show_error, show_confirm
+from utils.export_utils import EXPORT_FORMATS, available_formats, export_batches, format_for_path
+from utils.schema_cache import get_schema_cache
+from utils.sql_utils import split_statements, is_query
+from ui.code_editor import CodeEditor
+from ui.completers import SqlCompleter, attach_name_completers
+from ui.connection_module import ConnectionCombo, ConnectionManagerDialog
+from ui.env_module import EnvSelector
+from ui.explain_dialog import ExplainDialog
+from ui.result_grid import ResultGrid
+from ui.schema_browser import SchemaBrowserWidget, load_schema_async
+from ui.workers import TaskWorker
 
 class SqlDialog(QDialog):
     """SQL脚本新建/编辑对话框"""
+    # 切换连接时发出（连接配置ID），用于加载该连接的库表结构供补全
+    connection_changed = pyqtSignal(object)
+
     def __init__(self, parent=None, sql_data=None):
         super().__init__(parent)
         self.sql_data = sql_data
@@ -33,6 +49,12 @@ class SqlDialog(QDialog):
         self.desc_edit.setPlaceholderText("请输入脚本描述（可选）")
         form_layout.addRow("描述", self.desc_edit)
 
+        # 数据库连接
+        self.connection_combo = ConnectionCombo()
+        self.connection_combo.currentIndexChanged.connect(
+            lambda _: self.connection_changed.emit(self.connection_combo.current_id()))
+        form_layout.addRow("数据库连接", self.connection_combo)
+
         # 目标库名
         self.db_name_edit = QLineEdit()
         self.db_name_edit.setPlaceholderText("例如：test_db")
@@ -43,14 +65,24 @@ class SqlDialog(QDialog):
         self.table_name_edit.setPlaceholderText("例如：user_info（可选）")
         form_layout.addRow("目标表名", self.table_name_edit)
 
+        # 多库执行的目标库
+        self.target_dbs_edit = QLineEdit()
+        self.target_dbs_edit.setPlaceholderText("可选，多个库用逗号分隔，支持通配符，如 shard_01, shard_02 或 tenant_%")
+        form_layout.addRow("多库执行", self.target_dbs_edit)
+
         # SQL内容
-        self.sql_edit = QTextEdit()
+        self.sql_edit = CodeEditor("sql")
         self.sql_edit.setPlaceholderText("请输入SQL语句（支持多语句）")
         self.sql_edit.setMinimumHeight(150)
         form_layout.addRow("SQL内容*", self.sql_edit)
 
         layout.addLayout(form_layout)
 
+        # 库名/表名/SQL自动补全（数据来自当前连接的库表结构缓存）
+        cache_func = lambda: get_schema_cache(self.connection_combo.current_id())
+        attach_name_completers(self.db_name_edit, self.table_name_edit, cache_func)
+        self.sql_completer = SqlCompleter(self.sql_edit, lambda: self.db_name_edit.text().strip(), cache_func)
+
         # 按钮区域
         btn_layout = QHBoxLayout()
         btn_layout.setContentsMargins(20, 0, 20, 20)
@@ -71,7 +103,9 @@ class SqlDialog(QDialog):
             self.desc_edit.setText(self.sql_data.get("description", ""))
             self.db_name_edit.setText(self.sql_data["db_name"])
             self.table_name_edit.setText(self.sql_data.get("table_name", ""))
-            self.sql_edit.setText(self.sql_data["sql_content"])
+            self.target_dbs_edit.setText(self.sql_data.get("target_dbs") or "")
+            self.connection_combo.load_connections(self.sql_data.get("connection_id"))
+            self.sql_edit.setPlainText(self.sql_data["sql_content"])
 
     def get_data(self):
         """获取表单数据"""
@@ -80,6 +114,8 @@ class SqlDialog(QDialog):
             "description": self.desc_edit.text().strip(),
             "db_name": self.db_name_edit.text().strip(),
             "table_name": self.table_name_edit.text().strip(),
+            "target_dbs": self.target_dbs_edit.text().strip(),
+            "connection_id": self.connection_combo.current_id(),
             "sql_content": self.sql_edit.toPlainText().strip()
         }
 
@@ -90,7 +126,7 @@ class SqlDialog(QDialog):
             "脚本名称": data["name"],
             "目标库名": data["db_name"],
             "SQL内容": data["sql_content"]
-        }):
+        }, parent=self):
             super().accept()
 
 class SqlExampleWidget(QWidget):
@@ -127,8 +163,8 @@ class SqlExampleWidget(QWidget):
             desc_label.setStyleSheet("color: #666;")
             layout.addWidget(desc_label)
             # SQL内容（可复制）
-            sql_browser = QTextBrowser()
-            sql_browser.setText(sql)
+            sql_browser = CodeEditor("sql", read_only=True)
+            sql_browser.setPlainText(sql)
             sql_browser.setMinimumHeight(60)
             layout.addWidget(sql_browser)
             # 复制按钮
@@ -147,8 +183,11 @@ class SqlScriptWidget(QWidget):
     """SQL脚本录入与管理页面"""
     def __init__(self):
         super().__init__()
+        self.schema_workers = {}
+        self.export_worker = None
+        self.multi_worker = None
         self.init_ui()
-        self.load_sql_list()
+        QTimer.singleShot(0, self.load_sql_list)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -163,9 +202,15 @@ class SqlScriptWidget(QWidget):
         self.refresh_btn.clicked.connect(self.load_sql_list)
         self.add_btn.setIcon(QIcon.fromTheme("list-add"))
         self.refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
+        self.connection_btn = QPushButton("连接管理")
+        self.connection_btn.clicked.connect(self.manage_connections)
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.refresh_btn)
+        btn_layout.addWidget(self.connection_btn)
         btn_layout.addStretch()
+        # 环境选择（库名/SQL中的 {{变量}} 按当前环境替换）
+        self.env_selector = EnvSelector()
+        btn_layout.addWidget(self.env_selector)
         layout.addLayout(btn_layout)
 
         # 分割器（列表 + 结果区域）
@@ -197,10 +242,13 @@ class SqlScriptWidget(QWidget):
         result_btn_layout.addStretch()
         result_layout.addLayout(result_btn_layout)
 
-        # 结果显示文本框
-        self.result_browser = QTextBrowser()
-        self.result_browser.setReadOnly(True)
-        result_layout.addWidget(self.result_browser)
+        # 结果显示：文本 + 结果表格（多库执行时为合并后的结果，首列为来源库）
+        self.result_tabs = QTabWidget()
+        self.result_browser = CodeEditor(read_only=True)
+        self.result_grid = ResultGrid()
+        self.result_tabs.addTab(self.result_browser, "文本")
+        self.result_tabs.addTab(self.result_grid, "结果表格")
+        result_layout.addWidget(self.result_tabs)
         splitter.addWidget(result_widget)
         splitter.setSizes([300, 200])
 
@@ -209,15 +257,24 @@ class SqlScriptWidget(QWidget):
 
     def load_sql_list(self):
         """加载SQL脚本列表"""
+        with metrics.span("ui.load_sql_list.query"):
+            scripts = db_dao.get_all_sql_scripts()
+        with metrics.span("ui.load_sql_list.populate"):
+            self.fill_sql_table(scripts)
+
+    def fill_sql_table(self, scripts):
+        """填充SQL脚本表格"""
         self.sql_table.setRowCount(0)
-        scripts = db_dao.get_all_sql_scripts()
         for script in scripts:
             row = self.sql_table.rowCount()
             self.sql_table.insertRow(row)
             # 填充数据
             self.sql_table.setItem(row, 0, QTableWidgetItem(str(script["id"])))
             self.sql_table.setItem(row, 1, QTableWidgetItem(script["name"]))
-            self.sql_table.setItem(row, 2, QTableWidgetItem(script["db_name"]))
+            db_text = f"{script['db_name']}（多库：{script['target_dbs']}）" if script.get("target_dbs") else script["db_name"]
+            if script.get("connection_name"):
+                db_text = f"[{script['connection_name']}] {db_text}"
+            self.sql_table.setItem(row, 2, QTableWidgetItem(db_text))
             self.sql_table.setItem(row, 3, QTableWidgetItem(script.get("table_name", "")))
             self.sql_table.setItem(row, 4, QTableWidgetItem(script.get("description", "")))
             self.sql_table.setItem(row, 5, QTableWidgetItem(script["update_time"].strftime("%Y-%m-%d %H:%M:%S")))
@@ -227,19 +284,27 @@ class SqlScriptWidget(QWidget):
             edit_btn = QPushButton("编辑")
             delete_btn = QPushButton("删除")
             run_btn = QPushButton("执行")
+            explain_btn = QPushButton("分析")
+            export_btn = QPushButton("导出")
             view_btn.clicked.connect(lambda _, s=script: self.view_sql(s))
             edit_btn.clicked.connect(lambda _, s=script: self.edit_sql(s))
             delete_btn.clicked.connect(lambda _, s=script: self.delete_sql(s["id"]))
             run_btn.clicked.connect(lambda _, s=script: self.run_sql(s))
+            explain_btn.clicked.connect(lambda _, s=script: self.explain_sql(s))
+            export_btn.clicked.connect(lambda _, s=script: self.export_sql(s))
             # 按钮大小
             view_btn.setFixedSize(QSize(60, 25))
             edit_btn.setFixedSize(QSize(60, 25))
             delete_btn.setFixedSize(QSize(60, 25))
             run_btn.setFixedSize(QSize(60, 25))
+            explain_btn.setFixedSize(QSize(60, 25))
+            export_btn.setFixedSize(QSize(60, 25))
             btn_layout.addWidget(view_btn)
             btn_layout.addWidget(edit_btn)
             btn_layout.addWidget(delete_btn)
             btn_layout.addWidget(run_btn)
+            btn_layout.addWidget(explain_btn)
+            btn_layout.addWidget(export_btn)
             btn_widget = QWidget()
             btn_widget.setLayout(btn_layout)
             self.sql_table.setCellWidget(row, 6, btn_widget)
@@ -247,68 +312,201 @@ class SqlScriptWidget(QWidget):
         for col in range(6):
             self.sql_table.horizontalHeader().setSectionResizeMode(col, self.sql_table.horizontalHeader().sectionResizeMode.Interactive)
 
+    def ensure_schema(self, connection_id=None):
+        """某个连接的库表结构缓存过期时后台刷新（供编辑框自动补全）"""
+        worker = self.schema_workers.get(connection_id)
+        if get_schema_cache(connection_id).is_expired() and not (worker and worker.isRunning()):
+            self.schema_workers[connection_id] = load_schema_async(self, connection_id)
+
+    def open_sql_dialog(self, sql_data=None):
+        """打开SQL脚本编辑框（按所选连接加载补全数据）"""
+        dialog = SqlDialog(self, sql_data)
+        dialog.connection_changed.connect(self.ensure_schema)
+        self.ensure_schema(dialog.connection_combo.current_id())
+        return dialog
+
+    def manage_connections(self):
+        """打开连接管理"""
+        ConnectionManagerDialog(self).exec()
+        self.load_sql_list()
+
     def add_sql(self):
         """新建SQL脚本"""
-        dialog = SqlDialog(self)
+        dialog = self.open_sql_dialog()
         if dialog.exec():
             data = dialog.get_data()
             if db_dao.add_sql_script(data):
                 self.load_sql_list()
-                copy_to_clipboard("SQL脚本添加成功！")
+                show_info("提示", "SQL脚本添加成功！")
 
     def edit_sql(self, sql_data):
         """编辑SQL脚本"""
-        dialog = SqlDialog(self, sql_data)
+        dialog = self.open_sql_dialog(sql_data)
         if dialog.exec():
             data = dialog.get_data()
             if db_dao.update_sql_script(sql_data["id"], data):
                 self.load_sql_list()
-                copy_to_clipboard("SQL脚本更新成功！")
+                show_info("提示", "SQL脚本更新成功！")
 
     def delete_sql(self, script_id):
         """删除SQL脚本"""
-        if QMessageBox.question(self, "确认删除", "是否删除该SQL脚本？",
-                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
+        if show_confirm(self, "确认删除", "是否删除该SQL脚本？"):
             if db_dao.delete_sql_script(script_id):
                 self.load_sql_list()
-                copy_to_clipboard("SQL脚本删除成功！")
+                show_info("提示", "SQL脚本删除成功！")
 
     def view_sql(self, sql_data):
         """查看SQL脚本"""
         self.result_browser.clear()
-        self.result_browser.append(f"=== SQL脚本详情 ===")
-        self.result_browser.append(f"名称：{sql_data['name']}")
-        self.result_browser.append(f"描述：{sql_data.get('description', '无')}")
-        self.result_browser.append(f"目标库：{sql_data['db_name']}")
-        self.result_browser.append(f"目标表：{sql_data.get('table_name', '无')}")
-        self.result_browser.append(f"更新时间：{sql_data['update_time'].strftime('%Y-%m-%d %H:%M:%S')}")
-        self.result_browser.append("--- SQL内容 ---")
-        self.result_browser.append(sql_data["sql_content"])
+        self.result_browser.appendPlainText(f"=== SQL脚本详情 ===")
+        self.result_browser.appendPlainText(f"名称：{sql_data['name']}")
+        self.result_browser.appendPlainText(f"描述：{sql_data.get('description', '无')}")
+        self.result_browser.appendPlainText(f"连接：{sql_data.get('connection_name') or '默认连接'}")
+        self.result_browser.appendPlainText(f"目标库：{sql_data['db_name']}")
+        self.result_browser.appendPlainText(f"目标表：{sql_data.get('table_name', '无')}")
+        self.result_browser.appendPlainText(f"更新时间：{sql_data['update_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+        self.result_browser.appendPlainText("--- SQL内容 ---")
+        self.result_browser.appendPlainText(sql_data["sql_content"])
         self.copy_btn.setEnabled(True)
 
     def run_sql(self, sql_data):
-        """执行SQL脚本"""
+        """执行SQL脚本（设置了多库执行时在各目标库并行执行）"""
+        if sql_data.get("target_dbs"):
+            self.run_sql_multi(sql_data)
+            return
         self.result_browser.clear()
-        self.result_browser.append(f"=== 开始执行SQL脚本：{sql_data['name']} ===")
-        self.result_browser.append(f"目标库：{sql_data['db_name']}")
-        self.result_browser.append(f"SQL内容：{sql_data['sql_content']}")
-        self.result_browser.append("--- 执行结果 ---")
+        self.result_grid.clear()
+        self.result_tabs.setCurrentWidget(self.result_browser)
+        variables = self.env_selector.get_variables()
+        self.result_browser.appendPlainText(f"=== 开始执行SQL脚本：{sql_data['name']} ===")
+        self.result_browser.appendPlainText(f"环境：{self.env_selector.env_combo.currentText()}")
+        self.result_browser.appendPlainText(f"连接：{sql_data.get('connection_name') or '默认连接'}")
+        self.result_browser.appendPlainText(f"目标库：{sql_data['db_name']}")
+        self.result_browser.appendPlainText(f"SQL内容：{sql_data['sql_content']}")
+        self.result_browser.appendPlainText("--- 执行结果 ---")
 
         # 执行SQL
-        result = db_dao.execute_sql(sql_data["db_name"], sql_data["sql_content"])
+        result = db_dao.execute_sql(sql_data["db_name"], sql_data["sql_content"], variables,
+                                    sql_data.get("connection_id"))
         if result:
             if result["type"] == "query":
-                self.result_browser.append(f"查询成功，共 {len(result['data'])} 条数据：")
-                # 显示列名
-                self.result_browser.append("\t".join(result["columns"]))
-                # 显示数据
-                for row in result["data"]:
-                    self.result_browser.append("\t".join(str(val) for val in row.values()))
+                self.result_browser.appendPlainText(f"查询成功，共 {len(result['data'])} 条数据：")
+                with metrics.span("ui.run_sql.render"):
+                    # 列名 + 数据拼成一段文本一次性追加，避免逐行排版
+                    lines = ["\t".join(result["columns"])]
+                    lines.extend("\t".join(str(val) for val in row.values()) for row in result["data"])
+                    self.result_browser.appendPlainText("\n".join(lines))
+                self.result_grid.set_result(result["columns"], result["data"])
             else:
-                self.result_browser.append(f"执行成功，影响行数：{result['affected_rows']}")
-        self.result_browser.append("=== 执行结束 ===")
+                self.result_browser.appendPlainText(f"执行成功，影响行数：{result['affected_rows']}")
+            timing = result["timing"]
+            self.result_browser.appendPlainText(
+                f"耗时：连接 {timing.get('connect', 0)} ms / 执行 {timing.get('execute', 0)} ms / "
+                f"获取 {timing.get('fetch', 0)} ms")
+        self.result_browser.appendPlainText("=== 执行结束 ===")
         self.copy_btn.setEnabled(True)
 
+    def run_sql_multi(self, sql_data):
+        """后台在多个目标库并行执行，逐库显示结果，完成后显示合并结果"""
+        if self.multi_worker and self.multi_worker.isRunning():
+            show_error("提示", "已有多库执行任务正在进行，请稍候")
+            return
+        self.result_browser.clear()
+        self.result_grid.clear()
+        self.result_tabs.setCurrentWidget(self.result_browser)
+        self.result_browser.appendPlainText(f"=== 开始多库执行SQL脚本：{sql_data['name']} ===")
+        self.result_browser.appendPlainText(f"环境：{self.env_selector.env_combo.currentText()}")
+        self.result_browser.appendPlainText(f"连接：{sql_data.get('connection_name') or '默认连接'}")
+        self.result_browser.appendPlainText(f"目标库：{sql_data['target_dbs']}")
+        self.result_browser.appendPlainText(f"SQL内容：{sql_data['sql_content']}")
+        self.result_browser.appendPlainText("--- 各库执行结果 ---")
+        self.multi_worker = TaskWorker(db_dao.execute_sql_multi, sql_data["target_dbs"], sql_data["sql_content"],
+                                       self.env_selector.get_variables(), sql_data.get("connection_id"),
+                                       parent=self, progress_kwarg="on_result")
+        self.multi_worker.progress.connect(self.show_db_result)
+        self.multi_worker.succeeded.connect(self.show_multi_result)
+        self.multi_worker.failed.connect(lambda msg: self.result_browser.appendPlainText(f"执行失败：{msg}"))
+        self.multi_worker.start()
+
+    def show_db_result(self, result):
+        """单个库执行完成"""
+        if result["error"]:
+            self.result_browser.appendPlainText(f"[{result['db']}] 失败（{result['elapsed_ms']} ms）：{result['error']}")
+        elif result["type"] == "query":
+            self.result_browser.appendPlainText(
+                f"[{result['db']}] 查询 {len(result['data'])} 条（{result['elapsed_ms']} ms）")
+        else:
+            self.result_browser.appendPlainText(
+                f"[{result['db']}] 影响行数 {result['affected_rows']}（{result['elapsed_ms']} ms）")
+
+    def show_multi_result(self, result):
+        """全部库执行完成：汇总并显示合并结果"""
+        if not result:
+            self.result_browser.appendPlainText("=== 执行结束 ===")
+            return
+        results = result["results"]
+        failed = [r["db"] for r in results if r["error"]]
+        self.result_browser.appendPlainText(
+            f"=== 执行结束：共 {len(results)} 个库，成功 {len(results) - len(failed)}，失败 {len(failed)}，"
+            f"总耗时 {result['total_ms']} ms ===")
+        if failed:
+            self.result_browser.appendPlainText(f"失败的库：{', '.join(failed)}")
+        merged = result["merged"]
+        if merged:
+            self.result_grid.set_result(merged["columns"], merged["data"])
+            self.result_tabs.setCurrentWidget(self.result_grid)
+        self.copy_btn.setEnabled(True)
+
+    def explain_sql(self, sql_data):
+        """分析SQL脚本（执行计划 + 实际耗时）"""
+        dialog = ExplainDialog(self, sql_data, self.env_selector.get_variables())
+        dialog.exec()
+
+    def export_sql(self, sql_data):
+        """导出查询结果到文件（服务端游标逐批读取写入，后台执行，可取消）"""
+        if self.export_worker and self.export_worker.isRunning():
+            show_error("提示", "已有导出任务正在进行，请稍候")
+            return
+        statements = split_statements(sql_data["sql_content"])
+        if len(statements) != 1 or not is_query(statements[0]):
+            show_error("无法导出", "导出仅支持单条查询语句（SELECT 等）")
+            return
+        filters = [f"{EXPORT_FORMATS[fmt][0]} (*{EXPORT_FORMATS[fmt][1]})" for fmt in available_formats()]
+        path, _ = QFileDialog.getSaveFileName(self, "导出查询结果", f"{sql_data['name']}.csv", ";;".join(filters))
+        if not path:
+            return
+        fmt = format_for_path(path)
+        if fmt not in available_formats():
+            show_error("无法导出", f"不支持的文件类型，可用格式：{', '.join(available_formats())}")
+            return
+
+        # 总行数未知，进度框只显示已写入行数
+        stop_event = threading.Event()
+        self.export_progress = QProgressDialog("正在导出 ...", "取消", 0, 0, self)
+        self.export_progress.setWindowTitle(f"导出 - {sql_data['name']}")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.canceled.connect(stop_event.set)
+        batches = db_dao.iter_query(sql_data["db_name"], statements[0], self.env_selector.get_variables(),
+                                    sql_data.get("connection_id"))
+        self.export_worker = TaskWorker(export_batches, batches, path, fmt, parent=self,
+                                        progress_kwarg="on_progress", should_stop=stop_event.is_set)
+        self.export_worker.progress.connect(
+            lambda rows: self.export_progress.setLabelText(f"正在导出 ... 已写入 {rows} 行"))
+        self.export_worker.succeeded.connect(self.on_exported)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.start()
+
+    def on_exported(self, result):
+        self.export_progress.reset()
+        show_info("导出完成", f"共 {result['rows']} 行，耗时 {result['elapsed_ms']} ms\n{result['path']}")
+
+    def on_export_failed(self, message):
+        cancelled = self.export_progress.wasCanceled()
+        self.export_progress.reset()
+        if not cancelled:
+            show_error("导出失败", message)
+
     def copy_result(self):
         """复制结果"""
         copy_to_clipboard(self.result_browser.toPlainText())
@@ -316,10 +514,11 @@ class SqlScriptWidget(QWidget):
     def clear_result(self):
         """清空结果"""
         self.result_browser.clear()
+        self.result_grid.clear()
         self.copy_btn.setEnabled(False)
 
 class DbModule(QWidget):
-    """数据库模块主页面（包含2个子标签）"""
+    """数据库模块主页面（包含3个子标签）"""
     def __init__(self):
         super().__init__()
         self.init_ui()
@@ -333,8 +532,10 @@ class DbModule(QWidget):
         self.tab_widget = QTabWidget()
         self.example_tab = SqlExampleWidget()
         self.script_tab = SqlScriptWidget()
+        self.schema_tab = SchemaBrowserWidget()
         self.tab_widget.addTab(self.example_tab, "SQL书写示例")
         self.tab_widget.addTab(self.script_tab, "SQL录入与管理")
+        self.tab_widget.addTab(self.schema_tab, "库表结构")
         layout.addWidget(self.tab_widget)
 
         self.setLayout(layout)
\ No newline at end of file
@@ -0,0 +1,126 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QLabel, QFileDialog, QSplitter, QCheckBox)
+from PyQt6.QtCore import Qt, QTimer
+from utils.metrics_utils import metrics
+from utils.common_utils import show_info, show_error, show_confirm
+
+# 自动刷新间隔（毫秒）
+REFRESH_INTERVAL = 2000
+
+
+class DiagnosticsModule(QWidget):
+    """性能诊断页面：展示HTTP/SQL/DAO/列表加载的耗时直方图汇总，可导出JSON/Prometheus"""
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        self.setWindowTitle("性能诊断")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(20)
+
+        btn_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("刷新")
+        self.reset_btn = QPushButton("清空指标")
+        self.export_json_btn = QPushButton("导出JSON")
+        self.export_prom_btn = QPushButton("导出Prometheus")
+        self.auto_refresh_check = QCheckBox("自动刷新")
+        self.auto_refresh_check.setChecked(True)
+        self.refresh_btn.clicked.connect(self.refresh)
+        self.reset_btn.clicked.connect(self.reset)
+        self.export_json_btn.clicked.connect(lambda: self.export("json"))
+        self.export_prom_btn.clicked.connect(lambda: self.export("prometheus"))
+        self.auto_refresh_check.toggled.connect(self.update_timer)
+        for widget in (self.refresh_btn, self.reset_btn, self.export_json_btn, self.export_prom_btn):
+            btn_layout.addWidget(widget)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.auto_refresh_check)
+        layout.addLayout(btn_layout)
+
+        tip = QLabel("http.*：DNS/连接/首字节/下载；sql.*：连接/执行/获取；dao.*：数据访问方法；ui.*：查询/表格填充")
+        tip.setStyleSheet("color: #666;")
+        layout.addWidget(tip)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.metrics_table = QTableWidget()
+        self.metrics_table.setColumnCount(8)
+        self.metrics_table.setHorizontalHeaderLabels(
+            ["指标", "标签", "次数", "平均(ms)", "P50(ms)", "P95(ms)", "最大(ms)", "总计(ms)"])
+        self.metrics_table.horizontalHeader().setStretchLastSection(True)
+        self.metrics_table.setSortingEnabled(True)
+        splitter.addWidget(self.metrics_table)
+
+        self.recent_table = QTableWidget()
+        self.recent_table.setColumnCount(3)
+        self.recent_table.setHorizontalHeaderLabels(["最近记录", "标签", "耗时(ms)"])
+        self.recent_table.horizontalHeader().setStretchLastSection(True)
+        splitter.addWidget(self.recent_table)
+        splitter.setSizes([350, 200])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.update_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def update_timer(self):
+        """页面可见且勾选自动刷新时才定时刷新"""
+        if self.auto_refresh_check.isChecked() and self.isVisible():
+            self.timer.start(REFRESH_INTERVAL)
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        """刷新指标表"""
+        snapshot = metrics.snapshot()
+        self.metrics_table.setSortingEnabled(False)
+        self.metrics_table.setRowCount(len(snapshot))
+        for row, item in enumerate(snapshot):
+            labels = ", ".join(f"{k}={v}" for k, v in item["labels"].items())
+            values = [item["name"], labels, item["count"], item["avg_ms"], item["p50_ms"],
+                      item["p95_ms"], item["max_ms"], item["sum_ms"]]
+            for col, value in enumerate(values):
+                cell = QTableWidgetItem()
+                # 数值列按数值排序
+                cell.setData(Qt.ItemDataRole.DisplayRole, value if col >= 2 else str(value))
+                self.metrics_table.setItem(row, col, cell)
+        self.metrics_table.setSortingEnabled(True)
+
+        recent = list(metrics.recent)[-200:]
+        self.recent_table.setRowCount(len(recent))
+        for row, (_, name, labels, value) in enumerate(reversed(recent)):
+            self.recent_table.setItem(row, 0, QTableWidgetItem(name))
+            self.recent_table.setItem(row, 1, QTableWidgetItem(", ".join(f"{k}={v}" for k, v in labels.items())))
+            self.recent_table.setItem(row, 2, QTableWidgetItem(str(value)))
+
+    def reset(self):
+        """清空指标"""
+        if show_confirm(self, "确认清空", "是否清空所有性能指标？"):
+            metrics.reset()
+            self.refresh()
+
+    def export(self, fmt):
+        """导出指标到文件"""
+        if fmt == "json":
+            path, _ = QFileDialog.getSaveFileName(self, "导出JSON", "metrics.json", "JSON (*.json)")
+            content = metrics.to_json() if path else None
+        else:
+            path, _ = QFileDialog.getSaveFileName(self, "导出Prometheus", "metrics.prom", "Prometheus (*.prom *.txt)")
+            content = metrics.to_prometheus() if path else None
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            show_info("提示", f"已导出到：{path}")
+        except OSError as e:
+            show_error("导出失败", str(e))
@@ -0,0 +1,288 @@
+import threading
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+                             QFormLayout, QLineEdit, QComboBox, QCheckBox, QLabel, QTabWidget, QSplitter,
+                             QGroupBox, QProgressDialog)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+from db.dao import db_dao
+from utils.common_utils import show_error
+from utils.diff_utils import diff_api, diff_queries, ADDED, REMOVED, CHANGED
+from utils.json_utils import dumps
+from utils.sql_utils import split_statements, is_query
+from ui.code_editor import CodeEditor
+from ui.connection_module import ConnectionCombo
+from ui.env_module import EnvSelector
+from ui.workers import TaskWorker
+
+# 差异类型 -> (显示名称, 背景色)
+CHANGE_STYLES = {
+    ADDED: ("新增", QColor("#e6ffed")),
+    REMOVED: ("删除", QColor("#ffeef0")),
+    CHANGED: ("修改", QColor("#fff5d6")),
+}
+# 单元格中显示的值最大字符数
+CELL_TEXT_LIMIT = 500
+
+
+def _cell_text(value):
+    text = value if isinstance(value, str) else dumps(value)
+    return text if len(text) <= CELL_TEXT_LIMIT else text[:CELL_TEXT_LIMIT] + " ..."
+
+
+class QuerySide(QGroupBox):
+    """查询结果对比的一侧：连接 + 库名 + 查询语句（可从已保存的SQL脚本载入）"""
+    def __init__(self, title, parent=None):
+        super().__init__(title, parent)
+        layout = QFormLayout(self)
+        self.script_combo = QComboBox()
+        self.script_combo.activated.connect(self.load_script)
+        layout.addRow("载入脚本", self.script_combo)
+        self.connection_combo = ConnectionCombo()
+        layout.addRow("数据库连接", self.connection_combo)
+        self.db_name_edit = QLineEdit()
+        self.db_name_edit.setPlaceholderText("例如：test_db")
+        layout.addRow("目标库名*", self.db_name_edit)
+        self.sql_edit = CodeEditor("sql")
+        self.sql_edit.setPlaceholderText("单条查询语句，例如 SELECT * FROM user_info")
+        layout.addRow("查询语句*", self.sql_edit)
+
+    def load_scripts(self, scripts):
+        self.scripts = scripts
+        self.script_combo.clear()
+        self.script_combo.addItem("（手动填写）")
+        self.script_combo.addItems([script["name"] for script in scripts])
+
+    def load_script(self, index):
+        if index <= 0:
+            return
+        script = self.scripts[index - 1]
+        self.connection_combo.load_connections(script.get("connection_id"))
+        self.db_name_edit.setText(script["db_name"])
+        self.sql_edit.setPlainText(script["sql_content"])
+
+    def get_query(self):
+        """{db_name, sql, connection_id}；未填写或不是单条查询时返回错误提示"""
+        db_name = self.db_name_edit.text().strip()
+        statements = split_statements(self.sql_edit.toPlainText())
+        if not db_name or not statements:
+            return None, f"{self.title()}：请填写目标库名和查询语句"
+        if len(statements) != 1 or not is_query(statements[0]):
+            return None, f"{self.title()}：只支持单条查询语句（SELECT 等）"
+        return {"db_name": db_name, "sql": statements[0], "connection_id": self.connection_combo.current_id()}, ""
+
+
+class DiffModule(QWidget):
+    """
+    数据对比页面：同一接口在两个环境下的响应对比、两个查询的结果集对比
+    只列出有差异的字段/行，大结果集流式读取并按主键分区对比
+    """
+    def __init__(self):
+        super().__init__()
+        self.apis = []
+        self.worker = None
+        self.init_ui()
+        QTimer.singleShot(0, self.load_data)
+
+    def init_ui(self):
+        self.setWindowTitle("数据对比")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        self.tab_widget = QTabWidget()
+
+        # 接口响应对比
+        api_tab = QWidget()
+        api_layout = QFormLayout(api_tab)
+        self.api_combo = QComboBox()
+        self.api_combo.setMinimumWidth(300)
+        api_layout.addRow("接口", self.api_combo)
+        self.left_env = EnvSelector()
+        self.right_env = EnvSelector()
+        api_layout.addRow("左侧环境", self.left_env)
+        api_layout.addRow("右侧环境", self.right_env)
+        self.ignore_edit = QLineEdit()
+        self.ignore_edit.setPlaceholderText("可选，多个用逗号分隔，* 匹配任意字符，如 $.timestamp, $.data[*].update_time")
+        api_layout.addRow("忽略字段", self.ignore_edit)
+        self.array_key_edit = QLineEdit()
+        self.array_key_edit.setPlaceholderText("可选，对象数组按该字段对齐（如 id），不填按下标对齐")
+        api_layout.addRow("数组对齐字段", self.array_key_edit)
+        self.headers_check = QCheckBox("对比响应头（忽略 Date 等每次变化的头）")
+        self.headers_check.setChecked(True)
+        api_layout.addRow("", self.headers_check)
+        self.api_diff_btn = QPushButton("对比")
+        self.api_diff_btn.clicked.connect(self.run_api_diff)
+        api_layout.addRow("", self.api_diff_btn)
+        self.tab_widget.addTab(api_tab, "接口响应对比")
+
+        # 查询结果对比
+        sql_tab = QWidget()
+        sql_layout = QVBoxLayout(sql_tab)
+        sides_layout = QHBoxLayout()
+        self.left_query = QuerySide("左侧（旧）")
+        self.right_query = QuerySide("右侧（新）")
+        sides_layout.addWidget(self.left_query)
+        sides_layout.addWidget(self.right_query)
+        sql_layout.addLayout(sides_layout)
+        option_layout = QHBoxLayout()
+        self.sql_env = EnvSelector()
+        option_layout.addWidget(self.sql_env)
+        option_layout.addWidget(QLabel("主键列："))
+        self.key_columns_edit = QLineEdit()
+        self.key_columns_edit.setPlaceholderText("多个用逗号分隔，如 id 或 tenant_id, id；不填时整行比较，只统计新增/删除")
+        option_layout.addWidget(self.key_columns_edit, 1)
+        self.sql_diff_btn = QPushButton("对比")
+        self.sql_diff_btn.clicked.connect(self.run_sql_diff)
+        option_layout.addWidget(self.sql_diff_btn)
+        sql_layout.addLayout(option_layout)
+        self.tab_widget.addTab(sql_tab, "查询结果对比")
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.tab_widget)
+
+        # 对比结果（只列出有差异的字段/行）
+        result_widget = QWidget()
+        result_layout = QVBoxLayout(result_widget)
+        result_layout.setContentsMargins(0, 0, 0, 0)
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        result_layout.addWidget(self.summary_label)
+        self.diff_table = QTableWidget()
+        self.diff_table.setColumnCount(4)
+        self.diff_table.setHorizontalHeaderLabels(["位置", "差异", "左侧", "右侧"])
+        self.diff_table.horizontalHeader().setStretchLastSection(True)
+        result_layout.addWidget(self.diff_table)
+        splitter.addWidget(result_widget)
+        splitter.setSizes([320, 400])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def load_data(self):
+        """加载接口列表与SQL脚本列表"""
+        self.apis = db_dao.get_all_apis()
+        self.api_combo.clear()
+        for api in self.apis:
+            self.api_combo.addItem(f"{api['name']}（{api['method']} {api['url']}）")
+        scripts = db_dao.get_all_sql_scripts()
+        self.left_query.load_scripts(scripts)
+        self.right_query.load_scripts(scripts)
+
+    def set_busy(self, busy):
+        self.api_diff_btn.setEnabled(not busy)
+        self.sql_diff_btn.setEnabled(not busy)
+
+    # ------------------------------ 接口响应对比 ------------------------------
+    def run_api_diff(self):
+        index = self.api_combo.currentIndex()
+        if index < 0:
+            show_error("提示", "请先选择接口")
+            return
+        ignore_paths = [p for p in self.ignore_edit.text().split(",") if p.strip()]
+        self.set_busy(True)
+        self.summary_label.setText("正在请求 ...")
+        self.worker = TaskWorker(diff_api, self.apis[index], self.left_env.get_variables(),
+                                 self.right_env.get_variables(), ignore_paths,
+                                 self.array_key_edit.text().strip() or None, self.headers_check.isChecked(),
+                                 parent=self)
+        self.worker.succeeded.connect(self.show_api_diff)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.finished.connect(lambda: self.set_busy(False))
+        self.worker.start()
+
+    def show_api_diff(self, result):
+        left, right = result["left"], result["right"]
+        summary = (f"左侧：HTTP {left['status_code']}，{left['elapsed_ms']} ms，{left['size']} 字符；"
+                   f"右侧：HTTP {right['status_code']}，{right['elapsed_ms']} ms，{right['size']} 字符\n"
+                   + self.counts_text(result))
+        if result["body_format"] == "text":
+            summary += "（响应体不是JSON，按行对比）"
+        self.summary_label.setText(summary)
+        self.fill_table([(c["path"], c["type"], c["old"], c["new"]) for c in result["changes"]])
+
+    # ------------------------------ 查询结果对比 ------------------------------
+    def run_sql_diff(self):
+        left, error = self.left_query.get_query()
+        right, right_error = self.right_query.get_query()
+        if error or right_error:
+            show_error("提示", error or right_error)
+            return
+        key_columns = [c.strip() for c in self.key_columns_edit.text().split(",") if c.strip()]
+
+        # 总行数未知，进度框只显示已读取行数
+        stop_event = threading.Event()
+        self.progress_dialog = QProgressDialog("正在读取 ...", "取消", 0, 0, self)
+        self.progress_dialog.setWindowTitle("查询结果对比")
+        self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.canceled.connect(stop_event.set)
+        self.set_busy(True)
+        self.worker = TaskWorker(diff_queries, left, right, key_columns, self.sql_env.get_variables(),
+                                 parent=self, progress_kwarg="on_progress", should_stop=stop_event.is_set)
+        self.worker.progress.connect(
+            lambda rows: self.progress_dialog.setLabelText(f"正在读取 ... 已读取 {rows} 行"))
+        self.worker.succeeded.connect(self.show_sql_diff)
+        self.worker.failed.connect(self.on_sql_failed)
+        self.worker.finished.connect(lambda: self.set_busy(False))
+        self.worker.start()
+
+    def show_sql_diff(self, result):
+        self.progress_dialog.reset()
+        summary = (f"左侧 {result['left_rows']} 行，右侧 {result['right_rows']} 行，相同 {result['unchanged']} 行；"
+                   + self.counts_text(result) + f"；耗时 {result['elapsed_ms']} ms")
+        notes = []
+        if result["left_only_columns"] or result["right_only_columns"]:
+            notes.append(f"未对比的列：左侧独有 {result['left_only_columns']}，右侧独有 {result['right_only_columns']}")
+        if any(result["duplicate_keys"]):
+            notes.append(f"主键重复：左侧 {result['duplicate_keys'][0]} 行，右侧 {result['duplicate_keys'][1]} 行")
+        self.summary_label.setText("\n".join([summary] + notes))
+
+        # 修改的行每个变化的列一行；新增/删除的行整行显示
+        rows = []
+        for change in result["changes"]:
+            key = ", ".join(f"{column}={_cell_text(value)}" for column, value in change["key"].items())
+            if change["type"] == CHANGED:
+                for column, (old, new) in change["columns"].items():
+                    rows.append((f"{key} · {column}", CHANGED, old, new))
+            elif change["type"] == ADDED:
+                rows.append((key or "整行", ADDED, None, change["row"]))
+            else:
+                rows.append((key or "整行", REMOVED, change["row"], None))
+        self.fill_table(rows)
+
+    def on_sql_failed(self, message):
+        cancelled = self.progress_dialog.wasCanceled()
+        self.progress_dialog.reset()
+        if cancelled:
+            self.summary_label.setText("对比已取消")
+        else:
+            self.on_failed(message)
+
+    # ------------------------------ 结果展示 ------------------------------
+    def on_failed(self, message):
+        self.summary_label.setText("")
+        show_error("对比失败", message)
+
+    @staticmethod
+    def counts_text(result):
+        counts = result["counts"]
+        if not result["total"]:
+            return "没有差异"
+        text = f"差异 {result['total']} 处（新增 {counts[ADDED]}，删除 {counts[REMOVED]}，修改 {counts[CHANGED]}）"
+        if result["truncated"]:
+            text += f"，只列出前 {len(result['changes'])} 处"
+        return text
+
+    def fill_table(self, rows):
+        """rows：(位置, 差异类型, 左侧值, 右侧值)，按差异类型着色"""
+        self.diff_table.setRowCount(len(rows))
+        for row, (location, change_type, old, new) in enumerate(rows):
+            label, color = CHANGE_STYLES[change_type]
+            items = [QTableWidgetItem(location), QTableWidgetItem(label),
+                     QTableWidgetItem("" if change_type == ADDED else _cell_text(old)),
+                     QTableWidgetItem("" if change_type == REMOVED else _cell_text(new))]
+            for column, item in enumerate(items):
+                item.setBackground(color)
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.diff_table.setItem(row, column, item)
+        self.diff_table.resizeColumnToContents(0)
@@ -0,0 +1,197 @@
+import json
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QTextEdit,
+                             QComboBox, QLabel)
+from PyQt6.QtCore import QSize, QTimer, pyqtSignal
+from db.dao import db_dao
+from utils.common_utils import format_json, show_confirm, show_dialog_error, validate_required_fields
+
+
+class EnvDialog(QDialog):
+    """环境新建/编辑对话框"""
+    def __init__(self, parent=None, env_data=None):
+        super().__init__(parent)
+        self.env_data = env_data
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("编辑环境" if self.env_data else "新建环境")
+        self.setMinimumSize(500, 400)
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        form_layout.setSpacing(15)
+        form_layout.setContentsMargins(20, 20, 20, 20)
+
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("例如：dev / test / prod")
+        form_layout.addRow("环境名称*", self.name_edit)
+
+        self.desc_edit = QLineEdit()
+        self.desc_edit.setPlaceholderText("请输入环境描述（可选）")
+        form_layout.addRow("描述", self.desc_edit)
+
+        # 环境变量（JSON对象），在URL/参数/请求头/SQL中以 {{变量名}} 引用
+        self.variables_edit = QTextEdit()
+        self.variables_edit.setPlaceholderText('{"host": "https://dev.example.com", "db": "test_db"}')
+        self.variables_edit.setMinimumHeight(150)
+        form_layout.addRow("环境变量*", self.variables_edit)
+
+        layout.addLayout(form_layout)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setContentsMargins(20, 0, 20, 20)
+        self.save_btn = QPushButton("保存")
+        self.cancel_btn = QPushButton("取消")
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+        if self.env_data:
+            self.name_edit.setText(self.env_data["name"])
+            self.desc_edit.setText(self.env_data.get("description") or "")
+            self.variables_edit.setText(format_json(self.env_data.get("variables") or "{}"))
+
+    def get_data(self):
+        """获取表单数据"""
+        return {
+            "name": self.name_edit.text().strip(),
+            "description": self.desc_edit.text().strip(),
+            "variables": self.variables_edit.toPlainText().strip() or "{}"
+        }
+
+    def accept(self):
+        """保存前验证（环境变量必须是JSON对象）"""
+        data = self.get_data()
+        if not validate_required_fields({"环境名称": data["name"]}, parent=self):
+            return
+        try:
+            if not isinstance(json.loads(data["variables"]), dict):
+                raise ValueError("必须是JSON对象")
+        except ValueError as e:
+            show_dialog_error(self, "验证失败", f"环境变量格式错误：{str(e)}")
+            return
+        super().accept()
+
+
+class EnvManagerDialog(QDialog):
+    """环境管理对话框（列表 + 增删改）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+        self.load_env_list()
+
+    def init_ui(self):
+        self.setWindowTitle("环境管理")
+        self.setMinimumSize(700, 400)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        btn_layout = QHBoxLayout()
+        self.add_btn = QPushButton("新建环境")
+        self.add_btn.clicked.connect(self.add_env)
+        btn_layout.addWidget(self.add_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        self.env_table = QTableWidget()
+        self.env_table.setColumnCount(4)
+        self.env_table.setHorizontalHeaderLabels(["ID", "环境名称", "描述", "操作"])
+        self.env_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.env_table)
+
+        self.setLayout(layout)
+
+    def load_env_list(self):
+        """加载环境列表"""
+        self.env_table.setRowCount(0)
+        for env in db_dao.get_all_envs():
+            row = self.env_table.rowCount()
+            self.env_table.insertRow(row)
+            self.env_table.setItem(row, 0, QTableWidgetItem(str(env["id"])))
+            self.env_table.setItem(row, 1, QTableWidgetItem(env["name"]))
+            self.env_table.setItem(row, 2, QTableWidgetItem(env.get("description") or ""))
+            btn_layout = QHBoxLayout()
+            edit_btn = QPushButton("编辑")
+            delete_btn = QPushButton("删除")
+            edit_btn.clicked.connect(lambda _, e=env: self.edit_env(e))
+            delete_btn.clicked.connect(lambda _, e=env: self.delete_env(e["id"]))
+            edit_btn.setFixedSize(QSize(60, 25))
+            delete_btn.setFixedSize(QSize(60, 25))
+            btn_layout.addWidget(edit_btn)
+            btn_layout.addWidget(delete_btn)
+            btn_widget = QWidget()
+            btn_widget.setLayout(btn_layout)
+            self.env_table.setCellWidget(row, 3, btn_widget)
+
+    def add_env(self):
+        """新建环境"""
+        dialog = EnvDialog(self)
+        if dialog.exec() and db_dao.add_env(dialog.get_data()):
+            self.load_env_list()
+
+    def edit_env(self, env_data):
+        """编辑环境"""
+        dialog = EnvDialog(self, env_data)
+        if dialog.exec() and db_dao.update_env(env_data["id"], dialog.get_data()):
+            self.load_env_list()
+
+    def delete_env(self, env_id):
+        """删除环境"""
+        if show_confirm(self, "确认删除", "是否删除该环境？"):
+            if db_dao.delete_env(env_id):
+                self.load_env_list()
+
+
+class EnvSelector(QWidget):
+    """环境选择器（下拉框 + 管理按钮），供接口模块和SQL模块共用"""
+    env_changed = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.env_variables = {}  # {环境名: 已解析的变量字典}，只在加载时解析一次
+        self.init_ui()
+        QTimer.singleShot(0, self.load_envs)
+
+    def init_ui(self):
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("当前环境："))
+        self.env_combo = QComboBox()
+        self.env_combo.setMinimumWidth(150)
+        self.env_combo.currentTextChanged.connect(lambda _: self.env_changed.emit(self.get_variables()))
+        layout.addWidget(self.env_combo)
+        self.manage_btn = QPushButton("环境管理")
+        self.manage_btn.clicked.connect(self.manage_envs)
+        layout.addWidget(self.manage_btn)
+
+    def load_envs(self):
+        """加载环境列表（保留当前选中项）"""
+        current = self.env_combo.currentText()
+        self.env_variables = {}
+        for env in db_dao.get_all_envs():
+            try:
+                variables = json.loads(env.get("variables") or "{}")
+            except ValueError:
+                variables = {}
+            self.env_variables[env["name"]] = variables if isinstance(variables, dict) else {}
+        self.env_combo.blockSignals(True)
+        self.env_combo.clear()
+        self.env_combo.addItem("无")
+        self.env_combo.addItems(list(self.env_variables))
+        self.env_combo.setCurrentText(current if current in self.env_variables else "无")
+        self.env_combo.blockSignals(False)
+
+    def manage_envs(self):
+        """打开环境管理"""
+        EnvManagerDialog(self).exec()
+        self.load_envs()
+
+    def get_variables(self):
+        """当前环境的变量字典（未选择环境时为空）"""
+        return self.env_variables.get(self.env_combo.currentText(), {})
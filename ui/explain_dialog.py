@@ -0,0 +1,166 @@
+from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+                             QDialog, QSplitter, QLabel, QTreeWidget, QTreeWidgetItem, QListWidget,
+                             QCheckBox, QTextBrowser, QTabWidget)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from db.dao import db_dao
+from utils.common_utils import copy_to_clipboard
+from utils.json_utils import dumps
+from ui.workers import TaskWorker
+
+WARNING_COLOR = "#e53e3e"
+
+
+class ExplainDialog(QDialog):
+    """SQL分析：逐条语句展示执行计划树（标红全表扫描/缺失索引等），只读查询显示实际耗时与 SHOW PROFILE"""
+    def __init__(self, parent=None, sql_data=None, variables=None):
+        super().__init__(parent)
+        self.sql_data = sql_data
+        self.variables = variables or {}
+        self.result = None
+        self.worker = None
+        self.init_ui()
+        self.run_explain()
+
+    def init_ui(self):
+        self.setWindowTitle(f"SQL分析 - {self.sql_data['name']}")
+        self.setMinimumSize(950, 650)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        btn_layout = QHBoxLayout()
+        self.profile_check = QCheckBox("采集 SHOW PROFILE")
+        self.rerun_btn = QPushButton("重新分析")
+        self.copy_btn = QPushButton("复制执行计划")
+        self.rerun_btn.clicked.connect(self.run_explain)
+        self.copy_btn.clicked.connect(self.copy_plan)
+        self.copy_btn.setEnabled(False)
+        btn_layout.addWidget(self.profile_check)
+        btn_layout.addWidget(self.rerun_btn)
+        btn_layout.addWidget(self.copy_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        # 左侧语句列表，右侧该语句的执行计划/耗时
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.statement_list = QListWidget()
+        self.statement_list.currentRowChanged.connect(self.show_statement)
+        splitter.addWidget(self.statement_list)
+
+        self.detail_tabs = QTabWidget()
+        self.plan_tree = QTreeWidget()
+        self.plan_tree.setColumnCount(2)
+        self.plan_tree.setHeaderLabels(["节点", "信息"])
+        self.plan_tree.setColumnWidth(0, 260)
+        self.detail_tabs.addTab(self.plan_tree, "执行计划")
+        self.warning_browser = QTextBrowser()
+        self.detail_tabs.addTab(self.warning_browser, "问题汇总")
+        self.profile_table = QTableWidget()
+        self.profile_table.setColumnCount(2)
+        self.profile_table.setHorizontalHeaderLabels(["阶段", "耗时(ms)"])
+        self.profile_table.horizontalHeader().setStretchLastSection(True)
+        self.detail_tabs.addTab(self.profile_table, "PROFILE")
+        splitter.addWidget(self.detail_tabs)
+        splitter.setSizes([300, 650])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def run_explain(self):
+        """后台执行分析"""
+        if self.worker and self.worker.isRunning():
+            return
+        self.statement_list.clear()
+        self.plan_tree.clear()
+        self.warning_browser.clear()
+        self.profile_table.setRowCount(0)
+        self.rerun_btn.setEnabled(False)
+        self.summary_label.setText("正在分析 ...")
+        self.worker = TaskWorker(db_dao.explain_sql, self.sql_data["db_name"], self.sql_data["sql_content"],
+                                 self.variables, parent=self, profile=self.profile_check.isChecked(),
+                                 connection_id=self.sql_data.get("connection_id"))
+        self.worker.succeeded.connect(self.show_result)
+        self.worker.failed.connect(lambda msg: self.summary_label.setText(f"分析失败：{msg}"))
+        self.worker.finished.connect(lambda: self.rerun_btn.setEnabled(True))
+        self.worker.start()
+
+    def show_result(self, result):
+        """显示分析汇总与语句列表"""
+        self.result = result
+        if not result:
+            self.summary_label.setText("分析失败")
+            return
+        statements = result["statements"]
+        warning_count = sum(len(s["summary"]["warnings"]) for s in statements if s["summary"])
+        error_count = sum(1 for s in statements if s["error"])
+        self.summary_label.setText(
+            f"共 {len(statements)} 条语句，问题 {warning_count} 处，出错 {error_count} 条，"
+            f"连接 {result['timing'].get('connect', 0)} ms / 分析 {result['timing'].get('explain', 0)} ms")
+        for index, statement in enumerate(statements):
+            sql = " ".join(statement["sql"].split())
+            text = f"{index + 1}. [{statement['type']}] {sql[:60]}"
+            if statement["elapsed_ms"] is not None:
+                text += f"（{statement['elapsed_ms']} ms）"
+            self.statement_list.addItem(text)
+            has_problem = statement["error"] or (statement["summary"] and statement["summary"]["warnings"])
+            if has_problem:
+                self.statement_list.item(index).setForeground(QColor(WARNING_COLOR))
+        self.copy_btn.setEnabled(bool(statements))
+        if statements:
+            self.statement_list.setCurrentRow(0)
+
+    def show_statement(self, index):
+        """显示某条语句的执行计划、问题与 PROFILE"""
+        self.plan_tree.clear()
+        self.warning_browser.clear()
+        self.profile_table.setRowCount(0)
+        if not self.result or index < 0:
+            return
+        statement = self.result["statements"][index]
+        self.warning_browser.append(statement["sql"])
+        self.warning_browser.append("")
+        if statement["error"]:
+            self.warning_browser.append(f"错误：{statement['error']}")
+        if statement["elapsed_ms"] is not None:
+            self.warning_browser.append(f"实际执行耗时：{statement['elapsed_ms']} ms，返回 {statement['rows']} 行")
+        elif not statement["error"]:
+            self.warning_browser.append("非只读语句，仅分析执行计划，未实际执行")
+        summary = statement["summary"]
+        if summary:
+            self.warning_browser.append(f"查询成本：{summary['query_cost']}")
+            for table in summary["tables"]:
+                self.warning_browser.append(
+                    f"表 {table['table']}：访问方式 {table['access_type']}，索引 {table['key'] or '无'}，"
+                    f"预估扫描 {table['rows']} 行")
+            for warning in summary["warnings"]:
+                self.warning_browser.append(f"⚠ {warning}")
+        if statement["plan"]:
+            root = self.add_plan_node(self.plan_tree, statement["plan"])
+            self.plan_tree.expandAll()
+            self.plan_tree.scrollToItem(root)
+        self.profile_table.setRowCount(len(statement["profile"]))
+        for row, stage in enumerate(statement["profile"]):
+            self.profile_table.setItem(row, 0, QTableWidgetItem(stage["status"]))
+            self.profile_table.setItem(row, 1, QTableWidgetItem(str(stage["ms"])))
+        self.detail_tabs.setCurrentIndex(0 if statement["plan"] else 1)
+
+    def add_plan_node(self, parent, node):
+        """递归添加计划节点（有问题的节点标红）"""
+        item = QTreeWidgetItem(parent, [node["label"], "；".join(node["warnings"])])
+        if node["warnings"]:
+            for col in range(2):
+                item.setForeground(col, QColor(WARNING_COLOR))
+        for key, value in node["details"].items():
+            QTreeWidgetItem(item, [key, str(value)])
+        for child in node["children"]:
+            self.add_plan_node(item, child)
+        return item
+
+    def copy_plan(self):
+        """复制全部分析结果（JSON）"""
+        if self.result:
+            copy_to_clipboard(dumps(self.result, pretty=True))
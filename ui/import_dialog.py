@@ -0,0 +1,98 @@
+from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QDialog, QLineEdit, QTextEdit, QLabel,
+                             QCheckBox, QFileDialog)
+from utils.common_utils import show_info, show_dialog_error
+from utils.import_utils import import_apis
+from ui.workers import TaskWorker
+
+
+class ApiImportDialog(QDialog):
+    """批量导入接口：HAR文件（浏览器开发者工具导出）或 cURL 命令（文件或直接粘贴）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.result = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("导入接口")
+        self.setMinimumSize(700, 500)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        file_layout = QHBoxLayout()
+        self.path_edit = QLineEdit()
+        self.path_edit.setPlaceholderText("HAR文件（.har）或 cURL 命令文本文件")
+        self.browse_btn = QPushButton("选择文件")
+        self.browse_btn.clicked.connect(self.choose_file)
+        file_layout.addWidget(self.path_edit)
+        file_layout.addWidget(self.browse_btn)
+        layout.addLayout(file_layout)
+
+        layout.addWidget(QLabel("或粘贴 cURL 命令（可多条，浏览器「复制为cURL」的 bash/cmd 格式均可）："))
+        self.curl_edit = QTextEdit()
+        self.curl_edit.setAcceptRichText(False)
+        self.curl_edit.setPlaceholderText("curl 'https://api.example.com/v1/users?page=1' -H 'Authorization: Bearer xxx'")
+        layout.addWidget(self.curl_edit)
+
+        self.api_only_check = QCheckBox("HAR只导入接口请求（跳过图片、脚本、样式等静态资源）")
+        self.api_only_check.setChecked(True)
+        layout.addWidget(self.api_only_check)
+
+        self.status_label = QLabel("方法、URL、参数都相同的请求只导入一次；名称已存在的接口跳过")
+        self.status_label.setStyleSheet("color: #666;")
+        layout.addWidget(self.status_label)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.import_btn = QPushButton("导入")
+        self.close_btn = QPushButton("关闭")
+        self.import_btn.clicked.connect(self.start_import)
+        self.close_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.import_btn)
+        btn_layout.addWidget(self.close_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "选择导入文件", "",
+                                              "HAR / cURL (*.har *.txt *.sh *.bat);;所有文件 (*)")
+        if path:
+            self.path_edit.setText(path)
+
+    def start_import(self):
+        """后台解析并写入（数千条时避免界面卡住）"""
+        if self.worker and self.worker.isRunning():
+            return
+        path = self.path_edit.text().strip()
+        text = self.curl_edit.toPlainText().strip()
+        if not path and not text:
+            show_dialog_error(self, "提示", "请选择文件或粘贴 cURL 命令")
+            return
+        self.import_btn.setEnabled(False)
+        self.status_label.setText("正在导入 ...")
+        self.worker = TaskWorker(import_apis, path=path or None, text=text, parent=self,
+                                 api_only=self.api_only_check.isChecked(), progress_kwarg="on_progress")
+        self.worker.progress.connect(lambda count: self.status_label.setText(f"已解析 {count} 条 ..."))
+        self.worker.succeeded.connect(self.on_imported)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def on_imported(self, result):
+        self.result = result
+        self.import_btn.setEnabled(True)
+        summary = (f"解析 {result['parsed']} 条（无法识别 {result['invalid']} 条），重复 {result['duplicates']} 条，"
+                   f"新增 {result['inserted']} 个接口，已存在跳过 {result['skipped']} 个，耗时 {result['elapsed_ms']} ms")
+        self.status_label.setText(summary)
+        show_info("导入完成", summary)
+        if result["inserted"]:
+            self.accept()
+
+    def on_failed(self, msg):
+        self.import_btn.setEnabled(True)
+        self.status_label.setText(f"导入失败：{msg}")
+
+    def done(self, result):
+        # 导入未结束时等待线程退出，避免对话框销毁时线程仍在运行
+        if self.worker and self.worker.isRunning():
+            self.worker.wait()
+        super().done(result)
@@ -0,0 +1,276 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit,
+                             QTreeView, QLabel, QHeaderView)
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt6.QtGui import QColor
+from utils.json_utils import JsonBody
+
+# 每次展开/滚动时最多物化的子节点数（大数组分批加载）
+FETCH_CHUNK = 500
+# 值列预览的最大长度
+PREVIEW_LIMIT = 200
+
+TYPE_COLORS = {
+    "string": "#2f855a",
+    "number": "#2b6cb0",
+    "boolean": "#b7791f",
+    "null": "#a0aec0"
+}
+
+
+def _type_name(value):
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+class JsonNode:
+    """树节点：子节点在展开时才创建"""
+    __slots__ = ("parent", "key", "value", "row", "children", "keys")
+
+    def __init__(self, parent, key, value, row):
+        self.parent = parent
+        self.key = key
+        self.value = value
+        self.row = row
+        self.children = []
+        self.keys = None  # 对象的键列表，第一次展开时生成
+
+    @property
+    def is_container(self):
+        return isinstance(self.value, (dict, list))
+
+    @property
+    def total(self):
+        return len(self.value) if self.is_container else 0
+
+    def can_fetch_more(self):
+        return self.is_container and len(self.children) < self.total
+
+    def fetch(self, count):
+        """物化接下来的 count 个子节点，返回新建的节点数"""
+        start = len(self.children)
+        end = min(start + count, self.total)
+        if isinstance(self.value, dict):
+            if self.keys is None:
+                self.keys = list(self.value)
+            for row in range(start, end):
+                key = self.keys[row]
+                self.children.append(JsonNode(self, key, self.value[key], row))
+        else:
+            for row in range(start, end):
+                self.children.append(JsonNode(self, row, self.value[row], row))
+        return end - start
+
+
+class JsonTreeModel(QAbstractItemModel):
+    """惰性JSON树模型（键 / 值 / 类型 三列）"""
+    HEADERS = ["键", "值", "类型"]
+
+    def __init__(self, data=None, parent=None):
+        super().__init__(parent)
+        self.root = JsonNode(None, "$", data, 0)
+
+    def set_data(self, data):
+        self.beginResetModel()
+        self.root = JsonNode(None, "$", data, 0)
+        self.endResetModel()
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    # ---------- QAbstractItemModel 接口 ----------
+    def index(self, row, column, parent=QModelIndex()):
+        parent_node = self.node(parent)
+        if row < 0 or row >= len(parent_node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.node(parent).total > 0
+
+    def canFetchMore(self, parent):
+        return self.node(parent).can_fetch_more()
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        start = len(node.children)
+        count = min(FETCH_CHUNK, node.total - start)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, start, start + count - 1)
+        node.fetch(count)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return f"[{node.key}]" if isinstance(node.parent.value, list) else str(node.key)
+            if column == 1:
+                return self._preview(node.value)
+            return _type_name(node.value)
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            color = TYPE_COLORS.get(_type_name(node.value))
+            return QColor(color) if color else None
+        if role == Qt.ItemDataRole.ToolTipRole and column == 1 and isinstance(node.value, str):
+            return node.value[:PREVIEW_LIMIT * 10]
+        return None
+
+    @staticmethod
+    def _preview(value):
+        if isinstance(value, dict):
+            return f"{{{len(value)}}}"
+        if isinstance(value, list):
+            return f"[{len(value)}]"
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        text = str(value)
+        return text if len(text) <= PREVIEW_LIMIT else text[:PREVIEW_LIMIT] + "…"
+
+    # ---------- 搜索支持 ----------
+    def index_for_path(self, path):
+        """按路径定位节点，沿途只物化需要的分批子节点"""
+        parent = QModelIndex()
+        node = self.root
+        for key in path:
+            row = key if isinstance(node.value, list) else self._key_row(node, key)
+            while len(node.children) <= row and node.can_fetch_more():
+                self.fetchMore(parent)
+            parent = self.index(row, 0, parent)
+            node = node.children[row]
+        return parent
+
+    @staticmethod
+    def _key_row(node, key):
+        if node.keys is None:
+            node.keys = list(node.value)
+        return node.keys.index(key)
+
+
+def iter_matches(data, text):
+    """深度优先遍历，逐个产出键或标量值包含 text（不区分大小写）的节点路径"""
+    text = text.lower()
+    stack = [((), data)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            items = list(value.items())
+            for key, child in reversed(items):
+                stack.append((path + (key,), child))
+        elif isinstance(value, list):
+            for i in range(len(value) - 1, -1, -1):
+                stack.append((path + (i,), value[i]))
+        if path and not isinstance(path[-1], int) and text in str(path[-1]).lower():
+            yield path
+        elif not isinstance(value, (dict, list)) and text in str(value).lower():
+            yield path
+
+
+class JsonTreeView(QWidget):
+    """JSON树查看器：分支展开时才加载子节点，支持文档内搜索"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches = None
+        self.search_text = ""
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索键或值（回车查找下一个）")
+        self.search_edit.returnPressed.connect(self.find_next)
+        self.find_btn = QPushButton("查找下一个")
+        self.find_btn.clicked.connect(self.find_next)
+        self.collapse_btn = QPushButton("全部折叠")
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #666;")
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.find_btn)
+        search_layout.addWidget(self.collapse_btn)
+        search_layout.addWidget(self.status_label)
+        layout.addLayout(search_layout)
+
+        self.model = JsonTreeModel()
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)  # 固定行高，避免大数据量时逐行测量
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        self.tree.header().resizeSection(0, 250)
+        self.tree.header().setStretchLastSection(False)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.collapse_btn.clicked.connect(self.tree.collapseAll)
+        layout.addWidget(self.tree)
+
+    def set_json(self, body):
+        """显示JSON（body 可以是 JsonBody、已解析对象或JSON字符串）"""
+        if isinstance(body, str):
+            body = JsonBody(body)
+        data = body.data if isinstance(body, JsonBody) else body
+        self.model.set_data(data)
+        self.matches = None
+        self.status_label.setText("" if isinstance(data, (dict, list)) else "响应不是JSON对象/数组")
+
+    def clear(self):
+        self.model.set_data(None)
+        self.matches = None
+        self.status_label.setText("")
+
+    def find_next(self):
+        """查找下一个匹配项，展开其所在路径并选中"""
+        text = self.search_edit.text().strip()
+        if not text or not isinstance(self.model.root.value, (dict, list)):
+            return
+        if text != self.search_text or self.matches is None:
+            self.search_text = text
+            self.matches = iter_matches(self.model.root.value, text)
+        path = next(self.matches, None)
+        if path is None:
+            self.status_label.setText("没有更多匹配项")
+            self.matches = None
+            return
+        index = self.model.index_for_path(path)
+        parent = index.parent()
+        while parent.isValid():
+            self.tree.expand(parent)
+            parent = parent.parent()
+        self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index)
+        self.status_label.setText("路径：$" + "".join(
+            f"[{key}]" if isinstance(key, int) else f".{key}" for key in path))
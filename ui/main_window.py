@@ -5,6 +5,9 @@ from ui.api_module import ApiModule
 from ui.db_module import DbModule
 from ui.ps1_module import Ps1Module
 from ui.cmd_module import CmdModule
+from ui.diff_module import DiffModule
+from ui.diagnostics_module import DiagnosticsModule
+from ui.toast import ToastManager
 from config import QSS_PATH
 
 class MainWindow(QMainWindow):
@@ -13,6 +16,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.init_ui()
         self.load_style()
+        # 非模态通知（DAO/请求/后台线程发出的提示统一在右下角显示）
+        self.toast_manager = ToastManager(self)
 
     def init_ui(self):
         self.setWindowTitle("多功能工具平台")
@@ -34,22 +39,26 @@ class MainWindow(QMainWindow):
         font = QFont()
         font.setPointSize(12)
 
-        # 添加导航项
-        self.add_nav_item("接口管理", "icon-api", ApiModule())
-        self.add_nav_item("数据库管理", "icon-db", DbModule())
-        self.add_nav_item("PS1脚本管理", "icon-ps1", Ps1Module())
-        self.add_nav_item("CMD脚本管理", "icon-cmd", CmdModule())
-
         # 右侧内容区域
         self.stack_widget = QStackedWidget()
         layout.addWidget(self.nav_list)
         layout.addWidget(self.stack_widget)
 
+        # 添加导航项（页面在第一次切换到时才创建，启动时只创建首页）
+        self.page_factories = []
+        self.add_nav_item("接口管理", "icon-api", ApiModule)
+        self.add_nav_item("数据库管理", "icon-db", DbModule)
+        self.add_nav_item("PS1脚本管理", "icon-ps1", Ps1Module)
+        self.add_nav_item("CMD脚本管理", "icon-cmd", CmdModule)
+        self.add_nav_item("数据对比", "icon-diff", DiffModule)
+        self.add_nav_item("性能诊断", "icon-diagnostics", DiagnosticsModule)
+
         # 导航项点击事件
         self.nav_list.currentItemChanged.connect(self.switch_page)
+        self.nav_list.setCurrentRow(0)
 
-    def add_nav_item(self, text, icon_name, widget):
-        """添加导航项"""
+    def add_nav_item(self, text, icon_name, page_factory):
+        """添加导航项（page_factory：页面类或无参函数，先放占位部件）"""
         item = QListWidgetItem(text)
         item.setIcon(QIcon.fromTheme(icon_name))  # 替换为实际图标
         item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -57,13 +66,25 @@ class MainWindow(QMainWindow):
         font.setPointSize(12)
         item.setFont(font)
         self.nav_list.addItem(item)
-        self.stack_widget.addWidget(widget)
+        self.page_factories.append(page_factory)
+        self.stack_widget.addWidget(QWidget())
+
+    def page(self, index):
+        """获取页面（未创建时创建并替换占位部件）"""
+        factory = self.page_factories[index]
+        if factory is not None:
+            self.page_factories[index] = None
+            placeholder = self.stack_widget.widget(index)
+            self.stack_widget.insertWidget(index, factory())
+            self.stack_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return self.stack_widget.widget(index)
 
     def switch_page(self, current_item, previous_item):
         """切换页面"""
         if current_item:
             index = self.nav_list.row(current_item)
-            self.stack_widget.setCurrentIndex(index)
+            self.stack_widget.setCurrentWidget(self.page(index))
 
     def load_style(self):
         """加载样式表"""
@@ -110,6 +131,10 @@ class MainWindow(QMainWindow):
                     border-radius: 4px;
                     padding: 6px;
                 }
+                QPlainTextEdit {
+                    border: 1px solid #dee2e6;
+                    border-radius: 4px;
+                }
                 QTabWidget::pane {
                     border: 1px solid #dee2e6;
                 }
@@ -0,0 +1,56 @@
+from PyQt6.QtWidgets import QTableView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class ResultTableModel(QAbstractTableModel):
+    """查询结果表格模型（行为元组或字典，只在显示时转换为文本，适合大结果集）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self.rows = []
+
+    def set_result(self, columns, rows):
+        self.beginResetModel()
+        self.columns = list(columns)
+        self.rows = rows
+        self.endResetModel()
+
+    def clear(self):
+        self.set_result([], [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        row = self.rows[index.row()]
+        value = row.get(self.columns[index.column()]) if isinstance(row, dict) else row[index.column()]
+        return "NULL" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return section + 1
+
+
+class ResultGrid(QTableView):
+    """查询结果表格"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result_model = ResultTableModel(self)
+        self.setModel(self.result_model)
+        self.horizontalHeader().setStretchLastSection(True)
+        # 固定行高，避免大结果集逐行计算高度
+        self.verticalHeader().setDefaultSectionSize(24)
+
+    def set_result(self, columns, rows):
+        self.result_model.set_result(columns, rows)
+
+    def clear(self):
+        self.result_model.clear()
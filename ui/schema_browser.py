@@ -0,0 +1,158 @@
+import time
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel,
+                             QTreeWidget, QTreeWidgetItem)
+from PyQt6.QtCore import Qt
+from db.dao import db_dao
+from utils.common_utils import copy_to_clipboard
+from utils.schema_cache import get_schema_cache
+from ui.connection_module import ConnectionCombo
+from ui.workers import TaskWorker
+
+# 过滤时最多显示的表数量（避免一次创建过多节点）
+FILTER_RESULT_LIMIT = 500
+# 节点数据：(类型, 库名, 表名)
+NODE_ROLE = Qt.ItemDataRole.UserRole
+
+
+def load_schema_async(parent, connection_id=None, force=False, on_done=None):
+    """后台刷新某个连接的库表结构缓存（未过期且未失效时直接返回缓存）"""
+    loader = lambda db_name=None: db_dao.load_schema_metadata(db_name, connection_id)
+    worker = TaskWorker(get_schema_cache(connection_id).refresh, loader, parent=parent, force=force)
+    if on_done:
+        worker.finished.connect(on_done)
+    worker.start()
+    return worker
+
+
+class SchemaBrowserWidget(QWidget):
+    """库表结构浏览：库 → 表 → 列/索引，表节点展开时才创建子节点"""
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.shown_version = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(10)
+
+        top_layout = QHBoxLayout()
+        self.connection_combo = ConnectionCombo()
+        self.connection_combo.currentIndexChanged.connect(self.on_connection_changed)
+        top_layout.addWidget(self.connection_combo)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("按表名/列名过滤")
+        self.filter_edit.textChanged.connect(self.populate)
+        self.refresh_btn = QPushButton("刷新结构")
+        self.refresh_btn.clicked.connect(lambda: self.load_schema(force=True))
+        top_layout.addWidget(self.filter_edit)
+        top_layout.addWidget(self.refresh_btn)
+        layout.addLayout(top_layout)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #666;")
+        layout.addWidget(self.status_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(3)
+        self.tree.setHeaderLabels(["名称", "类型", "说明"])
+        self.tree.setColumnWidth(0, 280)
+        self.tree.setColumnWidth(1, 180)
+        self.tree.itemExpanded.connect(self.expand_item)
+        self.tree.itemDoubleClicked.connect(lambda item, _: copy_to_clipboard(item.text(0)))
+        layout.addWidget(self.tree)
+
+        tip = QLabel("双击复制名称；执行建表/改表等DDL后自动失效，切换到本页时重新加载")
+        tip.setStyleSheet("color: #666;")
+        layout.addWidget(tip)
+        self.setLayout(layout)
+
+    @property
+    def cache(self):
+        """当前连接的库表结构缓存"""
+        return get_schema_cache(self.connection_combo.current_id())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 连接配置可能在其他页面修改过
+        self.connection_combo.load_connections()
+        self.on_connection_changed()
+
+    def on_connection_changed(self):
+        if self.cache.is_expired():
+            self.load_schema()
+        elif self.shown_version != (id(self.cache), self.cache.version):
+            self.populate()
+
+    def load_schema(self, force=False):
+        """后台加载库表结构"""
+        if self.worker and self.worker.isRunning():
+            return
+        self.refresh_btn.setEnabled(False)
+        self.connection_combo.setEnabled(False)
+        self.status_label.setText("正在加载库表结构 ...")
+        self.worker = load_schema_async(self, self.connection_combo.current_id(), force=force,
+                                        on_done=self.on_loaded)
+
+    def on_loaded(self):
+        self.refresh_btn.setEnabled(True)
+        self.connection_combo.setEnabled(True)
+        self.populate()
+
+    def populate(self):
+        """按过滤条件重建树（过滤为空时只创建库节点）"""
+        schema_cache = self.cache
+        self.shown_version = (id(schema_cache), schema_cache.version)
+        self.tree.clear()
+        if not schema_cache.loaded:
+            self.status_label.setText("暂无库表结构，请点击「刷新结构」")
+            return
+        keyword = self.filter_edit.text().strip().lower()
+        table_count = 0
+        for db_name in schema_cache.databases():
+            tables = schema_cache.tables(db_name)
+            if keyword:
+                tables = [t for t in tables if keyword in t.lower()
+                          or any(keyword in c.lower() for c in schema_cache.columns(db_name, t))]
+                tables = tables[:max(FILTER_RESULT_LIMIT - table_count, 0)]
+                if not tables:
+                    continue
+            table_count += len(tables)
+            db_item = QTreeWidgetItem(self.tree, [db_name, "库", f"{len(tables)} 张表"])
+            db_item.setData(0, NODE_ROLE, ("db", db_name, None))
+            if keyword:
+                self.add_table_items(db_item, db_name, tables)
+                db_item.setExpanded(True)
+            else:
+                db_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        loaded_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(schema_cache.loaded_at))
+        self.status_label.setText(f"{len(schema_cache.databases())} 个库，缓存时间：{loaded_at}")
+
+    def add_table_items(self, parent, db_name, tables):
+        schema_cache = self.cache
+        for table_name in tables:
+            info = schema_cache.table_info(db_name, table_name)
+            rows = f"约 {info['rows']} 行" if info.get("rows") is not None else ""
+            item = QTreeWidgetItem(parent, [table_name, info["type"], " ".join(filter(None, [rows, info["comment"]]))])
+            item.setData(0, NODE_ROLE, ("table", db_name, table_name))
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+
+    def expand_item(self, item):
+        """展开时才创建子节点"""
+        if item.childCount():
+            return
+        kind, db_name, table_name = item.data(0, NODE_ROLE)
+        schema_cache = self.cache
+        if kind == "db":
+            self.add_table_items(item, db_name, schema_cache.tables(db_name))
+        elif kind == "table":
+            info = schema_cache.table_info(db_name, table_name) or {"columns": [], "indexes": {}}
+            for column in info["columns"]:
+                flags = [column["type"], "" if column["nullable"] else "NOT NULL", column["key"]]
+                QTreeWidgetItem(item, [column["name"], " ".join(filter(None, flags)), column["comment"]])
+            for index_name, index in info["indexes"].items():
+                index_item = QTreeWidgetItem(item, [index_name, "唯一索引" if index["unique"] else "索引",
+                                                    ", ".join(index["columns"])])
+                index_item.setForeground(0, Qt.GlobalColor.darkBlue)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
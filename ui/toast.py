@@ -0,0 +1,101 @@
+from PyQt6.QtWidgets import QLabel, QFrame, QVBoxLayout
+from PyQt6.QtCore import Qt, QObject, QTimer, QEvent
+from utils.notify_utils import notify_bus, Notice, ERROR, WARNING
+
+# 轮询通知队列的间隔（毫秒）
+POLL_INTERVAL = 100
+# 通知显示时长（毫秒）
+DURATIONS = {ERROR: 6000, WARNING: 4500}
+DEFAULT_DURATION = 3000
+# 同时显示的最大条数
+MAX_VISIBLE = 5
+
+TOAST_STYLES = {
+    ERROR: "background-color: #fff5f5; border: 1px solid #fc8181; color: #c53030;",
+    WARNING: "background-color: #fffaf0; border: 1px solid #f6ad55; color: #c05621;"
+}
+DEFAULT_STYLE = "background-color: #ebf8ff; border: 1px solid #63b3ed; color: #2b6cb0;"
+
+
+class Toast(QFrame):
+    """单条非模态提示（定时消失，点击关闭）"""
+    def __init__(self, parent, notice, on_close):
+        super().__init__(parent)
+        self.on_close = on_close
+        self.closed = False
+        self.setStyleSheet(f"Toast {{ {TOAST_STYLES.get(notice.level, DEFAULT_STYLE)} border-radius: 6px; }}")
+        self.setFixedWidth(320)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 8, 12, 8)
+        title = QLabel(f"<strong>{notice.title}</strong>")
+        content = QLabel(notice.content)
+        content.setWordWrap(True)
+        content.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(title)
+        layout.addWidget(content)
+        self.adjustSize()
+        QTimer.singleShot(DURATIONS.get(notice.level, DEFAULT_DURATION), self.close_toast)
+
+    def mousePressEvent(self, event):
+        self.close_toast()
+
+    def close_toast(self):
+        """关闭并销毁（窗口尚未显示时提示也不可见，同样直接销毁）"""
+        if not self.closed:
+            self.closed = True
+            self.hide()
+            self.on_close(self)
+            self.deleteLater()
+
+
+class ToastManager(QObject):
+    """在主线程中定时取出通知通道里的消息，以堆叠提示显示在窗口右下角"""
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.toasts = []
+        notify_bus.attach()
+        window.installEventFilter(self)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(POLL_INTERVAL)
+
+    def poll(self):
+        notices = notify_bus.drain()
+        if not notices:
+            return
+        # 一次到达太多时（如批量操作），只显示最新几条并合并提示剩余数量
+        if len(notices) > MAX_VISIBLE:
+            skipped = len(notices) - MAX_VISIBLE + 1
+            notices = notices[-(MAX_VISIBLE - 1):]
+            # 新建一条用于显示，不修改通知历史中的原记录
+            first = notices[0]
+            notices[0] = Notice(first.level, first.title, f"{first.content}\n（另有 {skipped} 条通知已省略）",
+                                first.source)
+        for notice in notices:
+            toast = Toast(self.window, notice, self.remove)
+            self.toasts.append(toast)
+            toast.show()
+            toast.raise_()
+        while len(self.toasts) > MAX_VISIBLE:
+            self.toasts.pop(0).close_toast()
+        self.relayout()
+
+    def remove(self, toast):
+        if toast in self.toasts:
+            self.toasts.remove(toast)
+            self.relayout()
+
+    def relayout(self):
+        """自下而上排列提示"""
+        margin = 16
+        bottom = self.window.height() - margin
+        for toast in reversed(self.toasts):
+            bottom -= toast.height()
+            toast.move(self.window.width() - toast.width() - margin, bottom)
+            bottom -= 8
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QEvent.Type.Resize:
+            self.relayout()
+        return False
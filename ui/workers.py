@@ -0,0 +1,25 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class TaskWorker(QThread):
+    """
+    后台任务线程：在子线程执行耗时函数，结果通过信号回到主线程
+    progress_kwarg：函数的进度回调参数名，传入后自动绑定到 progress 信号
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(object)
+
+    def __init__(self, func, *args, parent=None, progress_kwarg=None, **kwargs):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        if progress_kwarg:
+            self.kwargs[progress_kwarg] = self.progress.emit
+
+    def run(self):
+        try:
+            self.succeeded.emit(self.func(*self.args, **self.kwargs))
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,234 @@
+import json
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QTextEdit,
+                             QSplitter, QLabel)
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QColor
+from db.dao import db_dao
+from utils.common_utils import format_json, show_confirm, show_dialog_error, validate_required_fields
+from utils.workflow_utils import run_workflow, build_plan, WorkflowError
+from ui.workers import TaskWorker
+
+STEPS_PLACEHOLDER = """[
+  {"name": "登录", "api": "登录接口", "extract": {"token": "$.data.token"}},
+  {"name": "查询用户", "api": "用户信息接口", "headers": {"Authorization": "Bearer {{token}}"}},
+  {"name": "查询订单", "api": "订单列表接口", "headers": {"Authorization": "Bearer {{token}}"}}
+]"""
+
+STATUS_COLORS = {
+    "success": "#38a169",
+    "failed": "#e53e3e",
+    "skipped": "#a0aec0",
+    "running": "#3182ce"
+}
+
+
+class WorkflowDialog(QDialog):
+    """工作流新建/编辑对话框"""
+    def __init__(self, parent=None, workflow_data=None):
+        super().__init__(parent)
+        self.workflow_data = workflow_data
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("编辑工作流" if self.workflow_data else "新建工作流")
+        self.setMinimumSize(700, 500)
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        form_layout.setSpacing(15)
+        form_layout.setContentsMargins(20, 20, 20, 20)
+
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("请输入工作流名称（唯一）")
+        form_layout.addRow("工作流名称*", self.name_edit)
+
+        self.desc_edit = QLineEdit()
+        self.desc_edit.setPlaceholderText("请输入工作流描述（可选）")
+        form_layout.addRow("描述", self.desc_edit)
+
+        # 步骤定义：extract 提取变量（$JSONPath / re:正则 / header:名称），
+        # 后续步骤通过 {{变量}} 引用时自动建立依赖，互不依赖的步骤并发执行
+        self.steps_edit = QTextEdit()
+        self.steps_edit.setPlaceholderText(STEPS_PLACEHOLDER)
+        self.steps_edit.setMinimumHeight(250)
+        form_layout.addRow("步骤定义*", self.steps_edit)
+
+        layout.addLayout(form_layout)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setContentsMargins(20, 0, 20, 20)
+        self.save_btn = QPushButton("保存")
+        self.cancel_btn = QPushButton("取消")
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+        if self.workflow_data:
+            self.name_edit.setText(self.workflow_data["name"])
+            self.desc_edit.setText(self.workflow_data.get("description") or "")
+            self.steps_edit.setText(format_json(self.workflow_data["steps"]))
+
+    def get_data(self):
+        """获取表单数据"""
+        return {
+            "name": self.name_edit.text().strip(),
+            "description": self.desc_edit.text().strip(),
+            "steps": self.steps_edit.toPlainText().strip()
+        }
+
+    def accept(self):
+        """保存前验证（步骤JSON格式、接口是否存在、依赖是否成环）"""
+        data = self.get_data()
+        if not validate_required_fields({"工作流名称": data["name"], "步骤定义": data["steps"]}, parent=self):
+            return
+        try:
+            apis_by_name = {api["name"]: api for api in db_dao.get_all_apis()}
+            build_plan(json.loads(data["steps"]), apis_by_name)
+        except ValueError as e:
+            show_dialog_error(self, "验证失败", f"步骤定义不是合法的JSON：{str(e)}")
+            return
+        except WorkflowError as e:
+            show_dialog_error(self, "验证失败", str(e))
+            return
+        super().accept()
+
+
+class WorkflowManagerDialog(QDialog):
+    """工作流管理与运行（运行在后台线程，逐步显示每个步骤的耗时）"""
+    def __init__(self, parent=None, variables=None):
+        super().__init__(parent)
+        self.variables = variables or {}
+        self.worker = None
+        self.init_ui()
+        self.load_workflow_list()
+
+    def init_ui(self):
+        self.setWindowTitle("接口工作流")
+        self.setMinimumSize(900, 650)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        btn_layout = QHBoxLayout()
+        self.add_btn = QPushButton("新建工作流")
+        self.add_btn.clicked.connect(self.add_workflow)
+        btn_layout.addWidget(self.add_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        self.workflow_table = QTableWidget()
+        self.workflow_table.setColumnCount(4)
+        self.workflow_table.setHorizontalHeaderLabels(["ID", "工作流名称", "描述", "操作"])
+        self.workflow_table.horizontalHeader().setStretchLastSection(True)
+        splitter.addWidget(self.workflow_table)
+
+        # 运行报告：每个步骤的状态与耗时分布
+        report_widget = QWidget()
+        report_layout = QVBoxLayout(report_widget)
+        report_layout.setContentsMargins(0, 0, 0, 0)
+        self.summary_label = QLabel("运行报告")
+        report_layout.addWidget(self.summary_label)
+        self.report_table = QTableWidget()
+        self.report_table.setColumnCount(8)
+        self.report_table.setHorizontalHeaderLabels(
+            ["步骤", "接口", "状态", "状态码", "开始(ms)", "排队(ms)", "耗时(ms)", "提取变量/错误"])
+        self.report_table.horizontalHeader().setStretchLastSection(True)
+        report_layout.addWidget(self.report_table)
+        splitter.addWidget(report_widget)
+        splitter.setSizes([250, 350])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def load_workflow_list(self):
+        """加载工作流列表"""
+        self.workflow_table.setRowCount(0)
+        for workflow in db_dao.get_all_workflows():
+            row = self.workflow_table.rowCount()
+            self.workflow_table.insertRow(row)
+            self.workflow_table.setItem(row, 0, QTableWidgetItem(str(workflow["id"])))
+            self.workflow_table.setItem(row, 1, QTableWidgetItem(workflow["name"]))
+            self.workflow_table.setItem(row, 2, QTableWidgetItem(workflow.get("description") or ""))
+            btn_layout = QHBoxLayout()
+            run_btn = QPushButton("运行")
+            edit_btn = QPushButton("编辑")
+            delete_btn = QPushButton("删除")
+            run_btn.clicked.connect(lambda _, w=workflow: self.run_workflow(w))
+            edit_btn.clicked.connect(lambda _, w=workflow: self.edit_workflow(w))
+            delete_btn.clicked.connect(lambda _, w=workflow: self.delete_workflow(w["id"]))
+            for btn in (run_btn, edit_btn, delete_btn):
+                btn.setFixedSize(QSize(60, 25))
+                btn_layout.addWidget(btn)
+            btn_widget = QWidget()
+            btn_widget.setLayout(btn_layout)
+            self.workflow_table.setCellWidget(row, 3, btn_widget)
+
+    def add_workflow(self):
+        """新建工作流"""
+        dialog = WorkflowDialog(self)
+        if dialog.exec() and db_dao.add_workflow(dialog.get_data()):
+            self.load_workflow_list()
+
+    def edit_workflow(self, workflow_data):
+        """编辑工作流"""
+        dialog = WorkflowDialog(self, workflow_data)
+        if dialog.exec() and db_dao.update_workflow(workflow_data["id"], dialog.get_data()):
+            self.load_workflow_list()
+
+    def delete_workflow(self, workflow_id):
+        """删除工作流"""
+        if show_confirm(self, "确认删除", "是否删除该工作流？"):
+            if db_dao.delete_workflow(workflow_id):
+                self.load_workflow_list()
+
+    def run_workflow(self, workflow_data):
+        """后台运行工作流"""
+        if self.worker and self.worker.isRunning():
+            show_dialog_error(self, "提示", "已有工作流正在运行，请稍候")
+            return
+        try:
+            steps = json.loads(workflow_data["steps"])
+        except ValueError as e:
+            show_dialog_error(self, "运行失败", f"步骤定义不是合法的JSON：{str(e)}")
+            return
+        apis_by_name = {api["name"]: api for api in db_dao.get_all_apis()}
+        self.report_table.setRowCount(0)
+        self.report_rows = {}
+        self.summary_label.setText(f"正在运行：{workflow_data['name']} ...")
+        self.worker = TaskWorker(run_workflow, steps, apis_by_name, self.variables,
+                                 parent=self, progress_kwarg="on_step")
+        self.worker.progress.connect(self.update_step_row)
+        self.worker.succeeded.connect(self.show_report)
+        self.worker.failed.connect(lambda msg: self.summary_label.setText(f"运行失败：{msg}"))
+        self.worker.start()
+
+    def update_step_row(self, report):
+        """步骤结束时刷新报告表中对应的行"""
+        row = self.report_rows.get(report["name"])
+        if row is None:
+            row = self.report_table.rowCount()
+            self.report_table.insertRow(row)
+            self.report_rows[report["name"]] = row
+        detail = report["error"] or json.dumps(report["extracted"], ensure_ascii=False, default=str)
+        values = [report["name"], report["api"], report["status"], report["status_code"],
+                  report["start_ms"], report["wait_ms"], report["elapsed_ms"], detail]
+        for col, value in enumerate(values):
+            item = QTableWidgetItem("" if value is None else str(value))
+            if col == 2:
+                item.setForeground(QColor(STATUS_COLORS.get(report["status"], "#2d3748")))
+            self.report_table.setItem(row, col, item)
+
+    def show_report(self, result):
+        """显示运行汇总（总耗时与关键路径）"""
+        for report in result["steps"]:
+            self.update_step_row(report)
+        status = "成功" if result["success"] else "失败"
+        path = " → ".join(result["critical_path"])
+        self.summary_label.setText(f"运行{status}，总耗时 {result['total_ms']} ms，关键路径：{path}")
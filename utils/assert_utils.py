@@ -0,0 +1,368 @@
+"""
+响应断言：api_info.assertions 中保存的断言（JSON数组）编译一次后对请求结果逐条检查
+  {"type": "status", "expected": 200}                     状态码（也可以是列表 [200, 201] 或 "2xx"）
+  {"type": "jsonpath", "path": "$.code", "op": "eq", "expected": 0}
+                                                          op：eq ne gt ge lt le contains in exists not_exists matches
+  {"type": "regex", "pattern": "\"success\":\\s*true"}    响应体文本匹配正则
+  {"type": "latency", "max_ms": 500}                      总耗时上限
+  {"type": "schema", "schema": {...}}                     JSON Schema 常用子集：type / properties / required /
+                                                          additionalProperties / items / enum / const / minimum /
+                                                          maximum / minLength / maxLength / pattern / minItems / maxItems
+"""
+import re
+from functools import lru_cache
+from utils.extract_utils import compile_json_path, parse_body
+from utils.json_utils import loads, dumps
+
+# 失败信息中实际值的最大字符数
+VALUE_PREVIEW_LIMIT = 200
+
+
+def _preview(value):
+    text = value if isinstance(value, str) else dumps(value)
+    return text if len(text) <= VALUE_PREVIEW_LIMIT else text[:VALUE_PREVIEW_LIMIT] + "..."
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _contains(actual, expected):
+    if isinstance(actual, (str, list, dict)):
+        try:
+            return expected in actual
+        except TypeError:
+            return False
+    return False
+
+
+def _compare(op):
+    """大小比较：两边都是数字或都是字符串时才比较，否则判为不通过"""
+    def compare(actual, expected):
+        if (_number(actual) and _number(expected)) or (isinstance(actual, str) and isinstance(expected, str)):
+            return op(actual, expected)
+        return False
+    return compare
+
+
+# jsonpath 断言的比较方式：op -> (检查函数(实际值, 期望值), 描述)
+OPERATORS = {
+    "eq": (lambda actual, expected: actual == expected, "等于"),
+    "ne": (lambda actual, expected: actual != expected, "不等于"),
+    "gt": (_compare(lambda a, b: a > b), "大于"),
+    "ge": (_compare(lambda a, b: a >= b), "大于等于"),
+    "lt": (_compare(lambda a, b: a < b), "小于"),
+    "le": (_compare(lambda a, b: a <= b), "小于等于"),
+    "contains": (_contains, "包含"),
+    "in": (lambda actual, expected: isinstance(expected, list) and actual in expected, "属于"),
+}
+# 不需要期望值的比较方式
+UNARY_OPERATORS = ("exists", "not_exists")
+
+
+# ------------------------------ JSON Schema（子集） ------------------------------
+_SCHEMA_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": _number,
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def compile_schema(schema):
+    """
+    JSON Schema 编译为校验函数 validate(值, 位置) -> 错误信息或 None
+    编译时解析全部关键字与正则，校验时只做类型判断和比较
+    """
+    if not isinstance(schema, dict):
+        raise ValueError("schema 必须是对象")
+    checks = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = types if isinstance(types, list) else [types]
+        if not all(isinstance(name, str) for name in names):
+            raise ValueError("schema 的 type 必须是字符串或字符串数组")
+        unknown = [name for name in names if name not in _SCHEMA_TYPES]
+        if unknown:
+            raise ValueError(f"schema 不支持的类型：{', '.join(map(str, unknown))}")
+        type_checks = [_SCHEMA_TYPES[name] for name in names]
+        expected = "/".join(names)
+
+        def check_type(value, path):
+            if not any(check(value) for check in type_checks):
+                return f"{path} 类型应为 {expected}，实际为 {_preview(dumps(value))}"
+        checks.append(check_type)
+
+    if "enum" in schema:
+        enum = schema["enum"]
+        if not isinstance(enum, list):
+            raise ValueError("schema 的 enum 必须是数组")
+
+        def check_enum(value, path):
+            if value not in enum:
+                return f"{path} 应为 {_preview(enum)} 之一，实际为 {_preview(value)}"
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path):
+            if value != const:
+                return f"{path} 应为 {_preview(const)}，实际为 {_preview(value)}"
+        checks.append(check_const)
+
+    for keyword, test, text in (("minimum", lambda v, n: v >= n, "不小于"), ("maximum", lambda v, n: v <= n, "不大于")):
+        if keyword in schema:
+            def check_range(value, path, limit=schema[keyword], test=test, text=text):
+                if _number(value) and not test(value, limit):
+                    return f"{path} 应{text} {limit}，实际为 {value}"
+            checks.append(check_range)
+
+    for keyword, sized, test, text in (
+            ("minLength", str, lambda n, limit: n >= limit, "长度不小于"),
+            ("maxLength", str, lambda n, limit: n <= limit, "长度不大于"),
+            ("minItems", list, lambda n, limit: n >= limit, "元素数不小于"),
+            ("maxItems", list, lambda n, limit: n <= limit, "元素数不大于")):
+        if keyword in schema:
+            def check_size(value, path, limit=schema[keyword], sized=sized, test=test, text=text):
+                if isinstance(value, sized) and not test(len(value), limit):
+                    return f"{path} {text} {limit}，实际为 {len(value)}"
+            checks.append(check_size)
+
+    if "pattern" in schema:
+        if not isinstance(schema["pattern"], str):
+            raise ValueError("schema 的 pattern 必须是字符串")
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value, path):
+            if isinstance(value, str) and not pattern.search(value):
+                return f"{path} 不匹配 {pattern.pattern}：{_preview(value)}"
+        checks.append(check_pattern)
+
+    properties = schema.get("properties") or {}
+    if not isinstance(properties, dict):
+        raise ValueError("schema 的 properties 必须是对象")
+    properties = {name: compile_schema(sub) for name, sub in properties.items()}
+    required = schema.get("required") or []
+    if not isinstance(required, list) or not all(isinstance(name, str) for name in required):
+        raise ValueError("schema 的 required 必须是字符串数组")
+    additional = schema.get("additionalProperties", True)
+    if properties or required or additional is not True:
+        additional_check = compile_schema(additional) if isinstance(additional, dict) else None
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return None
+            for name in required:
+                if name not in value:
+                    return f"{path} 缺少字段 {name}"
+            for name, item in value.items():
+                validate = properties.get(name)
+                if validate is None:
+                    if additional is False:
+                        return f"{path} 不允许的字段 {name}"
+                    validate = additional_check
+                if validate is not None:
+                    error = validate(item, f"{path}.{name}")
+                    if error:
+                        return error
+            return None
+        checks.append(check_object)
+
+    if isinstance(schema.get("items"), dict):
+        validate_item = compile_schema(schema["items"])
+
+        def check_items(value, path):
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    error = validate_item(item, f"{path}[{index}]")
+                    if error:
+                        return error
+            return None
+        checks.append(check_items)
+
+    def validate(value, path="$"):
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+        return None
+    return validate
+
+
+# ------------------------------ 断言 ------------------------------
+class Assertion:
+    """一条编译好的断言：check(结果, 响应体JSON) 返回失败原因，通过返回 None"""
+    __slots__ = ("kind", "text", "check", "needs_body")
+
+    def __init__(self, kind, text, check, needs_body=False):
+        self.kind = kind
+        self.text = text
+        self.check = check
+        self.needs_body = needs_body
+
+
+def _status_assertion(spec):
+    expected = spec.get("expected", 200)
+    values = expected if isinstance(expected, list) else [expected]
+    codes, classes = set(), set()
+    for value in values:
+        text = str(value).strip().lower()
+        if re.fullmatch(r"[1-5]xx", text):
+            classes.add(int(text[0]))
+        elif text.isdigit():
+            codes.add(int(text))
+        else:
+            raise ValueError(f"状态码断言的期望值无效：{value}")
+    label = "/".join(str(value) for value in values)
+
+    def check(result, body):
+        status = result["status_code"]
+        if status not in codes and status // 100 not in classes:
+            return f"状态码应为 {label}，实际为 {status}"
+    return Assertion("status", f"状态码 = {label}", check)
+
+
+def _jsonpath_assertion(spec):
+    path = compile_json_path(str(spec.get("path") or ""))
+    op = spec.get("op", "exists" if "expected" not in spec else "eq")
+    expected = spec.get("expected")
+    if not isinstance(op, str):
+        raise ValueError(f"不支持的比较方式：{op}")
+    if op in UNARY_OPERATORS:
+        should_exist = op == "exists"
+
+        def check(result, body):
+            found = bool(path.find_all(body)) if body is not None else False
+            if found != should_exist:
+                return f"{path.expr} {'不存在' if should_exist else '不应存在'}"
+        return Assertion("jsonpath", f"{path.expr} {'存在' if should_exist else '不存在'}", check, True)
+    if op == "matches":
+        pattern = re.compile(str(expected), re.S)
+        compare, text = (lambda actual, _: isinstance(actual, str) and bool(pattern.search(actual))), "匹配"
+    elif op in OPERATORS:
+        compare, text = OPERATORS[op]
+    else:
+        raise ValueError(f"不支持的比较方式：{op}")
+
+    def check(result, body):
+        values = path.find_all(body) if body is not None else []
+        if not values:
+            return f"{path.expr} 不存在" if body is not None else "响应体不是JSON"
+        if not compare(values[0], expected):
+            return f"{path.expr} 应{text} {_preview(expected)}，实际为 {_preview(values[0])}"
+    return Assertion("jsonpath", f"{path.expr} {text} {_preview(expected)}", check, True)
+
+
+def _regex_assertion(spec):
+    pattern = re.compile(str(spec.get("pattern") or ""), re.S)
+    negate = bool(spec.get("not"))
+
+    def check(result, body):
+        if bool(pattern.search(result.get("text") or "")) == negate:
+            return f"响应体{'不应' if negate else '未'}匹配 {pattern.pattern}"
+    return Assertion("regex", f"响应体{'不' if negate else ''}匹配 {pattern.pattern}", check)
+
+
+def _latency_assertion(spec):
+    try:
+        max_ms = float(spec["max_ms"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("耗时断言需要数字 max_ms")
+
+    def check(result, body):
+        elapsed = result.get("elapsed_ms") or 0
+        if elapsed > max_ms:
+            return f"耗时 {elapsed} ms 超过 {max_ms:g} ms"
+    return Assertion("latency", f"耗时 <= {max_ms:g} ms", check)
+
+
+def _schema_assertion(spec):
+    validate = compile_schema(spec.get("schema"))
+
+    def check(result, body):
+        if body is None:
+            return "响应体不是JSON"
+        return validate(body)
+    return Assertion("schema", "响应体符合 schema", check, True)
+
+
+ASSERTION_TYPES = {
+    "status": _status_assertion,
+    "jsonpath": _jsonpath_assertion,
+    "regex": _regex_assertion,
+    "latency": _latency_assertion,
+    "schema": _schema_assertion,
+}
+
+
+class AssertionSet:
+    """一个接口的全部断言（编译后只读，可在多个线程中同时使用）"""
+    __slots__ = ("assertions", "has_status", "needs_body")
+
+    def __init__(self, assertions):
+        self.assertions = assertions
+        self.has_status = any(a.kind == "status" for a in assertions)
+        self.needs_body = any(a.needs_body for a in assertions)
+
+    def __len__(self):
+        return len(self.assertions)
+
+    def evaluate(self, result):
+        """逐条检查，返回 [{assertion, passed, message}]（响应体最多解析一次）"""
+        body = parse_body(result) if self.needs_body else None
+        outcomes = []
+        for assertion in self.assertions:
+            try:
+                message = assertion.check(result, body)
+            except Exception as e:
+                message = f"断言执行出错：{e}"
+            outcomes.append({"assertion": assertion.text, "passed": message is None, "message": message or ""})
+        return outcomes
+
+
+@lru_cache(maxsize=4096)
+def _compile_text(text):
+    try:
+        specs = loads(text)
+    except ValueError as e:
+        raise ValueError(f"断言不是有效的JSON：{e}")
+    return _compile_specs(specs)
+
+
+def _compile_specs(specs):
+    if isinstance(specs, dict):
+        specs = [specs]
+    if not isinstance(specs, list):
+        raise ValueError("断言应为JSON数组")
+    assertions = []
+    for index, spec in enumerate(specs, 1):
+        kind = spec.get("type") if isinstance(spec, dict) else None
+        if not isinstance(kind, str) or kind not in ASSERTION_TYPES:
+            raise ValueError(f"第 {index} 条断言的 type 应为：{', '.join(ASSERTION_TYPES)}")
+        try:
+            assertions.append(ASSERTION_TYPES[kind](spec))
+        except re.error as e:
+            raise ValueError(f"第 {index} 条断言的正则无效：{e}")
+        except ValueError as e:
+            raise ValueError(f"第 {index} 条断言无效：{e}")
+    return AssertionSet(assertions)
+
+
+def compile_assertions(value):
+    """
+    编译断言（api_info.assertions 的JSON文本或已解析的列表），为空返回 None；格式错误抛出 ValueError
+    JSON文本按内容缓存，同一接口多次运行只编译一次
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value or value == "[]":
+            return None
+        return _compile_text(value) or None
+    return _compile_specs(value) or None
@@ -0,0 +1,195 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatchcase
+from config import BATCH_MAX_WORKERS
+from db.dao import db_dao
+from utils.assert_utils import compile_assertions
+from utils.json_utils import loads
+from utils.notify_utils import notify_bus, ERROR
+from utils.http_transport import get_transport
+from utils.request_utils import execute_request, execute_request_async, describe_request_error
+
+# 用例状态：通过 / 断言失败（接口断言不通过，未配置状态码断言时HTTP状态码>=400也算失败） / 执行出错（网络异常、SQL报错、断言格式错误等）
+PASSED = "passed"
+FAILED = "failed"
+ERRORED = "error"
+
+# 失败信息中附带的响应体最大字符数
+MESSAGE_BODY_LIMIT = 500
+
+
+def select_by_names(items, patterns):
+    """按名称或通配符（如 "用户*"）选择接口/SQL脚本，保持匹配顺序并去重；返回 (选中项, 未匹配的名称)"""
+    selected, missing, seen = [], [], set()
+    for pattern in patterns:
+        matched = [item for item in items if fnmatchcase(item["name"], pattern)]
+        if not matched:
+            missing.append(pattern)
+        for item in matched:
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                selected.append(item)
+    return selected, missing
+
+
+def load_env_variables(env_name):
+    """按环境名读取环境变量字典，环境不存在返回 None"""
+    for env in db_dao.get_all_envs():
+        if env["name"] == env_name:
+            try:
+                variables = loads(env.get("variables") or "{}")
+            except ValueError:
+                variables = {}
+            return variables if isinstance(variables, dict) else {}
+    return None
+
+
+def _case(kind, item):
+    return {"kind": kind, "name": item["name"], "status": PASSED, "elapsed_ms": 0, "message": "", "detail": {}}
+
+
+def _finish_api_case(case, start, result=None, error=None, assertions=None):
+    """按请求结果/异常填写接口用例结果，配置了断言时逐条检查（在线程池的工作线程中执行）"""
+    if error is not None:
+        case["status"] = ERRORED
+        case["message"] = describe_request_error(error)
+    else:
+        case["detail"] = {"status_code": result["status_code"], "http_version": result["http_version"],
+                          "timing": result["timing"]}
+        failures = []
+        if (assertions is None or not assertions.has_status) and result["status_code"] >= 400:
+            failures.append(f"HTTP {result['status_code']}：{result['text'][:MESSAGE_BODY_LIMIT]}")
+        if assertions is not None:
+            outcomes = assertions.evaluate(result)
+            case["detail"]["assertions"] = outcomes
+            failures.extend(outcome["message"] for outcome in outcomes if not outcome["passed"])
+        if failures:
+            case["status"] = FAILED
+            case["message"] = "；".join(failures)
+    case["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return case
+
+
+def _assertion_error_case(api, error):
+    case = _case("api", api)
+    case["status"] = ERRORED
+    case["message"] = f"断言格式错误：{error}"
+    return case
+
+
+def run_api_case(api, variables=None, backend=None, assertions=None):
+    """运行一个已保存的接口，返回用例结果（不抛出异常；assertions 为编译好的断言，为空时按接口配置编译）"""
+    if assertions is None:
+        try:
+            assertions = compile_assertions(api.get("assertions"))
+        except ValueError as e:
+            return _assertion_error_case(api, e)
+    case = _case("api", api)
+    start = time.perf_counter()
+    try:
+        result = execute_request(api["url"], api["method"], api.get("params"), api.get("headers"), variables,
+                                 backend=backend)
+    except Exception as e:
+        return _finish_api_case(case, start, error=e)
+    return _finish_api_case(case, start, result, assertions=assertions)
+
+
+async def run_api_case_async(api, variables=None, backend=None, assertions=None, executor=None):
+    """
+    run_api_case 的协程版本（异步HTTP后端在事件循环中并发运行）
+    请求返回后的断言检查交给 executor（线程池，为空时用事件循环的默认线程池），不阻塞共享的事件循环线程
+    """
+    if assertions is None:
+        try:
+            assertions = compile_assertions(api.get("assertions"))
+        except ValueError as e:
+            return _assertion_error_case(api, e)
+    case = _case("api", api)
+    start = time.perf_counter()
+    try:
+        result = await execute_request_async(api["url"], api["method"], api.get("params"), api.get("headers"),
+                                             variables, backend=backend)
+    except Exception as e:
+        return _finish_api_case(case, start, error=e)
+    return await asyncio.get_running_loop().run_in_executor(executor, _finish_api_case, case, start, result, None,
+                                                            assertions)
+
+
+def run_sql_case(script, variables=None):
+    """运行一个已保存的SQL脚本（配置了多库执行时在全部目标库执行），返回用例结果（不抛出异常）"""
+    case = _case("sql", script)
+    start = time.perf_counter()
+    # DAO 出错时只发通知并返回None，这里收集通知作为失败原因
+    with notify_bus.capture() as notices:
+        if script.get("target_dbs"):
+            result = db_dao.execute_sql_multi(script["target_dbs"], script["sql_content"], variables,
+                                              script.get("connection_id"))
+        else:
+            result = db_dao.execute_sql(script["db_name"], script["sql_content"], variables,
+                                        script.get("connection_id"))
+    if result is None:
+        case["status"] = ERRORED
+        case["message"] = "；".join(n.content for n in notices if n.level == ERROR) or "执行失败"
+    elif "results" in result:
+        failed = [r for r in result["results"] if r["error"]]
+        case["detail"] = {"databases": len(result["results"]), "failed": [r["db"] for r in failed],
+                          "rows": len(result["merged"]["data"]) if result["merged"] else 0}
+        if failed:
+            case["status"] = FAILED
+            case["message"] = "；".join(f"{r['db']}：{r['error']}" for r in failed)
+    elif result["type"] == "query":
+        case["detail"] = {"rows": len(result["data"]), "timing": result["timing"]}
+    else:
+        case["detail"] = {"affected_rows": result["affected_rows"], "timing": result["timing"]}
+    case["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return case
+
+
+def run_batch(apis=(), scripts=(), variables=None, max_workers=BATCH_MAX_WORKERS, on_case=None, backend=None):
+    """
+    并发运行一批接口和SQL脚本（单项失败不影响其他项）
+    接口断言在提交前统一编译（同样的断言只编译一次），请求返回后在工作线程中检查
+    SQL脚本和阻塞HTTP后端的接口在线程池中运行（max_workers 为线程数）；
+    异步HTTP后端（httpx）的接口全部提交到事件循环，并发由其连接池上限控制，只有断言检查回到线程池执行
+    on_case(用例结果)：每项结束时回调（在调用线程中执行）
+    返回 {success, total_ms, counts: {状态: 数量}, cases: [按传入顺序的用例结果]}
+    """
+    transport = get_transport(backend) if apis else None
+    async_apis = transport is not None and transport.is_async
+    cases = [None] * (len(apis) + len(scripts))
+    start = time.perf_counter()
+    # 异步后端的请求不占用线程，但断言检查同样在线程池中执行
+    thread_tasks = len(scripts) + len(apis)
+    if cases:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, thread_tasks))) as pool:
+            futures = {}
+            for index, api in enumerate(apis):
+                try:
+                    assertions = compile_assertions(api.get("assertions"))
+                except ValueError as e:
+                    cases[index] = _assertion_error_case(api, e)
+                    if on_case:
+                        on_case(cases[index])
+                    continue
+                if async_apis:
+                    future = transport.submit(run_api_case_async(api, variables, backend, assertions, pool))
+                else:
+                    future = pool.submit(run_api_case, api, variables, backend, assertions)
+                futures[future] = index
+            for index, script in enumerate(scripts, len(apis)):
+                futures[pool.submit(run_sql_case, script, variables)] = index
+            for future in as_completed(futures):
+                case = future.result()
+                cases[futures[future]] = case
+                if on_case:
+                    on_case(case)
+    counts = {PASSED: 0, FAILED: 0, ERRORED: 0}
+    for case in cases:
+        counts[case["status"]] += 1
+    return {
+        "success": counts[PASSED] == len(cases),
+        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+        "counts": counts,
+        "cases": cases
+    }
@@ -1,14 +1,18 @@
-import json
+from utils import json_utils
+from utils.json_utils import JsonBody
+from utils.notify_utils import notify_info, notify_error
 from PyQt6.QtWidgets import QMessageBox, QApplication
 from PyQt6.QtCore import Qt
 
 def format_json(data):
-    """格式化JSON字符串"""
+    """格式化JSON字符串（JsonBody 复用已解析结果，只格式化一次）"""
     try:
-        if isinstance(data, dict):
-            return json.dumps(data, ensure_ascii=False, indent=2)
+        if isinstance(data, JsonBody):
+            return data.pretty()
+        elif isinstance(data, (dict, list)):
+            return json_utils.dumps(data, pretty=True)
         elif isinstance(data, str):
-            return json.dumps(json.loads(data), ensure_ascii=False, indent=2)
+            return json_utils.dumps(json_utils.unwrap(json_utils.loads(data)), pretty=True)
         else:
             return str(data)
     except Exception as e:
@@ -21,17 +25,29 @@ def copy_to_clipboard(text):
     show_info("提示", "已复制到剪贴板！")
 
 def show_info(title, content):
-    """显示信息提示框"""
-    QMessageBox.information(None, title, content, QMessageBox.StandardButton.Ok)
+    """显示信息提示（非模态，任意线程可调用）"""
+    notify_info(title, content, source="ui")
 
 def show_error(title, content):
-    """显示错误提示框"""
-    QMessageBox.critical(None, title, content, QMessageBox.StandardButton.Ok)
+    """显示错误提示（非模态，任意线程可调用）"""
+    notify_error(title, content, source="ui")
 
-def validate_required_fields(fields):
-    """验证必填字段（{字段名: 字段值}）"""
+def show_confirm(parent, title, content):
+    """确认对话框（模态，仅用于需要用户确认的操作，只能在主线程调用）"""
+    return QMessageBox.question(parent, title, content,
+                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes
+
+def show_dialog_error(parent, title, content):
+    """模态对话框内的错误提示：用消息框弹在对话框之上（toast 会被模态对话框挡住），只能在主线程调用"""
+    QMessageBox.warning(parent, title, content)
+
+def validate_required_fields(fields, parent=None):
+    """验证必填字段（{字段名: 字段值}），在模态对话框中校验时传入 parent"""
     for field_name, field_value in fields.items():
         if not field_value or str(field_value).strip() == "":
-            show_error("验证失败", f"{field_name}不能为空！")
+            if parent is not None:
+                show_dialog_error(parent, "验证失败", f"{field_name}不能为空！")
+            else:
+                show_error("验证失败", f"{field_name}不能为空！")
             return False
     return True
\ No newline at end of file
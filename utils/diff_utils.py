@@ -0,0 +1,443 @@
+"""
+数据对比：
+  接口响应：同一接口在两个环境下的响应，状态码、响应头和响应体按结构对比（对象按键、数组按下标或指定的键字段对齐），
+           只列出变化的字段路径；非JSON响应体按行对比
+  查询结果：两个查询的结果集按主键列对齐逐行对比，只列出新增/删除的行和有变化的列；
+           结果集流式读取，缓存行数超过 DIFF_MEMORY_ROWS 后按主键哈希分区写入临时文件，再逐个分区对比，
+           内存占用只与单个分区的大小有关
+"""
+import difflib
+import os
+import re
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from config import DIFF_MAX_CHANGES, DIFF_MEMORY_ROWS, DIFF_PARTITIONS
+from utils.json_utils import loads, dumps
+from utils.request_utils import execute_request, describe_request_error
+
+# 差异类型
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# 对比响应头时忽略的头（每次请求都会变化，或与响应体长度/编码有关）
+IGNORE_HEADERS = {"date", "server", "content-length", "transfer-encoding", "connection", "keep-alive", "age",
+                  "expires", "etag", "last-modified", "set-cookie", "x-request-id", "x-trace-id"}
+
+# 可以用 .键名 表示的对象键，其余用 ["键名"]
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# 表示某一侧不存在该字段
+_MISSING = object()
+
+
+class DiffError(Exception):
+    """对比失败（请求出错、主键列不存在等）"""
+
+
+class DiffCancelled(Exception):
+    """对比被取消"""
+
+
+class ChangeList:
+    """差异列表：最多保留 max_changes 条明细，各类差异的计数不受限制"""
+    def __init__(self, max_changes=DIFF_MAX_CHANGES):
+        self.max_changes = max_changes
+        self.items = []
+        self.counts = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+
+    def add(self, change_type, **fields):
+        self.counts[change_type] += 1
+        if len(self.items) < self.max_changes:
+            fields["type"] = change_type
+            self.items.append(fields)
+
+    @property
+    def full(self):
+        return len(self.items) >= self.max_changes
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def truncated(self):
+        return self.total > len(self.items)
+
+    def to_dict(self):
+        return {"changes": self.items, "counts": dict(self.counts), "total": self.total, "truncated": self.truncated}
+
+
+# ------------------------------ JSON 结构对比 ------------------------------
+def child_path(path, key):
+    """子字段路径：$.data.items[0].name、$["带空格的键"]"""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    key = str(key)
+    return f"{path}.{key}" if _IDENTIFIER.match(key) else f"{path}[{dumps(key)}]"
+
+
+def compile_ignore(patterns):
+    """忽略的字段路径（* 匹配任意字符，如 $.data[*].update_time）编译为一个正则，为空时返回 None"""
+    patterns = [p.strip() for p in patterns or () if p and p.strip()]
+    if not patterns:
+        return None
+    alternatives = ["(?:" + re.escape(p).replace(r"\*", ".*") + ")" for p in patterns]
+    return re.compile("|".join(alternatives) + r"\Z")
+
+
+def _same(a, b):
+    """同类型且相等（1 与 1.0 视为相同，True 与 1 不同）"""
+    if type(a) is type(b):
+        return a == b
+    numbers = (int, float)
+    if isinstance(a, numbers) and isinstance(b, numbers) and not isinstance(a, bool) and not isinstance(b, bool):
+        return a == b
+    return False
+
+
+def _keyed_items(items, array_key):
+    """数组元素都是含 array_key 且取值不重复的对象时，返回 {键值: 元素}，否则返回 None"""
+    keyed = {}
+    for item in items:
+        if not isinstance(item, dict) or array_key not in item:
+            return None
+        value = item[array_key]
+        if isinstance(value, (dict, list)) or value in keyed:
+            return None
+        keyed[value] = item
+    return keyed
+
+
+def diff_json(old, new, ignore_paths=(), array_key=None, changes=None):
+    """
+    按结构对比两个JSON值，差异追加到 changes（ChangeList），返回 changes
+    ignore_paths：忽略的字段路径；array_key：对象数组按该字段对齐（如 "id"），否则按下标对齐
+    显式栈遍历，嵌套层级很深时也不会超出递归深度
+    """
+    changes = changes if changes is not None else ChangeList()
+    ignored = compile_ignore(ignore_paths)
+    stack = [("$", old, new)]
+    while stack:
+        path, a, b = stack.pop()
+        if ignored is not None and ignored.match(path):
+            continue
+        if a is _MISSING:
+            changes.add(ADDED, path=path, old=None, new=b)
+        elif b is _MISSING:
+            changes.add(REMOVED, path=path, old=a, new=None)
+        elif isinstance(a, dict) and isinstance(b, dict):
+            children = [(child_path(path, key), value, b.get(key, _MISSING)) for key, value in a.items()]
+            children += [(child_path(path, key), _MISSING, value) for key, value in b.items() if key not in a]
+            stack.extend(reversed(children))
+        elif isinstance(a, list) and isinstance(b, list):
+            keyed_a = _keyed_items(a, array_key) if array_key else None
+            keyed_b = _keyed_items(b, array_key) if keyed_a is not None else None
+            if keyed_b is not None:
+                children = [(f"{path}[{array_key}={dumps(key)}]", value, keyed_b.get(key, _MISSING))
+                            for key, value in keyed_a.items()]
+                children += [(f"{path}[{array_key}={dumps(key)}]", _MISSING, value)
+                             for key, value in keyed_b.items() if key not in keyed_a]
+            else:
+                children = [(child_path(path, i), a[i] if i < len(a) else _MISSING, b[i] if i < len(b) else _MISSING)
+                            for i in range(max(len(a), len(b)))]
+            stack.extend(reversed(children))
+        elif not _same(a, b):
+            changes.add(CHANGED, path=path, old=a, new=b)
+    return changes
+
+
+def diff_text(old, new, changes=None):
+    """按行对比两段文本（非JSON响应体），差异追加到 changes"""
+    changes = changes if changes is not None else ChangeList()
+    old_lines = old.splitlines()
+    new_lines = new.splitlines()
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        # 替换的部分逐行配对，多出来的行记为新增/删除
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for offset in range(paired):
+            changes.add(CHANGED, path=f"第 {i1 + offset + 1} 行", old=old_lines[i1 + offset],
+                        new=new_lines[j1 + offset])
+        for i in range(i1 + paired, i2):
+            changes.add(REMOVED, path=f"第 {i + 1} 行", old=old_lines[i], new=None)
+        for j in range(j1 + paired, j2):
+            changes.add(ADDED, path=f"第 {j + 1} 行（新）", old=None, new=new_lines[j])
+    return changes
+
+
+# ------------------------------ 接口响应对比 ------------------------------
+def _response_summary(result):
+    return {"status_code": result["status_code"], "elapsed_ms": result["elapsed_ms"], "size": len(result["text"])}
+
+
+def diff_responses(old, new, ignore_paths=(), array_key=None, compare_headers=True, max_changes=DIFF_MAX_CHANGES):
+    """
+    对比两个接口响应（execute_request 的结果）：状态码、响应头（忽略 IGNORE_HEADERS）、响应体
+    返回 {left, right, body_format, changes, counts, total, truncated}
+    """
+    changes = ChangeList(max_changes)
+    if old["status_code"] != new["status_code"]:
+        changes.add(CHANGED, path="状态码", old=old["status_code"], new=new["status_code"])
+    if compare_headers:
+        old_headers = {name.lower(): value for name, value in old["headers"].items()}
+        new_headers = {name.lower(): value for name, value in new["headers"].items()}
+        for name in sorted(set(old_headers) | set(new_headers)):
+            if name in IGNORE_HEADERS:
+                continue
+            a = old_headers.get(name, _MISSING)
+            b = new_headers.get(name, _MISSING)
+            if a is _MISSING:
+                changes.add(ADDED, path=f"响应头 {name}", old=None, new=b)
+            elif b is _MISSING:
+                changes.add(REMOVED, path=f"响应头 {name}", old=a, new=None)
+            elif a != b:
+                changes.add(CHANGED, path=f"响应头 {name}", old=a, new=b)
+
+    old_body = old["body"]
+    new_body = new["body"]
+    if old_body.is_json and new_body.is_json:
+        body_format = "json"
+        diff_json(old_body.data, new_body.data, ignore_paths, array_key, changes)
+    else:
+        body_format = "text"
+        if old_body.text != new_body.text:
+            diff_text(old_body.text, new_body.text, changes)
+    result = {"left": _response_summary(old), "right": _response_summary(new), "body_format": body_format}
+    result.update(changes.to_dict())
+    return result
+
+
+def diff_api(api, left_variables, right_variables, ignore_paths=(), array_key=None, compare_headers=True,
+             backend=None, max_changes=DIFF_MAX_CHANGES):
+    """同一接口分别用两组环境变量请求（两侧同时发出）后对比响应；请求出错抛出 DiffError"""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(execute_request, api["url"], api["method"], api.get("params"), api.get("headers"),
+                               variables, backend) for variables in (left_variables, right_variables)]
+        results = []
+        for side, future in zip(("左侧", "右侧"), futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                raise DiffError(f"{side}请求失败：{describe_request_error(e)}")
+    return diff_responses(results[0], results[1], ignore_paths, array_key, compare_headers, max_changes)
+
+
+# ------------------------------ 查询结果对比 ------------------------------
+class _RowSpool:
+    """
+    一侧的行：按主键哈希分到 partitions 个分区，每行保存为 (主键JSON, 整行JSON)
+    缓存行数达到 memory_rows 后把全部分区追加写入临时文件，之后的行继续缓存
+    """
+    def __init__(self, name, workdir, partitions, memory_rows):
+        self.name = name
+        self.workdir = workdir
+        self.partitions = partitions
+        self.memory_rows = memory_rows
+        self.buffers = [[] for _ in range(partitions)]
+        self.buffered = 0
+        self.spilled = False
+
+    def add(self, key_text, row_text):
+        self.buffers[zlib.crc32(key_text.encode("utf-8")) % self.partitions].append((key_text, row_text))
+        self.buffered += 1
+        if self.buffered >= self.memory_rows:
+            self.flush()
+
+    def _path(self, index):
+        return os.path.join(self.workdir(), f"{self.name}_{index}.jsonl")
+
+    def flush(self):
+        # 主键和整行都是JSON文本（不含换行和制表符），一行一条
+        for index, buffer in enumerate(self.buffers):
+            if buffer:
+                with open(self._path(index), "a", encoding="utf-8") as f:
+                    f.writelines(f"{key_text}\t{row_text}\n" for key_text, row_text in buffer)
+                buffer.clear()
+        self.buffered = 0
+        self.spilled = True
+
+    def partition(self, index):
+        """逐条生成一个分区的 (主键JSON, 整行JSON)"""
+        if self.spilled and os.path.exists(self._path(index)):
+            with open(self._path(index), "r", encoding="utf-8") as f:
+                for line in f:
+                    key_text, _, row_text = line.rstrip("\n").partition("\t")
+                    yield key_text, row_text
+        yield from self.buffers[index]
+
+
+def _align_columns(left_columns, right_columns, key_columns):
+    """两侧共有的列（按左侧顺序）与各自独有的列；主键列不存在时抛出 DiffError"""
+    common = [column for column in left_columns if column in right_columns]
+    for column in key_columns:
+        if column not in common:
+            raise DiffError(f"主键列「{column}」不在两侧共有的列中")
+    return common
+
+
+def _first_batch(batches, side):
+    """取出第一批（得到列名），返回 (列名列表, 包含第一批在内的全部批次)"""
+    batches = iter(batches)
+    try:
+        columns, rows = next(batches)
+    except StopIteration:
+        raise DiffError(f"{side}查询没有返回结果集")
+
+    def chained():
+        yield columns, rows
+        yield from batches
+    return list(columns), chained()
+
+
+def diff_row_batches(left_batches, right_batches, key_columns=(), max_changes=DIFF_MAX_CHANGES,
+                     memory_rows=DIFF_MEMORY_ROWS, partitions=DIFF_PARTITIONS, on_progress=None, should_stop=None):
+    """
+    对比两个结果集（left_batches / right_batches 生成 (列名列表, 行列表)，如 db_dao.iter_query 的结果）
+    key_columns：主键列，按主键对齐后对比其余列；为空时整行作为主键，只统计新增/删除的行（重复行按次数计）
+    只对比两侧共有的列；值按JSON文本比较（Decimal、日期等转为字符串）
+    on_progress(已读取行数)：每批读完回调；should_stop()：返回 True 时取消
+    返回 {columns, left_only_columns, right_only_columns, key_columns, left_rows, right_rows, unchanged,
+          duplicate_keys, spilled, elapsed_ms, changes, counts, total, truncated}
+    变化的行：{type: changed, key: {主键列: 值}, columns: {列: [旧值, 新值]}}；新增/删除的行：{type, key, row}
+    """
+    start = time.perf_counter()
+    key_columns = list(key_columns or ())
+    sources = (left_batches, right_batches)
+    tempdir = None
+
+    def workdir():
+        nonlocal tempdir
+        if tempdir is None:
+            tempdir = tempfile.TemporaryDirectory(prefix="diff_")
+        return tempdir.name
+
+    try:
+        left_columns, left_batches = _first_batch(left_batches, "左侧")
+        right_columns, right_batches = _first_batch(right_batches, "右侧")
+        columns = _align_columns(left_columns, right_columns, key_columns)
+        key_indexes = [columns.index(column) for column in key_columns]
+
+        # 两侧各占一半的内存配额；先读完两侧并分区，再逐个分区对比
+        # 两侧交替逐批读取：流式查询在服务端等待读取，一侧长时间不读会超过 net_write_timeout 而断开
+        spools = [_RowSpool(name, workdir, partitions, max(memory_rows // 2, 1)) for name in ("left", "right")]
+        indexes = [[side_columns.index(column) for column in columns] for side_columns in (left_columns, right_columns)]
+        streams = [iter(left_batches), iter(right_batches)]
+        counts = [0, 0]
+        read = 0
+        active = [0, 1]
+        while active:
+            for side in list(active):
+                if should_stop and should_stop():
+                    raise DiffCancelled("对比已取消")
+                try:
+                    _, rows = next(streams[side])
+                except StopIteration:
+                    active.remove(side)
+                    continue
+                spool, side_indexes = spools[side], indexes[side]
+                for row in rows:
+                    values = [row[i] for i in side_indexes]
+                    row_text = dumps(values)
+                    spool.add(dumps([values[i] for i in key_indexes]) if key_columns else row_text, row_text)
+                counts[side] += len(rows)
+                read += len(rows)
+                if on_progress:
+                    on_progress(read)
+
+        changes = ChangeList(max_changes)
+
+        def report(change_type, key_text, old_text, new_text):
+            # 明细已满时只计数，不再解析行内容
+            if changes.full:
+                changes.counts[change_type] += 1
+            else:
+                changes.add(change_type, **_row_change(key_text, old_text, new_text, columns, key_columns))
+
+        unchanged = 0
+        duplicate_keys = [0, 0]
+        for index in range(partitions):
+            if should_stop and should_stop():
+                raise DiffCancelled("对比已取消")
+            # 左侧分区载入内存：主键 -> 整行；主键重复的行另存，按出现顺序与右侧配对
+            left = {}
+            extra = {}
+            for key_text, row_text in spools[0].partition(index):
+                if key_text in left:
+                    extra.setdefault(key_text, []).append(row_text)
+                    duplicate_keys[0] += bool(key_columns)
+                else:
+                    left[key_text] = row_text
+            seen_right = set() if key_columns else None
+            for key_text, row_text in spools[1].partition(index):
+                if seen_right is not None:
+                    if key_text in seen_right:
+                        duplicate_keys[1] += 1
+                    seen_right.add(key_text)
+                old_text = left.pop(key_text, None)
+                if old_text is None:
+                    report(ADDED, key_text, None, row_text)
+                    continue
+                if key_text in extra:
+                    left[key_text] = extra[key_text].pop(0)
+                    if not extra[key_text]:
+                        del extra[key_text]
+                if old_text == row_text:
+                    unchanged += 1
+                else:
+                    report(CHANGED, key_text, old_text, row_text)
+            for key_text, row_text in left.items():
+                report(REMOVED, key_text, row_text, None)
+                for row_text in extra.get(key_text, ()):
+                    report(REMOVED, key_text, row_text, None)
+    finally:
+        # 提前结束时关闭生成器，释放数据库连接
+        for batches in sources:
+            if hasattr(batches, "close"):
+                batches.close()
+        if tempdir is not None:
+            tempdir.cleanup()
+
+    result = {
+        "columns": columns,
+        "left_only_columns": [column for column in left_columns if column not in columns],
+        "right_only_columns": [column for column in right_columns if column not in columns],
+        "key_columns": key_columns,
+        "left_rows": counts[0],
+        "right_rows": counts[1],
+        "unchanged": unchanged,
+        "duplicate_keys": duplicate_keys,
+        "spilled": tempdir is not None,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+    result.update(changes.to_dict())
+    return result
+
+
+def _row_change(key_text, old_text, new_text, columns, key_columns):
+    """差异明细：变化的行只保留有变化的列"""
+    old = loads(old_text) if old_text is not None else None
+    new = loads(new_text) if new_text is not None else None
+    row = old if old is not None else new
+    if key_columns:
+        key = dict(zip(key_columns, loads(key_text)))
+    else:
+        key = {}
+    if old is None or new is None:
+        return {"key": key, "row": dict(zip(columns, row))}
+    return {"key": key, "columns": {column: [a, b] for column, a, b in zip(columns, old, new) if a != b}}
+
+
+def diff_queries(left, right, key_columns=(), variables=None, **kwargs):
+    """
+    对比两个查询的结果集（left / right：{db_name, sql, connection_id}，可以是不同连接、不同库）
+    其余参数同 diff_row_batches；查询出错直接抛出异常
+    """
+    from db.dao import db_dao
+    return diff_row_batches(
+        db_dao.iter_query(left["db_name"], left["sql"], variables, left.get("connection_id")),
+        db_dao.iter_query(right["db_name"], right["sql"], variables, right.get("connection_id")),
+        key_columns, **kwargs)
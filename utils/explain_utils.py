@@ -0,0 +1,122 @@
+"""解析 MySQL EXPLAIN FORMAT=JSON 执行计划，标记全表扫描、缺失索引等问题"""
+
+# 预估扫描行数超过该值时提示
+ROWS_WARNING_THRESHOLD = 10000
+
+# 计划节点中展示的标量字段（按顺序）
+DETAIL_FIELDS = [
+    "table_name", "access_type", "possible_keys", "key", "used_key_parts", "key_length", "ref",
+    "rows_examined_per_scan", "rows_produced_per_join", "filtered", "using_index", "using_filesort",
+    "using_temporary_table", "using_join_buffer", "attached_condition", "select_id", "message"
+]
+COST_FIELDS = ["query_cost", "read_cost", "eval_cost", "prefix_cost", "sort_cost", "data_read_per_join"]
+
+# 节点名称对应的中文说明
+NODE_LABELS = {
+    "query_block": "查询块",
+    "table": "表",
+    "nested_loop": "嵌套循环连接",
+    "ordering_operation": "排序",
+    "grouping_operation": "分组",
+    "duplicates_removal": "去重",
+    "union_result": "UNION结果",
+    "query_specifications": "UNION子查询",
+    "materialized_from_subquery": "派生表（物化子查询）",
+    "attached_subqueries": "关联子查询",
+    "optimized_away_subqueries": "已优化子查询",
+    "windowing": "窗口函数",
+    "buffer_result": "结果缓冲"
+}
+
+
+def _warnings(key, value):
+    """节点上的问题提示"""
+    warnings = []
+    if key != "table":
+        if value.get("using_filesort"):
+            warnings.append("使用文件排序（filesort）")
+        if value.get("using_temporary_table"):
+            warnings.append("使用临时表")
+        return warnings
+    access_type = value.get("access_type")
+    rows = value.get("rows_examined_per_scan") or 0
+    if access_type == "ALL":
+        warnings.append("全表扫描")
+        if not value.get("possible_keys"):
+            warnings.append("没有可用索引")
+    elif access_type == "index":
+        warnings.append("全索引扫描")
+    if value.get("possible_keys") and not value.get("key"):
+        warnings.append("有候选索引但未使用")
+    if rows >= ROWS_WARNING_THRESHOLD:
+        warnings.append(f"预估扫描 {rows} 行")
+    if value.get("using_join_buffer"):
+        warnings.append(f"连接缓冲（{value['using_join_buffer']}），连接列可能缺少索引")
+    return warnings
+
+
+def _label(key, value):
+    label = NODE_LABELS.get(key, key)
+    if key == "table" and value.get("table_name"):
+        return f"{label}：{value['table_name']}"
+    if key == "query_block" and value.get("select_id") is not None:
+        return f"{label} #{value['select_id']}"
+    return label
+
+
+def _walk(key, value):
+    node = {"label": _label(key, value), "details": {}, "warnings": _warnings(key, value), "children": []}
+    for field in DETAIL_FIELDS:
+        if field in value and field != "table_name":
+            node["details"][field] = value[field]
+    for field in COST_FIELDS:
+        if field in value.get("cost_info", {}):
+            node["details"][field] = value["cost_info"][field]
+    for child_key, child in value.items():
+        if child_key == "cost_info":
+            continue
+        if isinstance(child, dict):
+            node["children"].append(_walk(child_key, child))
+        elif isinstance(child, list):
+            for item in child:
+                if isinstance(item, dict):
+                    # nested_loop 等数组元素通常是 {"table": {...}}，直接展开
+                    if len(item) == 1 and isinstance(next(iter(item.values())), dict):
+                        item_key, item_value = next(iter(item.items()))
+                        node["children"].append(_walk(item_key, item_value))
+                    else:
+                        node["children"].append(_walk(child_key, item))
+    return node
+
+
+def build_plan_tree(plan):
+    """EXPLAIN FORMAT=JSON 结果 -> 树节点 {label, details, warnings, children}"""
+    if not isinstance(plan, dict):
+        return None
+    key, value = next(iter(plan.items())) if len(plan) == 1 else ("query_block", plan)
+    return _walk(key, value)
+
+
+def summarize_plan(tree):
+    """汇总：查询成本、各表预估扫描行数、所有问题提示"""
+    summary = {"query_cost": None, "tables": [], "warnings": []}
+
+    def visit(node):
+        details = node["details"]
+        if summary["query_cost"] is None and "query_cost" in details:
+            summary["query_cost"] = details["query_cost"]
+        if node["label"].startswith(NODE_LABELS["table"] + "："):
+            summary["tables"].append({
+                "table": node["label"].split("：", 1)[1],
+                "access_type": details.get("access_type"),
+                "key": details.get("key"),
+                "rows": details.get("rows_examined_per_scan")
+            })
+        for warning in node["warnings"]:
+            summary["warnings"].append(f"[{node['label']}] {warning}")
+        for child in node["children"]:
+            visit(child)
+
+    if tree:
+        visit(tree)
+    return summary
@@ -0,0 +1,234 @@
+import csv
+import datetime
+import decimal
+import os
+import time
+
+from utils.lazy_import import lazy_import
+
+# 可选依赖：openpyxl（XLSX，只写模式流式写入）、pyarrow（Parquet），未安装时不提供对应格式
+# 两者导入都较慢，真正导出时才导入
+openpyxl = lazy_import("openpyxl", optional=True)
+pyarrow = lazy_import("pyarrow", optional=True)
+parquet = lazy_import("pyarrow.parquet") if pyarrow is not None else None
+
+# XLSX 单个工作表最大行数（含表头），超出后自动新建工作表
+XLSX_MAX_ROWS = 1048576
+
+
+class ExportError(Exception):
+    """导出失败"""
+
+
+class ExportCancelled(Exception):
+    """导出被取消"""
+
+
+class CsvWriter:
+    """CSV（UTF-8 BOM，Excel 直接打开不乱码）"""
+    def __init__(self, path, columns):
+        self.file = open(path, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxWriter:
+    """XLSX（openpyxl write_only 模式，逐行写入不保留单元格对象）"""
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+        self.new_sheet()
+
+    def new_sheet(self):
+        index = len(self.workbook.worksheets) + 1
+        self.sheet = self.workbook.create_sheet(f"Sheet{index}")
+        self.sheet.append(self.columns)
+        self.sheet_rows = 1
+
+    def write(self, rows):
+        for row in rows:
+            if self.sheet_rows >= XLSX_MAX_ROWS:
+                self.new_sheet()
+            self.sheet.append([_xlsx_value(value) for value in row])
+            self.sheet_rows += 1
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+def _xlsx_value(value):
+    """openpyxl 不支持的类型转为字符串"""
+    if value is None or isinstance(value, (str, int, float, decimal.Decimal, datetime.date, datetime.time)):
+        return value
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def _text_value(value):
+    """写入字符串列的值（二进制转十六进制，其余类型转字符串）"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def _mysql_arrow_type(desc):
+    """
+    MySQL 列类型（cursor.description 中的一项）对应的 Arrow 类型
+    字符串与二进制共用类型码（BLOB/VAR_STRING 等），无法从类型码区分，返回 None
+    """
+    from pymysql.constants import FIELD_TYPE
+    type_code, length, scale = desc[1], desc[3] or 0, desc[5] or 0
+    if type_code in (FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.INT24, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG,
+                     FIELD_TYPE.YEAR):
+        return pyarrow.int64()
+    if type_code in (FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE):
+        return pyarrow.float64()
+    if type_code in (FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL):
+        # 列长度含符号位和小数点，不小于精度；按最大精度38存储，超出 decimal128 范围时转为字符串
+        if length - (1 if scale else 0) <= 38:
+            return pyarrow.decimal128(38, scale)
+        return pyarrow.string()
+    if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+        return pyarrow.date32()
+    if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+        return pyarrow.timestamp("us")
+    if type_code == FIELD_TYPE.TIME:
+        return pyarrow.duration("us")
+    if type_code in (FIELD_TYPE.JSON, FIELD_TYPE.ENUM, FIELD_TYPE.SET, FIELD_TYPE.VARCHAR):
+        return pyarrow.string()
+    return None
+
+
+class ParquetWriter:
+    """
+    Parquet（pyarrow，每批写入一个 row group）
+    列类型按 MySQL 列类型确定（columns 带 description 时，如 db_dao.iter_query 的结果），与数据中是否出现空值无关；
+    没有列类型信息时由第一批数据推断，全空列按字符串处理，DECIMAL 按最大精度存储
+    """
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.description = getattr(columns, "description", None)
+        self.schema = None
+        self.writer = None
+
+    def _column_type(self, index, values):
+        arrow_type = _mysql_arrow_type(self.description[index]) if self.description else None
+        if arrow_type is not None:
+            return arrow_type
+        if self.description:
+            # 字符串/二进制列：出现二进制值时按二进制保存
+            return pyarrow.binary() if any(isinstance(v, bytes) for v in values) else pyarrow.string()
+        inferred = pyarrow.array(values).type
+        if pyarrow.types.is_null(inferred):
+            return pyarrow.string()
+        if pyarrow.types.is_decimal(inferred):
+            # 后面批次的数值可能更大，不使用第一批推断出的精度
+            return pyarrow.decimal128(38, inferred.scale)
+        return inferred
+
+    def _open(self, values_by_column):
+        self.schema = pyarrow.schema([pyarrow.field(name, self._column_type(i, values))
+                                      for i, (name, values) in enumerate(zip(self.columns, values_by_column))])
+        self.writer = parquet.ParquetWriter(self.path, self.schema)
+
+    def write(self, rows):
+        if not rows:
+            return
+        values_by_column = list(zip(*rows))
+        if self.schema is None:
+            self._open(values_by_column)
+        arrays = []
+        for field, values in zip(self.schema, values_by_column):
+            if pyarrow.types.is_string(field.type):
+                values = [_text_value(value) for value in values]
+            try:
+                arrays.append(pyarrow.array(values, type=field.type))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, OverflowError) as e:
+                raise ExportError(f"列「{field.name}」的值无法按 {field.type} 类型写入：{e}")
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.writer is None:
+            # 没有数据时也写出只有列名的文件
+            self._open([() for _ in self.columns])
+        self.writer.close()
+
+
+# 格式 -> (说明, 扩展名, 写入器, 依赖是否可用)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", CsvWriter, True),
+    "xlsx": ("Excel", ".xlsx", XlsxWriter, openpyxl is not None),
+    "parquet": ("Parquet", ".parquet", ParquetWriter, pyarrow is not None)
+}
+
+
+def available_formats():
+    """当前环境可用的导出格式"""
+    return [fmt for fmt, (_, _, _, available) in EXPORT_FORMATS.items() if available]
+
+
+def format_for_path(path):
+    """按扩展名判断导出格式"""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, (_, fmt_ext, _, _) in EXPORT_FORMATS.items():
+        if ext == fmt_ext:
+            return fmt
+    return None
+
+
+def export_batches(batches, path, fmt=None, on_progress=None, should_stop=None):
+    """
+    逐批写入文件（batches 生成 (列名列表, 行列表)，如 db_dao.iter_query 的结果）
+    on_progress(已写入行数)：每批写完回调；should_stop()：返回 True 时取消
+    失败或取消时删除未写完的文件；返回 {path, format, rows, elapsed_ms}
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"不支持的导出格式：{fmt or os.path.splitext(path)[1]}")
+    label, _, writer_class, available = EXPORT_FORMATS[fmt]
+    if not available:
+        raise ExportError(f"导出{label}需要安装可选依赖：{'openpyxl' if fmt == 'xlsx' else 'pyarrow'}")
+    start = time.perf_counter()
+    writer = None
+    total = 0
+    try:
+        for columns, rows in batches:
+            if should_stop and should_stop():
+                raise ExportCancelled("导出已取消")
+            if writer is None:
+                writer = writer_class(path, columns)
+            writer.write(rows)
+            total += len(rows)
+            if on_progress:
+                on_progress(total)
+        if writer is None:
+            raise ExportError("查询没有返回结果集")
+        writer.close()
+        writer = None
+    except BaseException:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        # 提前结束时关闭生成器，释放数据库连接
+        if hasattr(batches, "close"):
+            batches.close()
+    return {"path": path, "format": fmt, "rows": total, "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)}
@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+from utils.json_utils import JsonBody
+
+# JSONPath 子集：$.a.b、$['a']、$.list[0]、$.list[-1]、$.list[*]、$.*、$..key
+_TOKEN_PATTERN = re.compile(
+    r"\.\.(?P<deep>[^.\[\]]+|\*)"
+    r"|\.(?P<key>[^.\[\]]+)"
+    r"|\[\s*(?P<index>-?\d+)\s*\]"
+    r"|\[\s*(?P<quoted>'[^']*'|\"[^\"]*\")\s*\]"
+    r"|\[\s*\*\s*\]"
+)
+
+_MISSING = object()
+
+
+class JsonPath:
+    """预编译的JSONPath（只解析一次）"""
+    __slots__ = ("expr", "steps")
+
+    def __init__(self, expr):
+        self.expr = expr
+        if not expr.startswith("$"):
+            raise ValueError(f"JSONPath必须以$开头：{expr}")
+        # steps：[(类型, 值)]，类型为 key / index / wildcard / deep
+        self.steps = []
+        pos = 1
+        while pos < len(expr):
+            match = _TOKEN_PATTERN.match(expr, pos)
+            if not match:
+                raise ValueError(f"无法解析的JSONPath：{expr}（位置 {pos}）")
+            if match.group("deep") is not None:
+                self.steps.append(("deep", match.group("deep")))
+            elif match.group("key") is not None:
+                key = match.group("key")
+                self.steps.append(("wildcard", None) if key == "*" else ("key", key))
+            elif match.group("index") is not None:
+                self.steps.append(("index", int(match.group("index"))))
+            elif match.group("quoted") is not None:
+                self.steps.append(("key", match.group("quoted")[1:-1]))
+            else:
+                self.steps.append(("wildcard", None))
+            pos = match.end()
+
+    def find_all(self, data):
+        """返回所有匹配值"""
+        nodes = [data]
+        for kind, value in self.steps:
+            matched = []
+            for node in nodes:
+                if kind == "key":
+                    if isinstance(node, dict) and value in node:
+                        matched.append(node[value])
+                elif kind == "index":
+                    if isinstance(node, list) and -len(node) <= value < len(node):
+                        matched.append(node[value])
+                elif kind == "wildcard":
+                    if isinstance(node, dict):
+                        matched.extend(node.values())
+                    elif isinstance(node, list):
+                        matched.extend(node)
+                else:
+                    matched.extend(_descend(node, value))
+            nodes = matched
+            if not nodes:
+                break
+        return nodes
+
+    def find_first(self, data, default=None):
+        """返回第一个匹配值（无匹配返回default）"""
+        values = self.find_all(data)
+        return values[0] if values else default
+
+
+def _descend(node, key):
+    """递归下降（..key），按文档顺序返回所有匹配"""
+    stack = [node]
+    result = []
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key == "*":
+                result.extend(current.values())
+            elif key in current:
+                result.append(current[key])
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            if key == "*":
+                result.extend(current)
+            stack.extend(reversed(current))
+    return result
+
+
+@lru_cache(maxsize=1024)
+def compile_json_path(expr):
+    """编译JSONPath（按表达式缓存）"""
+    return JsonPath(expr.strip())
+
+
+class Extractor:
+    """响应提取器：$开头为JSONPath，re:开头为正则，header:开头为响应头，status为状态码"""
+    __slots__ = ("expr", "kind", "target")
+
+    def __init__(self, expr):
+        self.expr = expr
+        expr = expr.strip()
+        if expr.startswith("$"):
+            self.kind, self.target = "json", compile_json_path(expr)
+        elif expr.startswith("re:"):
+            try:
+                self.kind, self.target = "regex", re.compile(expr[3:], re.S)
+            except re.error as e:
+                raise ValueError(f"无效的正则表达式：{expr}（{e}）")
+        elif expr.startswith("header:"):
+            self.kind, self.target = "header", expr[7:].strip().lower()
+        elif expr == "status":
+            self.kind, self.target = "status", None
+        else:
+            raise ValueError(f"不支持的提取表达式：{expr}")
+
+    def extract(self, result, parsed_body=_MISSING):
+        """从send_request结果中提取值（parsed_body：已解析的响应体，避免重复解析）"""
+        if self.kind == "status":
+            return result.get("status_code")
+        if self.kind == "header":
+            for name, value in (result.get("headers") or {}).items():
+                if name.lower() == self.target:
+                    return value
+            return None
+        if self.kind == "regex":
+            match = self.target.search(result.get("text") or "")
+            if not match:
+                return None
+            return match.group(1) if match.groups() else match.group(0)
+        if parsed_body is _MISSING:
+            parsed_body = parse_body(result)
+        return self.target.find_first(parsed_body) if parsed_body is not None else None
+
+
+@lru_cache(maxsize=1024)
+def compile_extractor(expr):
+    """编译提取表达式（按表达式缓存）"""
+    return Extractor(expr)
+
+
+def parse_body(result):
+    """解析响应体JSON（非JSON返回None；优先复用结果中已解析的 body）"""
+    body = result.get("body")
+    if body is None:
+        body = JsonBody(result.get("text"))
+        result["body"] = body
+    return body.data
+
+
+def extract_variables(result, extract_rules):
+    """按规则 {变量名: 表达式} 提取变量，响应体只解析一次"""
+    if not extract_rules:
+        return {}
+    extractors = {name: compile_extractor(expr) for name, expr in extract_rules.items()}
+    parsed_body = _MISSING
+    if any(e.kind == "json" for e in extractors.values()):
+        parsed_body = parse_body(result)
+    return {name: e.extract(result, parsed_body) for name, e in extractors.items()}
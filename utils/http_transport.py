@@ -0,0 +1,239 @@
+import asyncio
+import functools
+import sys
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from config import HTTP_BACKEND, HTTP2_ENABLED, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, REQUEST_TIMEOUT
+from utils.lazy_import import lazy_import
+from utils.metrics_utils import begin_phases, add_phase, end_phases
+
+# 各后端的依赖在第一次发送请求时才导入（缩短启动时间）
+requests = lazy_import("requests")
+httpx = lazy_import("httpx", optional=True)
+h2 = lazy_import("h2", optional=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_adapter_class():
+    """
+    requests 的 HTTPAdapter 子类：连接池使用带计时的连接类，只影响挂载了它的 Session（不修改 urllib3 的全局模块）
+    connect 统计新建连接的耗时（DNS + TCP + TLS握手，与 httpx 后端一样不单独区分DNS）
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def timed(connection_cls):
+        class TimedConnection(connection_cls):
+            def connect(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return super().connect(*args, **kwargs)
+                finally:
+                    add_phase("connect", (time.perf_counter() - start) * 1000)
+        TimedConnection.__name__ = f"Timed{connection_cls.__name__}"
+        return TimedConnection
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = timed(HTTPConnection)
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = timed(HTTPSConnection)
+
+    class TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                       "https": TimedHTTPSConnectionPool}
+
+    return TimedHTTPAdapter
+
+
+class RequestsTransport:
+    """
+    requests 后端（阻塞，一个请求占用一个线程）：每个线程一个 Session 复用连接
+    Session 不保存 Cookie，与每次独立请求的行为一致（响应设置的 Cookie 不会带到后续请求）
+    """
+    name = "requests"
+    is_async = False
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            # 新建连接耗时只在本 Session 的连接池里打点
+            adapter_cls = _timed_adapter_class()
+            session.mount("http://", adapter_cls())
+            session.mount("https://", adapter_cls())
+            self._local.session = session
+        return session
+
+    def send(self, method, url, headers, body):
+        """发送请求，返回响应与各阶段耗时（body：params/json/data 之一）"""
+        begin_phases()
+        start = time.perf_counter()
+        try:
+            # stream=True：先拿到响应头（TTFB），再单独统计下载耗时
+            response = self._session().request(method, url, headers=headers, timeout=self.timeout,
+                                               stream=True, **body)
+            headers_at = time.perf_counter()
+            response.content  # 读取响应体
+            done_at = time.perf_counter()
+        finally:
+            phases = end_phases()
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "text": response.text,
+            "encoding": response.encoding,
+            "http_version": "HTTP/1.0" if getattr(response.raw, "version", 11) == 10 else "HTTP/1.1",
+            "dns": 0,
+            "connect": phases.get("connect", 0),
+            "headers_ms": (headers_at - start) * 1000,
+            "download_ms": (done_at - headers_at) * 1000
+        }
+
+
+class HttpxTransport:
+    """
+    httpx 异步后端：所有请求在一个事件循环线程中并发（协程而非线程），连接池有上限，启用HTTP/2时同一连接多路复用
+    同步调用 send() 时提交到事件循环并等待；批量场景用 submit() 拿到 Future，不额外占用线程
+    """
+    name = "httpx"
+    is_async = True
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, http2=HTTP2_ENABLED, max_connections=HTTP_MAX_CONNECTIONS,
+                 max_keepalive=HTTP_MAX_KEEPALIVE):
+        if httpx is None:
+            raise ValueError("httpx 后端需要安装可选依赖：httpx（HTTP/2 另需 h2）")
+        self.timeout = timeout
+        # 未安装 h2 时退回 HTTP/1.1
+        self.http2 = http2 and h2 is not None
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        """启动事件循环线程（守护线程，首次使用时创建）"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="http-event-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_client(self):
+        # 只在事件循环线程中调用，无需加锁
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                # 排队等待连接不计超时：大批量请求时由连接池上限控制并发
+                timeout=httpx.Timeout(self.timeout, pool=None),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_keepalive))
+        return self._client
+
+    async def send_async(self, method, url, headers, body):
+        """在事件循环中发送请求（协程）"""
+        events = {}
+
+        async def trace(event_name, info):
+            events[event_name] = time.perf_counter()
+
+        body = dict(body)
+        if isinstance(body.get("data"), (str, bytes)):
+            data = body.pop("data")
+            body["content"] = data.encode("utf-8") if isinstance(data, str) else data
+        client = self._get_client()
+        start = time.perf_counter()
+        request = client.build_request(method, url, headers=headers, extensions={"trace": trace}, **body)
+        response = await client.send(request, stream=True)
+        headers_at = time.perf_counter()
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        done_at = time.perf_counter()
+
+        # 新建连接时：TCP建连（含DNS，httpx 不单独区分）到 TLS 握手完成
+        connect = 0
+        connect_start = events.get("connection.connect_tcp.started")
+        connect_end = events.get("connection.start_tls.complete") or events.get("connection.connect_tcp.complete")
+        if connect_start and connect_end:
+            connect = (connect_end - connect_start) * 1000
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "text": response.text,
+            "encoding": response.encoding,
+            "http_version": response.http_version,
+            "dns": 0,
+            "connect": connect,
+            "headers_ms": (headers_at - start) * 1000,
+            "download_ms": (done_at - headers_at) * 1000
+        }
+
+    def submit(self, coro):
+        """把协程提交到事件循环线程，返回 concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def send(self, method, url, headers, body):
+        return self.submit(self.send_async(method, url, headers, body)).result()
+
+    def close(self):
+        """关闭连接池并停止事件循环"""
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop = self._client = None
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+TRANSPORTS = {"requests": RequestsTransport, "httpx": HttpxTransport}
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(backend=None):
+    """按名称获取HTTP后端（默认 config.HTTP_BACKEND，每种后端一个共享实例）"""
+    backend = backend or HTTP_BACKEND
+    if backend not in TRANSPORTS:
+        raise ValueError(f"未知的HTTP后端：{backend}（可选：{', '.join(TRANSPORTS)}）")
+    with _transports_lock:
+        transport = _transports.get(backend)
+        if transport is None:
+            transport = _transports[backend] = TRANSPORTS[backend]()
+        return transport
+
+
+def available_backends():
+    """当前环境可用的HTTP后端"""
+    return [name for name in TRANSPORTS if name != "httpx" or httpx is not None]
+
+
+def classify_error(e):
+    """请求异常分类："timeout" / "connection" / None（只检查已导入的后端，不为判断异常而导入）"""
+    requests_module = sys.modules.get("requests")
+    if requests_module is not None:
+        if isinstance(e, requests_module.exceptions.Timeout):
+            return "timeout"
+        if isinstance(e, requests_module.exceptions.ConnectionError):
+            return "connection"
+    httpx_module = sys.modules.get("httpx")
+    if httpx_module is not None:
+        if isinstance(e, httpx_module.TimeoutException):
+            return "timeout"
+        if isinstance(e, httpx_module.NetworkError):
+            return "connection"
+    return None
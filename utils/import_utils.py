@@ -0,0 +1,319 @@
+import base64
+import re
+import shlex
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+from db.dao import db_dao
+from utils.json_utils import loads, dumps
+from utils.lazy_import import lazy_import
+from utils.notify_utils import notify_bus, ERROR
+
+# 可选依赖：ijson（流式解析JSON，HAR文件再大内存占用也基本不变），未安装时整文件解析
+ijson = lazy_import("ijson", optional=True)
+
+# 导入时每解析多少条回调一次进度
+PROGRESS_INTERVAL = 500
+# 接口名称最大长度（与 api_info.name 一致）
+NAME_MAX_LENGTH = 100
+# api_info 其余列的长度上限：url VARCHAR(500)、method VARCHAR(20)、params/headers TEXT（按字节计）
+URL_MAX_LENGTH = 500
+METHOD_MAX_LENGTH = 20
+TEXT_MAX_BYTES = 65535
+
+# HAR 中的接口请求类型（其余为图片/脚本/样式等静态资源）
+API_RESOURCE_TYPES = ("xhr", "fetch", "document", "other")
+API_MIME_KEYWORDS = ("json", "xml", "text/plain", "form", "html")
+# 不保存的请求头：HTTP/2 伪头、由客户端自动生成的头
+SKIP_HEADERS = {"host", "content-length", "connection", "accept-encoding", "transfer-encoding"}
+# cURL 中带参数但与请求内容无关的选项（跳过其参数）
+CURL_IGNORED_WITH_ARG = {"-o", "--output", "-m", "--max-time", "--connect-timeout", "-x", "--proxy",
+                         "--retry", "-w", "--write-out", "-T", "--upload-file", "-E", "--cert", "--cacert",
+                         "-K", "--config", "-r", "--range", "--resolve", "-F", "--form"}
+CURL_DATA_OPTIONS = {"-d", "--data", "--data-raw", "--data-binary", "--data-ascii", "--data-urlencode"}
+
+
+class ApiImportError(Exception):
+    """导入文件/命令格式错误"""
+
+
+# ------------------------------ HAR ------------------------------
+def iter_har_entries(path):
+    """逐条读取 HAR 文件中的 log.entries（安装了 ijson 时流式解析）"""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "log.entries.item")
+            return
+        try:
+            content = loads(f.read())
+        except ValueError as e:
+            raise ApiImportError(f"HAR文件不是有效的JSON：{e}")
+    entries = (content.get("log") or {}).get("entries") if isinstance(content, dict) else None
+    if not isinstance(entries, list):
+        raise ApiImportError("HAR文件缺少 log.entries")
+    yield from entries
+
+
+def is_api_entry(entry):
+    """是否为接口请求（按浏览器记录的资源类型，没有时按响应类型判断）"""
+    resource_type = entry.get("_resourceType") or entry.get("_resource_type")
+    if resource_type:
+        return resource_type.lower() in API_RESOURCE_TYPES
+    mime_type = ((entry.get("response") or {}).get("content") or {}).get("mimeType") or ""
+    return not mime_type or any(keyword in mime_type.lower() for keyword in API_MIME_KEYWORDS)
+
+
+def har_entry_to_api(entry):
+    """HAR 条目转接口数据 {name, url, method, params, headers}；无法转换时返回 None"""
+    request = entry.get("request") or {}
+    url = request.get("url") or ""
+    method = (request.get("method") or "GET").upper()
+    if not url.startswith(("http://", "https://")):
+        return None
+    headers = {}
+    for header in request.get("headers") or []:
+        headers[header.get("name", "")] = header.get("value", "")
+    post_data = request.get("postData") or {}
+    body = post_data.get("text")
+    if body is None and post_data.get("params"):
+        body = "&".join(f"{p.get('name', '')}={p.get('value', '')}" for p in post_data["params"])
+    try:
+        return build_api(method, url, headers, body, post_data.get("mimeType"))
+    except ApiImportError:
+        return None
+
+
+# ------------------------------ cURL ------------------------------
+_CURL_START = re.compile(r"(?m)^[ \t]*curl(?:\.exe)?\s")
+_ANSI_C_STRING = re.compile(r"\$'((?:[^'\\]|\\.)*)'", re.S)
+_ESCAPES = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.S)
+_SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0"}
+
+
+def _decode_ansi_c(match):
+    """bash 的 $'...' 字符串（Chrome「复制为cURL」会用到）转为普通单引号字符串"""
+    def unescape(m):
+        code = m.group(1)
+        if code[0] in "ux" and len(code) > 1:
+            return chr(int(code[1:], 16))
+        return _SIMPLE_ESCAPES.get(code, code)
+    return shlex.quote(_ESCAPES.sub(unescape, match.group(1)))
+
+
+def split_curl_commands(text):
+    """多条 cURL 命令文本按每个 curl 开头切分（命令内可以有跨行的引号内容）"""
+    starts = [m.start() for m in _CURL_START.finditer(text)]
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else len(text)
+        command = text[start:end].strip()
+        if command:
+            yield command
+
+
+def parse_curl(command):
+    """解析一条 cURL 命令（bash 或 Windows cmd 格式），返回接口数据；格式错误抛出 ApiImportError"""
+    if "^\"" in command or re.search(r"\^\r?\n", command):
+        # cmd 格式：^ 为转义符和续行符
+        command = re.sub(r"\^\r?\n", " ", command)
+        command = re.sub(r"\^(.)", r"\1", command)
+    else:
+        command = re.sub(r"\\\r?\n", " ", command)
+    command = _ANSI_C_STRING.sub(_decode_ansi_c, command)
+    try:
+        tokens = shlex.split(command)
+    except ValueError as e:
+        raise ApiImportError(f"cURL命令格式错误：{e}")
+    if not tokens or not tokens[0].lower().startswith("curl"):
+        raise ApiImportError("不是cURL命令")
+
+    url, method, headers, data, as_query = None, None, {}, [], False
+    data_type = None
+    args = iter(tokens[1:])
+    for token in args:
+        option, sep, inline = token.partition("=") if token.startswith("--") else (token, "", "")
+
+        def value():
+            # 参数可以写在 --data=xxx 中，也可以是下一个参数
+            return inline if sep else next(args, "")
+
+        if option in ("-X", "--request"):
+            method = value().upper()
+        elif option in ("-H", "--header"):
+            name, _, header_value = value().partition(":")
+            headers[name.strip()] = header_value.strip()
+        elif option in CURL_DATA_OPTIONS:
+            data.append(value())
+        elif option == "--json":
+            data.append(value())
+            data_type = "application/json"
+        elif option in ("-G", "--get"):
+            as_query = True
+        elif option in ("-u", "--user"):
+            headers["Authorization"] = "Basic " + base64.b64encode(value().encode("utf-8")).decode("ascii")
+        elif option in ("-b", "--cookie"):
+            headers["Cookie"] = value()
+        elif option in ("-A", "--user-agent"):
+            headers["User-Agent"] = value()
+        elif option in ("-e", "--referer"):
+            headers["Referer"] = value()
+        elif option == "--url":
+            url = value()
+        elif option in CURL_IGNORED_WITH_ARG:
+            value()
+        elif token.startswith("-X") and len(token) > 2:
+            method = token[2:].upper()
+        elif token.startswith("-H") and len(token) > 2:
+            name, _, header_value = token[2:].partition(":")
+            headers[name.strip()] = header_value.strip()
+        elif not token.startswith("-") and url is None:
+            url = token
+    if not url:
+        raise ApiImportError("cURL命令缺少URL")
+    if "://" not in url:
+        url = "http://" + url
+
+    body = "&".join(data) if data else None
+    if as_query and body:
+        separator = "&" if urlsplit(url).query else "?"
+        url, body = url + separator + body, None
+    method = method or ("POST" if body is not None else "GET")
+    return build_api(method, url, headers, body, data_type)
+
+
+# ------------------------------ 转换与去重 ------------------------------
+def build_api(method, url, headers, body=None, mime_type=None):
+    """
+    请求转为 api_info 的保存格式（与 execute_request 的发送方式对应）：
+    GET 的查询参数放入 params；JSON 请求体解析为对象并去掉 Content-Type（发送时自动按JSON提交）；
+    表单请求体转为对象并保留 Content-Type；其他请求体原样保存
+    超出 api_info 列长度的请求抛出 ApiImportError（不截断保存）
+    """
+    parts = urlsplit(url)
+    params = None
+    content_type = ""
+    clean_headers = {}
+    for name, value in headers.items():
+        lower = name.lower()
+        if not name or name.startswith(":") or lower in SKIP_HEADERS:
+            continue
+        if lower == "content-type":
+            content_type = value
+            continue
+        clean_headers[name] = value
+    content_type = content_type or mime_type or ""
+
+    if method == "GET" and parts.query:
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    elif body:
+        if "json" in content_type.lower() or (not content_type and body.lstrip()[:1] in ("{", "[")):
+            try:
+                params = loads(body)
+                content_type = ""
+            except ValueError:
+                params = body
+        elif "x-www-form-urlencoded" in content_type.lower():
+            params = dict(parse_qsl(body, keep_blank_values=True))
+        else:
+            params = body
+    if content_type:
+        clean_headers["Content-Type"] = content_type
+
+    path = urlsplit(url).path or "/"
+    api = {
+        "name": f"{method} {urlsplit(url).netloc}{path}"[:NAME_MAX_LENGTH],
+        "url": url,
+        "method": method,
+        "params": params if isinstance(params, str) else dumps(params or {}),
+        "headers": dumps(clean_headers)
+    }
+    check_api_length(api)
+    return api
+
+
+def check_api_length(api):
+    """检查接口数据是否超出 api_info 的列长度，超出时抛出 ApiImportError"""
+    if len(api["url"]) > URL_MAX_LENGTH:
+        raise ApiImportError(f"URL超过{URL_MAX_LENGTH}个字符")
+    if len(api["method"]) > METHOD_MAX_LENGTH:
+        raise ApiImportError(f"请求方法超过{METHOD_MAX_LENGTH}个字符")
+    for field, label in (("params", "请求参数"), ("headers", "请求头")):
+        if len(api[field].encode("utf-8")) > TEXT_MAX_BYTES:
+            raise ApiImportError(f"{label}超过{(TEXT_MAX_BYTES + 1) // 1024}KB")
+
+
+def dedupe_apis(apis):
+    """
+    去除重复请求（方法、URL、参数都相同），名称相同但内容不同时加序号区分
+    返回生成器，重复数量记录在 stats["duplicates"]
+    """
+    seen = set()
+    names = {}
+    stats = {"duplicates": 0}
+
+    def generate():
+        for api in apis:
+            key = (api["method"], api["url"], api["params"])
+            if key in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(key)
+            count = names.get(api["name"], 0) + 1
+            names[api["name"]] = count
+            if count > 1:
+                suffix = f" #{count}"
+                api["name"] = api["name"][:NAME_MAX_LENGTH - len(suffix)] + suffix
+            yield api
+    return generate(), stats
+
+
+def import_apis(path=None, text=None, api_only=True, on_progress=None):
+    """
+    从 HAR 文件或 cURL 命令（文件或粘贴的文本）批量导入接口：
+    边解析边去重，一个事务内批量插入，名称已存在的接口跳过
+    返回 {parsed, invalid, duplicates, inserted, skipped, elapsed_ms}
+    """
+    start = time.perf_counter()
+    stats = {"parsed": 0, "invalid": 0}
+
+    if path and path.lower().endswith(".har"):
+        def source():
+            for entry in iter_har_entries(path):
+                if not api_only or is_api_entry(entry):
+                    yield har_entry_to_api(entry)
+    else:
+        if path:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                text = f.read()
+
+        def source():
+            for command in split_curl_commands(text or ""):
+                try:
+                    yield parse_curl(command)
+                except ApiImportError:
+                    yield None
+
+    def parsed():
+        for api in source():
+            if api is None:
+                stats["invalid"] += 1
+                continue
+            stats["parsed"] += 1
+            if on_progress and stats["parsed"] % PROGRESS_INTERVAL == 0:
+                on_progress(stats["parsed"])
+            yield api
+
+    apis, dedupe_stats = dedupe_apis(parsed())
+    # 解析在写入过程中进行，解析错误同样由 DAO 以通知形式报告，这里收集后作为失败原因抛出
+    with notify_bus.capture() as notices:
+        inserted = db_dao.bulk_add_apis(apis)
+    if inserted is None:
+        raise ApiImportError("；".join(n.content for n in notices if n.level == ERROR) or "写入数据库失败")
+    unique = stats["parsed"] - dedupe_stats["duplicates"]
+    return {
+        "parsed": stats["parsed"],
+        "invalid": stats["invalid"],
+        "duplicates": dedupe_stats["duplicates"],
+        "inserted": inserted,
+        "skipped": unique - inserted,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
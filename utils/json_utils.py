@@ -0,0 +1,78 @@
+import json
+
+# 优先使用 orjson（C实现，解析/序列化快数倍），未安装时退回标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_UNSET = object()
+
+
+def loads(data):
+    """解析JSON（str/bytes）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, pretty=False):
+    """序列化为JSON字符串（保留中文；pretty=True 时缩进2格）"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(obj, option=option, default=str).decode("utf-8")
+        except TypeError:
+            # 超出64位的整数等 orjson 不支持的值，交给标准库
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None, default=str)
+
+
+def unwrap(value):
+    """兼容历史数据：旧版本会把JSON文本再次 json.dumps 成字符串保存，这里剥掉外层"""
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            return loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+class JsonBody:
+    """
+    响应体/大文本的惰性JSON包装：
+    第一次访问 data 时解析一次并缓存，pretty() 只在需要展示时才生成缩进文本
+    按原文解析，不做 unwrap（响应体本身就是JSON字符串时保持为字符串；unwrap 只用于读取数据库字段）
+    """
+    __slots__ = ("text", "_data", "_pretty")
+
+    def __init__(self, text):
+        self.text = text or ""
+        self._data = _UNSET
+        self._pretty = None
+
+    @property
+    def data(self):
+        """解析后的对象（非JSON时为None）"""
+        if self._data is _UNSET:
+            try:
+                self._data = loads(self.text)
+            except ValueError:
+                self._data = None
+        return self._data
+
+    @property
+    def is_json(self):
+        return self.data is not None
+
+    def pretty(self):
+        """格式化文本（非JSON原样返回）"""
+        if self._pretty is None:
+            self._pretty = dumps(self.data, pretty=True) if self.is_json else self.text
+        return self._pretty
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return self.text
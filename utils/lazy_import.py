@@ -0,0 +1,41 @@
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """模块代理：首次访问属性时才真正导入（requests/pymysql/pyarrow 等较重的依赖不拖慢启动）"""
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            # import_module 自带导入锁，多线程同时首次访问也只导入一次
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self):
+        state = "已导入" if self.__dict__["_module"] is not None else "未导入"
+        return f"<LazyModule {self.__dict__['_name']}（{state}）>"
+
+
+def lazy_import(name, optional=False):
+    """
+    延迟导入模块，返回代理对象
+    optional=True 时只检查模块是否已安装（不执行导入），未安装返回 None，与 try/except ImportError 的写法等价
+    """
+    if optional:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return None
+        except (ImportError, ValueError):
+            return None
+    return LazyModule(name)
@@ -0,0 +1,176 @@
+import bisect
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# 直方图桶上界（毫秒）
+DEFAULT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """耗时直方图（固定桶，记录次数/总和/最值）"""
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 最后一个为 +Inf 桶
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """按桶估算分位数（桶内线性插值）"""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= target and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                value = lower + (upper - lower) * (target - cumulative) / bucket_count
+                return min(max(value, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+class MetricsRegistry:
+    """进程内指标注册表（线程安全）：按 名称+标签 聚合耗时直方图，并保留最近的耗时记录"""
+    def __init__(self, recent_size=500):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self.recent = deque(maxlen=recent_size)
+
+    def observe(self, name, value_ms, **labels):
+        """记录一次耗时（毫秒）"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value_ms)
+            self.recent.append((time.time(), name, dict(key[1]), round(value_ms, 3)))
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        计时上下文：with metrics.span("sql.execute", db="test") as span: ...
+        退出后 span["ms"] 为本次耗时（毫秒），便于同时写入结果
+        """
+        record = {}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+            self.observe(name, record["ms"], **labels)
+
+    def timed(self, name):
+        """计时装饰器"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.recent.clear()
+
+    def snapshot(self):
+        """当前所有指标的汇总（按名称排序）"""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [{
+                "name": name,
+                "labels": dict(labels),
+                "count": h.count,
+                "sum_ms": round(h.sum, 3),
+                "avg_ms": round(h.sum / h.count, 3) if h.count else 0,
+                "min_ms": round(h.min, 3) if h.min is not None else None,
+                "max_ms": round(h.max, 3) if h.max is not None else None,
+                "p50_ms": round(h.quantile(0.5), 3) if h.count else None,
+                "p95_ms": round(h.quantile(0.95), 3) if h.count else None,
+                "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts))
+            } for (name, labels), h in items]
+
+    def to_json(self):
+        """导出为JSON文本"""
+        return json.dumps({
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "metrics": self.snapshot(),
+            "recent": [{"time": t, "name": n, "labels": l, "ms": v} for t, n, l, v in list(self.recent)]
+        }, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix="tool"):
+        """导出为 Prometheus 文本格式（histogram，单位毫秒）"""
+        lines = []
+        declared = set()
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for (name, labels), h in items:
+                metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_ms"
+                if metric not in declared:
+                    declared.add(metric)
+                    lines.append(f"# HELP {metric} {name} 耗时（毫秒）")
+                    lines.append(f"# TYPE {metric} histogram")
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                cumulative = 0
+                for bound, bucket_count in zip(list(h.buckets) + ["+Inf"], h.counts):
+                    cumulative += bucket_count
+                    le = f'le="{bound}"'
+                    lines.append(f"{metric}_bucket{{{label_text + ',' if label_text else ''}{le}}} {cumulative}")
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{metric}_sum{suffix} {round(h.sum, 3)}")
+                lines.append(f"{metric}_count{suffix} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
+
+
+# ------------------------------ 分阶段计时（单次请求内） ------------------------------
+_phases = threading.local()
+
+
+def begin_phases():
+    """开始收集当前线程的阶段耗时（如HTTP的 connect）"""
+    _phases.current = {}
+
+
+def add_phase(name, value_ms):
+    """累加当前线程某阶段的耗时（未调用 begin_phases 时忽略）"""
+    current = getattr(_phases, "current", None)
+    if current is not None:
+        current[name] = current.get(name, 0) + value_ms
+
+
+def end_phases():
+    """结束收集，返回 {阶段: 毫秒}"""
+    current = getattr(_phases, "current", None) or {}
+    _phases.current = None
+    return current
@@ -0,0 +1,329 @@
+"""
+Mock服务：按已保存的接口（api_info）和录制的响应（api_response_record）在本地提供HTTP服务
+离线联调客户端，也可作为 send_request / 批量运行基准测试的本地后端
+  路由：请求方法 + URL路径；静态路径用字典直接命中，含变量的路径（{{id}}、{id}、:id）编入分段前缀树
+  故障注入：固定延迟 + 随机抖动、按比例返回错误状态码，或按录制时的耗时回放延迟
+"""
+import asyncio
+import random
+import re
+import threading
+from fnmatch import fnmatchcase
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+from config import MOCK_HOST, MOCK_PORT
+from utils.json_utils import loads, dumps
+from utils.template_utils import render_template
+
+# 去掉URL中的 协议://主机 或开头的 {{变量}}，只保留路径
+_URL_PREFIX = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*://[^/?#]*|\{\{[^}]*\}\})")
+# 整段匹配任意值的路径段：{{变量}}、{变量}、:变量
+_PARAM_SEGMENT = re.compile(r"\{\{.*?\}\}|^\{[^{}]+\}$|^:\w+$")
+# 回放时不带上的响应头（由Mock服务重新生成，或录制的响应体已解压）
+SKIP_RESPONSE_HEADERS = {"content-length", "transfer-encoding", "content-encoding", "connection", "keep-alive",
+                         "date", "server"}
+# 单个请求头部分的最大字节数
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def url_path(url):
+    """接口URL转路由路径（去掉主机与查询参数，解码百分号编码，去掉末尾的 /）"""
+    path = urlsplit(_URL_PREFIX.sub("", url.strip(), count=1)).path
+    return normalize_path(path)
+
+
+def normalize_path(path):
+    path = unquote(path or "/")
+    if not path.startswith("/"):
+        path = "/" + path
+    return path.rstrip("/") or "/"
+
+
+def is_param_segment(segment):
+    return bool(_PARAM_SEGMENT.search(segment))
+
+
+def build_response(status, headers=None, body=b""):
+    """预先序列化完整的HTTP响应（状态行 + 响应头 + 响应体），请求时直接写出"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    for name, value in (headers or {}).items():
+        if name.lower() not in SKIP_RESPONSE_HEADERS:
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", "replace") + body
+
+
+def json_response(status, data):
+    return build_response(status, {"Content-Type": "application/json; charset=utf-8"},
+                          dumps(data).encode("utf-8"))
+
+
+class MockRoute:
+    """一个接口的路由与预先生成的响应"""
+    __slots__ = ("name", "method", "path", "response", "recorded_ms")
+
+    def __init__(self, name, method, path, response, recorded_ms=0):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.response = response
+        self.recorded_ms = recorded_ms or 0
+
+
+class _TrieNode:
+    __slots__ = ("children", "param", "routes")
+
+    def __init__(self):
+        self.children = {}  # 静态路径段 -> 子节点
+        self.param = None  # 变量路径段子节点
+        self.routes = {}  # 请求方法 -> MockRoute
+
+
+class RouteTable:
+    """
+    路由索引：静态路径 {路径: {方法: 路由}} 一次字典查找；
+    含变量的路径按 / 分段编入前缀树，匹配时静态段优先，不命中再回溯到变量段
+    """
+    def __init__(self):
+        self.static = {}
+        self.root = _TrieNode()
+        self.count = 0
+
+    def add(self, route):
+        """添加路由（同一方法 + 路径已存在时保留先添加的）"""
+        segments = route.path.strip("/").split("/") if route.path != "/" else []
+        if any(is_param_segment(segment) for segment in segments):
+            node = self.root
+            for segment in segments:
+                if is_param_segment(segment):
+                    node.param = node.param or _TrieNode()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, _TrieNode())
+            routes = node.routes
+        else:
+            routes = self.static.setdefault(route.path, {})
+        if route.method not in routes:
+            routes[route.method] = route
+            self.count += 1
+
+    def _search(self, node, segments, index):
+        """前缀树匹配，按优先级生成路径命中的 {方法: 路由}"""
+        if index == len(segments):
+            if node.routes:
+                yield node.routes
+            return
+        child = node.children.get(segments[index])
+        if child is not None:
+            yield from self._search(child, segments, index + 1)
+        if node.param is not None:
+            yield from self._search(node.param, segments, index + 1)
+
+    def match(self, method, path):
+        """返回 (路由, 路径是否存在)；路径存在但方法不匹配时为 (None, True)"""
+        path = normalize_path(path)
+        routes = self.static.get(path)
+        if routes is not None and method in routes:
+            return routes[method], True
+        found = routes is not None
+        segments = path.strip("/").split("/") if path != "/" else []
+        for routes in self._search(self.root, segments, 0):
+            if method in routes:
+                return routes[method], True
+            found = True
+        return None, found
+
+
+def build_routes(apis, records=None, variables=None):
+    """
+    接口列表 + 响应记录 {接口ID: 记录} 编译为路由索引
+    variables：环境变量，先渲染URL中的 {{变量}}（如 {{base_url}}），未定义的变量作为路径参数匹配任意值
+    没有录制响应的接口返回 200 和提示信息
+    """
+    records = records or {}
+    table = RouteTable()
+    for api in apis:
+        path = url_path(render_template(api["url"], variables))
+        record = records.get(api.get("id"))
+        if record is not None:
+            try:
+                headers = loads(record.get("headers") or "{}")
+            except ValueError:
+                headers = {}
+            if not isinstance(headers, dict):
+                headers = {}
+            response = build_response(record["status_code"], headers, (record.get("body") or "").encode("utf-8"))
+            recorded_ms = record.get("elapsed_ms")
+        else:
+            response = json_response(200, {"code": 0, "message": f"Mock：接口「{api['name']}」暂无录制的响应",
+                                           "data": None})
+            recorded_ms = 0
+        table.add(MockRoute(api["name"], api["method"].upper(), path, response, recorded_ms))
+    return table
+
+
+def load_routes(patterns=None, variables=None):
+    """从数据库读取接口与响应记录编译路由（patterns：接口名称通配符列表，为空时全部接口）"""
+    from db.dao import db_dao
+    apis = db_dao.get_all_apis()
+    if patterns:
+        apis = [api for api in apis if any(fnmatchcase(api["name"], pattern) for pattern in patterns)]
+        # 只读取选中接口的响应记录（响应体可能很大）
+        return build_routes(apis, db_dao.get_response_records([api["id"] for api in apis]), variables)
+    return build_routes(apis, db_dao.get_response_records(), variables)
+
+
+class MockServer:
+    """
+    asyncio 实现的 Mock HTTP/1.1 服务（支持 keep-alive），单线程事件循环处理全部连接
+    with 语句在后台线程启停（port=0 表示随机端口）；serve_forever() 在当前线程运行直到中断
+    latency_ms / jitter_ms：每个请求固定延迟 + 0~jitter 的随机延迟；replay_latency：按录制时的耗时延迟
+    error_rate：按比例（0~1）返回 error_status 错误响应
+    """
+    def __init__(self, routes, host=MOCK_HOST, port=MOCK_PORT, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 error_status=500, replay_latency=False, seed=None):
+        self.routes = routes
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.replay_latency = replay_latency
+        self.error_response = json_response(error_status, {"code": error_status, "message": "Mock：注入的错误响应"})
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "matched": 0, "not_found": 0, "injected_errors": 0}
+        self._loop = None
+        self._server = None
+        self._stopping = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def respond(self, method, target):
+        """按请求方法与路径返回 (延迟秒数, 响应字节)"""
+        self.stats["requests"] += 1
+        route, found = self.routes.match("GET" if method == "HEAD" else method, target.split("?", 1)[0])
+        if route is None:
+            self.stats["not_found"] += 1
+            status = 405 if found else 404
+            return 0, json_response(status, {"code": status, "message": f"Mock：未匹配的请求 {method} {target}"})
+        self.stats["matched"] += 1
+        delay = route.recorded_ms if self.replay_latency else self.latency_ms
+        if self.jitter_ms:
+            delay += self.random.uniform(0, self.jitter_ms)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return delay / 1000, self.error_response
+        return delay / 1000, route.response
+
+    async def _read_body(self, reader, headers):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                await reader.readexactly(size + 2)  # 块数据 + \r\n
+                if size == 0:
+                    break
+            return
+        length = int(headers.get("content-length") or 0)
+        if length:
+            await reader.readexactly(length)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) != 3:
+                    writer.write(json_response(400, {"code": 400, "message": "Mock：请求行格式错误"}))
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                await self._read_body(reader, headers)
+
+                method = method.upper()
+                delay, response = self.respond(method, target)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if method == "HEAD":
+                    response = response.split(b"\r\n\r\n", 1)[0] + b"\r\n\r\n"
+                writer.write(response)
+                await writer.drain()
+                connection = headers.get("connection", "").lower()
+                if connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, asyncio.CancelledError):
+            # 客户端断开、请求格式错误，或停止服务时取消（连接任务无人等待，正常结束即可）
+            pass
+        finally:
+            writer.close()
+
+    async def _serve(self, on_started=None):
+        """监听并处理连接，直到 stop()；退出时 asyncio.run 取消仍在处理的连接"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES,
+                                                  backlog=1024, reuse_address=True)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            if on_started:
+                on_started(self)
+            await self._stopping.wait()
+        finally:
+            # 不等待 wait_closed：keep-alive 连接不会主动断开
+            self._server.close()
+
+    def serve_forever(self, on_started=None):
+        """在当前线程运行，直到 Ctrl+C 或在其他线程调用 stop()（on_started 在开始监听后回调）"""
+        try:
+            asyncio.run(self._serve(on_started))
+        except KeyboardInterrupt:
+            pass
+
+    def start(self):
+        """在后台线程启动（监听成功后返回，端口被占用等错误在调用线程抛出）"""
+        started = threading.Event()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self._serve(lambda server: started.set()))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                started.set()
+
+        self._thread = threading.Thread(target=run, name="mock-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self):
+        """停止服务；start() 启动的等待后台线程退出，serve_forever() 运行的由其所在线程自行返回"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
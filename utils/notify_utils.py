@@ -0,0 +1,125 @@
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 通知级别
+INFO = "info"
+WARNING = "warning"
+ERROR = "error"
+
+
+class Notice:
+    """一条通知/错误记录（结构化，可跨线程传递）"""
+    __slots__ = ("level", "title", "content", "source", "time", "thread")
+
+    def __init__(self, level, title, content, source=""):
+        self.level = level
+        self.title = title
+        self.content = content
+        self.source = source
+        self.time = time.time()
+        self.thread = threading.current_thread().name
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        source = f"[{self.source}] " if self.source else ""
+        return f"{source}{self.title}：{self.content}"
+
+
+class NotifyBus:
+    """
+    线程安全的通知通道：任意线程（DAO、请求、后台任务）都可以发出通知，
+    界面在主线程定时取出并以非模态提示显示；没有界面消费者时（命令行）输出到stderr
+    """
+    def __init__(self, maxsize=1000, history_size=500):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.history = deque(maxlen=history_size)
+        self.backlog = deque(maxlen=50)  # 界面接入前发出的通知（如启动时数据库连接失败）
+        self.consumer_attached = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def emit(self, level, title, content, source=""):
+        """发出通知（不阻塞）"""
+        notice = Notice(level, title, str(content), source)
+        with self._lock:
+            self.history.append(notice)
+        # 当前线程处于 capture() 中时只收集，不打扰界面（批量操作逐条汇总）
+        captured = getattr(self._local, "captured", None)
+        if captured is not None:
+            captured.append(notice)
+            return notice
+        if not self.consumer_attached:
+            print(f"{level.upper()} {notice}", file=sys.stderr)
+            self.backlog.append(notice)
+            return notice
+        self._put(notice)
+        return notice
+
+    def _put(self, notice):
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            # 队列满时丢弃最旧的一条，保证发出方永不阻塞
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(notice)
+
+    def attach(self):
+        """界面消费者接入：之后的通知进入队列，并补发接入前积压的通知"""
+        self.consumer_attached = True
+        while self.backlog:
+            self._put(self.backlog.popleft())
+
+    def drain(self, max_items=50):
+        """取出待显示的通知（界面主线程调用）"""
+        notices = []
+        while len(notices) < max_items:
+            try:
+                notices.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return notices
+
+    def recent(self, level=None, limit=100):
+        """最近的通知记录（可按级别过滤）"""
+        with self._lock:
+            items = [n for n in self.history if level is None or n.level == level]
+        return items[-limit:]
+
+    @contextmanager
+    def capture(self):
+        """收集当前线程内发出的通知，用于批量操作结束后统一汇总"""
+        previous = getattr(self._local, "captured", None)
+        captured = []
+        self._local.captured = captured
+        try:
+            yield captured
+        finally:
+            self._local.captured = previous
+
+
+# 全局通知通道
+notify_bus = NotifyBus()
+
+
+def notify_info(title, content, source=""):
+    """发出提示通知"""
+    return notify_bus.emit(INFO, title, content, source)
+
+
+def notify_warning(title, content, source=""):
+    """发出警告通知"""
+    return notify_bus.emit(WARNING, title, content, source)
+
+
+def notify_error(title, content, source=""):
+    """发出错误通知"""
+    return notify_bus.emit(ERROR, title, content, source)
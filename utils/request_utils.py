@@ -1,56 +1,135 @@
-import requests
-from config import REQUEST_TIMEOUT
-from utils.common_utils import show_error
+import asyncio
+import time
+from urllib.parse import urlsplit
+from utils.notify_utils import notify_error
+from utils.metrics_utils import metrics
+from utils.json_utils import loads, unwrap, JsonBody
+from utils.http_transport import get_transport, classify_error
+from utils.template_utils import render_template, render_value
 
 
-def send_request(url, method, params=None, headers=None):
-    """发送HTTP请求"""
+def parse_json_field(value, variables=None):
+    """解析参数/请求头字段并替换{{变量}}（非JSON字符串原样返回）"""
+    if not value:
+        return {}
+    if not isinstance(value, str):
+        return render_value(value, variables)
     try:
-        # 处理参数格式
-        params = params if params else {}
-        headers = headers if headers else {}
-
-        # 转换参数（如果是JSON字符串则解析）
-        try:
-            params = json.loads(params) if isinstance(params, str) else params
-        except:
-            pass
+        return render_value(unwrap(loads(value)), variables)
+    except ValueError:
+        # 变量位于非字符串位置（如 {"id": {{uid}}}）时，先渲染再解析
+        value = render_template(value, variables)
         try:
-            headers = json.loads(headers) if isinstance(headers, str) else headers
-        except:
-            pass
-
-        method = method.upper()
-        response = None
-
-        if method == "GET":
-            response = requests.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
-        elif method == "POST":
-            # 自动判断参数类型（JSON优先）
-            if isinstance(params, dict) and "Content-Type" not in headers:
-                headers["Content-Type"] = "application/json"
-                response = requests.post(url, json=params, headers=headers, timeout=REQUEST_TIMEOUT)
-            else:
-                response = requests.post(url, data=params, headers=headers, timeout=REQUEST_TIMEOUT)
-        elif method in ["PUT", "DELETE", "PATCH"]:
-            response = requests.request(
-                method, url, json=params, headers=headers, timeout=REQUEST_TIMEOUT
-            )
+            return unwrap(loads(value))
+        except ValueError:
+            return value
+
+
+def _prepare_request(url, method, params, headers, variables):
+    """渲染变量并按请求方法决定参数的发送方式，返回 (url, method, headers, body)"""
+    # 处理参数格式（JSON字符串解析 + 变量替换）
+    url = render_template(url, variables)
+    params = parse_json_field(params, variables)
+    headers = parse_json_field(headers, variables)
+    if not isinstance(headers, dict):
+        headers = {}
+
+    method = method.upper()
+    if method == "GET":
+        body = {"params": params}
+    elif method == "POST":
+        # 自动判断参数类型（JSON优先）
+        if isinstance(params, dict) and "Content-Type" not in headers:
+            headers["Content-Type"] = "application/json"
+            body = {"json": params}
+        else:
+            body = {"data": params}
+    elif method in ["PUT", "DELETE", "PATCH"]:
+        body = {"json": params}
+    else:
+        raise ValueError(f"不支持的请求方法：{method}")
+    return url, method, headers, body
+
+
+def _build_result(raw, host, method):
+    """后端返回的原始响应转为结果字典，并记录各阶段耗时"""
+    dns = raw["dns"]
+    connect = raw["connect"]
+    timing = {
+        "dns": round(dns, 2),
+        "connect": round(connect, 2),
+        "ttfb": round(raw["headers_ms"] - dns - connect, 2),
+        "download": round(raw["download_ms"], 2),
+        "total": round(raw["headers_ms"] + raw["download_ms"], 2)
+    }
+    for phase, value in timing.items():
+        if phase in ("dns", "connect") and not value:
+            continue  # 复用连接时没有建连阶段，不计入直方图
+        metrics.observe(f"http.{phase}", value, host=host, method=method)
+
+    # 构建响应结果
+    text = raw["text"]
+    return {
+        "status_code": raw["status_code"],
+        "headers": raw["headers"],
+        "text": text,
+        "body": JsonBody(text),  # 惰性解析：提取/断言/展示共用一次解析结果
+        "encoding": raw["encoding"],
+        "http_version": raw["http_version"],
+        "elapsed_ms": timing["total"],
+        "timing": timing
+    }
+
+
+def execute_request(url, method, params=None, headers=None, variables=None, backend=None):
+    """
+    发送HTTP请求（失败直接抛出异常，供工作流/批量运行等后台线程使用）
+    backend：HTTP后端（requests / httpx），默认 config.HTTP_BACKEND
+    结果中的 timing 为各阶段耗时：dns（两种后端都计入 connect，恒为0）/ connect（含DNS，复用连接时为0）/ ttfb（发出请求到收到响应头）/ download / total
+    """
+    transport = get_transport(backend)
+    url, method, headers, body = _prepare_request(url, method, params, headers, variables)
+    host = urlsplit(url).hostname or ""
+    start = time.perf_counter()
+    try:
+        raw = transport.send(method, url, headers, body)
+    except Exception:
+        metrics.observe("http.error", (time.perf_counter() - start) * 1000, host=host, method=method)
+        raise
+    return _build_result(raw, host, method)
+
+
+async def execute_request_async(url, method, params=None, headers=None, variables=None, backend=None):
+    """execute_request 的协程版本：异步后端直接在事件循环中发送，阻塞后端放到默认线程池执行"""
+    transport = get_transport(backend)
+    url, method, headers, body = _prepare_request(url, method, params, headers, variables)
+    host = urlsplit(url).hostname or ""
+    start = time.perf_counter()
+    try:
+        if transport.is_async:
+            raw = await transport.send_async(method, url, headers, body)
         else:
-            raise ValueError(f"不支持的请求方法：{method}")
-
-        # 构建响应结果
-        result = {
-            "status_code": response.status_code,
-            "headers": dict(response.headers),
-            "text": response.text,
-            "encoding": response.encoding
-        }
-        return result
-    except requests.exceptions.Timeout:
-        show_error("请求失败", "请求超时！")
-    except requests.exceptions.ConnectionError:
-        show_error("请求失败", "连接错误，请检查URL是否正确！")
+            raw = await asyncio.get_running_loop().run_in_executor(None, transport.send, method, url, headers, body)
+    except Exception:
+        metrics.observe("http.error", (time.perf_counter() - start) * 1000, host=host, method=method)
+        raise
+    return _build_result(raw, host, method)
+
+
+def describe_request_error(e):
+    """请求异常转提示文案"""
+    kind = classify_error(e)
+    if kind == "timeout":
+        return "请求超时！"
+    if kind == "connection":
+        return "连接错误，请检查URL是否正确！"
+    return f"异常：{str(e)}"
+
+
+def send_request(url, method, params=None, headers=None, variables=None):
+    """发送HTTP请求（variables：环境变量，用于替换{{变量}}）"""
+    try:
+        return execute_request(url, method, params, headers, variables)
     except Exception as e:
-        show_error("请求失败", f"异常：{str(e)}")
-    return None
\ No newline at end of file
+        notify_error("请求失败", describe_request_error(e), source="request")
+    return None
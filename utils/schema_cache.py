@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from config import DB_CONFIG, SCHEMA_CACHE_PATH, SCHEMA_CACHE_TTL
+from utils.sql_utils import SQL_KEYWORDS
+
+
+class SchemaCache:
+    """
+    库表结构缓存：information_schema 元数据只在后台加载一次，保存在内存和本地JSON文件中
+    超过有效期、手动刷新或执行DDL后失效（invalidate），下次 refresh 时只重新加载失效的库
+    数据格式：{库名: {表名: {type, rows, comment, columns: [...], indexes: {索引名: {unique, columns}}}}}
+    """
+    def __init__(self, path=SCHEMA_CACHE_PATH, ttl=SCHEMA_CACHE_TTL, server=None):
+        self.path = path
+        self.ttl = ttl
+        # 缓存按服务器区分，切换服务器后不使用旧缓存
+        self.server = server or f"{DB_CONFIG['host']}:{DB_CONFIG['port']}"
+        # _refresh_lock 保证同时只有一个加载；_lock 保护失效标记与缓存文件（加载期间也可以标记失效）
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # 数据整体替换而不原地修改，读取时无需加锁
+        self._data = None
+        self.loaded_at = 0
+        self._stale = set()
+        # 全部失效的次数，加载期间发生全部失效时加载结果仍视为过期
+        self._generation = 0
+        # 每次数据变化加1，补全列表据此判断是否需要重建
+        self.version = 0
+        self._load_file()
+
+    # ------------------------------ 本地文件 ------------------------------
+    def _load_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return
+        if content.get("server") == self.server and isinstance(content.get("databases"), dict):
+            self._data = content["databases"]
+            self.loaded_at = content.get("loaded_at", 0)
+            self._stale = set(content.get("stale", []))
+            self.version += 1
+
+    def _save_file(self):
+        """写入缓存文件（调用方持有 _lock）；先写唯一的临时文件再替换，多个进程同时写入也不会互相覆盖一半"""
+        tmp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"server": self.server, "loaded_at": self.loaded_at, "stale": sorted(self._stale),
+                           "databases": self._data}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 缓存文件写入失败不影响使用（下次启动重新加载）
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    # ------------------------------ 加载与失效 ------------------------------
+    def is_expired(self):
+        """是否需要刷新（未加载、超过有效期或有失效的库）"""
+        return self._data is None or time.time() - self.loaded_at > self.ttl or bool(self._stale)
+
+    def refresh(self, loader, force=False):
+        """
+        按需刷新（耗时操作，应在后台线程调用）
+        loader(db_name=None)：返回元数据字典，db_name 为空时加载全部库
+        加载期间新标记的失效会保留到下次刷新，不会被本次刷新清除
+        """
+        with self._refresh_lock:
+            with self._lock:
+                if not force and not self.is_expired():
+                    return self._data
+                full = force or self._data is None or time.time() - self.loaded_at > self.ttl
+                stale = set(self._stale)
+                generation = self._generation
+            started = time.time()
+            if full:
+                data = loader()
+                if data is None:
+                    return self._data
+            else:
+                data = dict(self._data)
+                for db_name in stale:
+                    loaded = loader(db_name)
+                    if loaded is None:
+                        return self._data
+                    data.pop(db_name, None)
+                    data.update(loaded)
+            with self._lock:
+                if full and generation == self._generation:
+                    self.loaded_at = started
+                self._data = data
+                self._stale -= stale
+                self.version += 1
+                self._save_file()
+            return self._data
+
+    def invalidate(self, db_name=None):
+        """标记失效（db_name 为空时全部失效），可在任意线程调用"""
+        with self._lock:
+            if db_name and self._data is not None:
+                self._stale.add(db_name)
+            else:
+                self.loaded_at = 0
+                self._generation += 1
+            self._save_file()
+
+    # ------------------------------ 查询 ------------------------------
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def databases(self):
+        return sorted(self._data or {})
+
+    def tables(self, db_name):
+        return sorted((self._data or {}).get(db_name, {}))
+
+    def table_info(self, db_name, table_name):
+        return (self._data or {}).get(db_name, {}).get(table_name)
+
+    def columns(self, db_name, table_name=None):
+        """某张表的列名；不指定表时返回该库所有表的列名（去重）"""
+        tables = (self._data or {}).get(db_name, {})
+        if table_name:
+            return [c["name"] for c in tables.get(table_name, {}).get("columns", [])]
+        return sorted({c["name"] for info in tables.values() for c in info.get("columns", [])})
+
+    def completion_words(self, db_name=None):
+        """SQL编辑器补全词：关键字 + 库名 + 当前库的表名和列名"""
+        words = set(SQL_KEYWORDS)
+        words.update(self.databases())
+        if db_name:
+            words.update(self.tables(db_name))
+            words.update(self.columns(db_name))
+        return sorted(words, key=str.lower)
+
+
+# 各连接配置的库表结构缓存（键为连接配置ID，默认连接为 None）
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_schema_cache(connection_id=None):
+    """按连接配置获取库表结构缓存（每个连接单独的缓存文件）"""
+    connection_id = connection_id or None
+    with _caches_lock:
+        cache = _caches.get(connection_id)
+        if cache is None:
+            if connection_id:
+                base, ext = os.path.splitext(SCHEMA_CACHE_PATH)
+                cache = SchemaCache(path=f"{base}_{connection_id}{ext}", server=f"connection:{connection_id}")
+            else:
+                cache = SchemaCache()
+            _caches[connection_id] = cache
+        return cache
+
+
+# 默认连接的库表结构缓存
+schema_cache = get_schema_cache()
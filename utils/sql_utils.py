@@ -0,0 +1,181 @@
+import re
+
+# 可以 EXPLAIN 的语句类型
+EXPLAINABLE_TYPES = {"SELECT", "WITH", "TABLE", "INSERT", "UPDATE", "DELETE", "REPLACE"}
+# 只读查询（可以实际执行并计时）；WITH 按公用表表达式之后的主语句判断，不在此列
+QUERY_TYPES = {"SELECT", "TABLE", "SHOW", "DESC", "DESCRIBE", "EXPLAIN"}
+# 会改变库表结构的语句类型（执行后需要刷新库表结构缓存）
+DDL_TYPES = {"CREATE", "ALTER", "DROP", "RENAME", "TRUNCATE"}
+
+# 常用SQL关键字（用于自动补全）
+SQL_KEYWORDS = [
+    "SELECT", "FROM", "WHERE", "AND", "OR", "NOT", "IN", "IS", "NULL", "LIKE", "BETWEEN", "EXISTS",
+    "AS", "DISTINCT", "JOIN", "LEFT JOIN", "RIGHT JOIN", "INNER JOIN", "ON", "USING", "GROUP BY",
+    "ORDER BY", "HAVING", "LIMIT", "OFFSET", "UNION", "UNION ALL", "ASC", "DESC", "CASE", "WHEN",
+    "THEN", "ELSE", "END", "INSERT INTO", "VALUES", "UPDATE", "SET", "DELETE FROM", "REPLACE INTO",
+    "CREATE TABLE", "ALTER TABLE", "DROP TABLE", "TRUNCATE TABLE", "ADD COLUMN", "ADD INDEX",
+    "PRIMARY KEY", "DEFAULT", "COUNT", "SUM", "AVG", "MIN", "MAX", "IFNULL", "COALESCE", "CONCAT",
+    "DATE_FORMAT", "NOW", "EXPLAIN", "SHOW TABLES", "SHOW CREATE TABLE", "DESCRIBE"
+]
+
+_LEADING_COMMENT = re.compile(r"^\s*(?:--[^\n]*\n?|#[^\n]*\n?|/\*.*?\*/)", re.S)
+_KEYWORD = re.compile(r"[A-Za-z]+")
+_CTE_NAME = re.compile(r"\s*(?:[A-Za-z0-9_$]+|`(?:[^`]|``)+`)\s*")
+_CTE_AS = re.compile(r"\s*AS\s*", re.I)
+
+
+def split_statements(sql):
+    """按分号拆分多条SQL（忽略引号、反引号和注释中的分号），返回去掉首尾空白的语句列表"""
+    statements = []
+    buffer = []
+    i = 0
+    length = len(sql)
+    quote = None
+    while i < length:
+        ch = sql[i]
+        if quote:
+            buffer.append(ch)
+            if ch == "\\" and quote != "`" and i + 1 < length:
+                buffer.append(sql[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"', "`"):
+            quote = ch
+            buffer.append(ch)
+        elif ch == "-" and sql.startswith("-- ", i) or ch == "#":
+            end = sql.find("\n", i)
+            end = length if end == -1 else end
+            buffer.append(sql[i:end])
+            i = end
+            continue
+        elif ch == "/" and sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            buffer.append(sql[i:end])
+            i = end
+            continue
+        elif ch == ";":
+            statement = "".join(buffer).strip()
+            if strip_comments(statement):
+                statements.append(statement)
+            buffer = []
+        else:
+            buffer.append(ch)
+        i += 1
+    statement = "".join(buffer).strip()
+    if strip_comments(statement):
+        statements.append(statement)
+    return statements
+
+
+def strip_comments(statement):
+    """去掉语句开头的注释"""
+    while True:
+        match = _LEADING_COMMENT.match(statement)
+        if not match:
+            return statement.strip()
+        statement = statement[match.end():]
+
+
+def _skip_parens(text, pos):
+    """text[pos] 为左括号，返回与之匹配的右括号之后的位置（跳过引号和注释中的括号），不匹配返回 None"""
+    depth = 0
+    length = len(text)
+    while pos < length:
+        ch = text[pos]
+        if ch in ("'", '"', "`"):
+            pos += 1
+            while pos < length and text[pos] != ch:
+                pos += 2 if text[pos] == "\\" and ch != "`" else 1
+        elif ch == "-" and text.startswith("-- ", pos) or ch == "#":
+            end = text.find("\n", pos)
+            pos = length if end == -1 else end
+        elif ch == "/" and text.startswith("/*", pos):
+            end = text.find("*/", pos + 2)
+            pos = length if end == -1 else end + 1
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return None
+
+
+def _skip_cte_list(body):
+    """WITH [RECURSIVE] name [(列)] AS (...) [, ...] 之后的主语句，解析失败返回 None"""
+    pos = len("WITH")
+    recursive = re.match(r"\s+RECURSIVE\b", body[pos:], re.I)
+    if recursive:
+        pos += recursive.end()
+    while True:
+        match = _CTE_NAME.match(body, pos)
+        if not match:
+            return None
+        pos = match.end()
+        if body.startswith("(", pos):
+            pos = _skip_parens(body, pos)
+            if pos is None:
+                return None
+        match = _CTE_AS.match(body, pos)
+        if not match or not body.startswith("(", match.end()):
+            return None
+        pos = _skip_parens(body, match.end())
+        if pos is None:
+            return None
+        rest = strip_comments(body[pos:])
+        if not rest.startswith(","):
+            return rest
+        body, pos = rest, 1
+
+
+def statement_type(statement):
+    """语句类型（首个关键字，大写），如 SELECT / UPDATE；WITH 语句取公用表表达式之后的主语句类型"""
+    body = strip_comments(statement).lstrip("(")
+    match = _KEYWORD.match(body)
+    if not match:
+        return ""
+    keyword = match.group(0).upper()
+    if keyword == "WITH":
+        rest = _skip_cte_list(body)
+        if rest:
+            return statement_type(rest) or keyword
+    return keyword
+
+
+def is_query(statement):
+    """是否为只读查询（返回结果集）；EXPLAIN ANALYZE 会实际执行语句，按被分析的语句判断"""
+    keyword = statement_type(statement)
+    if keyword not in QUERY_TYPES:
+        return False
+    if keyword in ("EXPLAIN", "DESC", "DESCRIBE"):
+        rest = strip_comments(statement)[len(keyword):]
+        analyze = re.match(r"\s+ANALYZE\b", rest, re.I)
+        if analyze:
+            return is_query(rest[analyze.end():])
+    return True
+
+
+def is_ddl(statement):
+    """是否为DDL（建表、改表、删表等）"""
+    return statement_type(statement) in DDL_TYPES
+
+
+def parse_target_dbs(text):
+    """
+    解析多库执行的目标库（逗号/空白分隔），返回 (库名列表, 通配符列表)
+    通配符使用 MySQL LIKE 语法（% 和 _），也可以用 * 代替 %，如 shard_% / tenant_*
+    """
+    names, patterns = [], []
+    for item in re.split(r"[,，\s]+", text or ""):
+        item = item.strip().strip("`")
+        if not item:
+            continue
+        if "*" in item or "%" in item:
+            patterns.append(item.replace("*", "%"))
+        elif item not in names:
+            names.append(item)
+    return names, patterns
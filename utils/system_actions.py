@@ -0,0 +1,764 @@
+"""
+系统操作：环境变量、服务、开机自启
+多项修改组成一个批次，需要管理员权限的项在一个提权子进程中执行（Windows UAC / Linux pkexec 或 sudo），
+而不是每项修改单独提权；用户范围的项始终在当前进程以当前用户身份执行
+  提权子进程不信任批次日志中的路径等派生字段，按操作类型、范围和名称重新校验与计算
+  预览（dry-run）：读取每项的当前状态，列出 当前 → 修改后，不做任何修改
+  日志：每项执行前记录修改前的状态并写入批次日志文件；某项失败时自动回滚本批次已完成的修改，也可以事后整批回滚
+操作格式：
+  {"kind": "env", "op": "set" / "delete", "name": "JAVA_HOME", "value": "C:\\jdk", "scope": "user" / "machine"}
+  {"kind": "service", "op": "start" / "stop" / "restart" / "auto" / "manual" / "disabled", "name": "MySQL80"}
+  {"kind": "autostart", "op": "add" / "remove", "name": "tool", "command": "C:\\tool\\main.exe", "scope": "user"}
+"""
+import json
+import locale
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from config import ACTIONS_JOURNAL_DIR, ACTIONS_TIMEOUT
+from utils.lazy_import import lazy_import
+
+# 仅 Windows 提供（其他平台为 None）
+winreg = lazy_import("winreg", optional=True)
+
+IS_WINDOWS = sys.platform == "win32"
+SCOPE_USER = "user"
+SCOPE_MACHINE = "machine"
+SCOPES = (SCOPE_USER, SCOPE_MACHINE)
+
+# 子进程执行批次的命令行参数（main.py 识别后不启动界面）
+APPLY_ARG = "--apply-actions"
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# 批次状态：待执行 / 已完成 / 失败（已自动回滚） / 失败且回滚未完成 / 已被整批回滚
+PENDING = "pending"
+APPLIED = "applied"
+ROLLED_BACK = "rolled_back"
+FAILED = "failed"
+REVERTED = "reverted"
+
+# Windows 注册表位置
+ENV_REGISTRY = {
+    SCOPE_USER: ("HKEY_CURRENT_USER", r"Environment"),
+    SCOPE_MACHINE: ("HKEY_LOCAL_MACHINE", r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"),
+}
+RUN_REGISTRY = {
+    SCOPE_USER: ("HKEY_CURRENT_USER", r"Software\Microsoft\Windows\CurrentVersion\Run"),
+    SCOPE_MACHINE: ("HKEY_LOCAL_MACHINE", r"Software\Microsoft\Windows\CurrentVersion\Run"),
+}
+# Linux 文件位置（用户级路径在生成批次时按当前用户展开）
+ENV_FILES = {SCOPE_USER: "~/.config/environment.d/90-tool-platform.conf", SCOPE_MACHINE: "/etc/environment"}
+AUTOSTART_DIRS = {SCOPE_USER: "~/.config/autostart", SCOPE_MACHINE: "/etc/xdg/autostart"}
+
+
+class ActionError(Exception):
+    """操作格式错误、执行失败或未获得管理员授权"""
+
+
+# ------------------------------ 公共工具 ------------------------------
+def _run(command):
+    """执行系统命令，失败时抛出 ActionError，返回输出文本"""
+    kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW} if IS_WINDOWS else {}
+    try:
+        completed = subprocess.run(command, capture_output=True, timeout=ACTIONS_TIMEOUT, **kwargs)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ActionError(f"{' '.join(command)} 执行失败：{e}")
+    encoding = locale.getpreferredencoding(False)
+    output = (completed.stdout + completed.stderr).decode(encoding, "replace").strip()
+    if completed.returncode != 0:
+        raise ActionError(f"{' '.join(command)} 失败（{completed.returncode}）：{output}")
+    return output
+
+
+def _write_file(path, content, owner=None):
+    """
+    原子写入文件：先写入新建的唯一临时文件（不会跟随预先放置的符号链接）再替换，保留原文件权限；
+    以 root 身份写入时在临时文件上设置属主，不按路径 chown
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), mode)
+            if owner and hasattr(os, "fchown") and os.geteuid() == 0:
+                os.fchown(f.fileno(), *owner)
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_file(tmp_path)
+        raise
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _registry(scope, locations):
+    root_name, key = locations[scope]
+    return getattr(winreg, root_name), key
+
+
+def _reg_read(root, key, name):
+    """读取注册表值，返回 [值, 类型]，不存在返回 None"""
+    try:
+        with winreg.OpenKey(root, key) as handle:
+            value, value_type = winreg.QueryValueEx(handle, name)
+            return [value, value_type]
+    except FileNotFoundError:
+        return None
+
+
+def _reg_write(root, key, name, state):
+    """state 为 [值, 类型] 时写入，为 None 时删除"""
+    with winreg.CreateKeyEx(root, key, 0, winreg.KEY_SET_VALUE) as handle:
+        if state is None:
+            try:
+                winreg.DeleteValue(handle, name)
+            except FileNotFoundError:
+                pass
+        else:
+            winreg.SetValueEx(handle, name, 0, state[1], state[0])
+
+
+def _reg_state(state):
+    """校验批次日志中的注册表状态（[字符串, REG_SZ / REG_EXPAND_SZ] 或 None），返回新的状态"""
+    if state is None:
+        return None
+    if not isinstance(state, list) or len(state) != 2 or not isinstance(state[0], str) \
+            or type(state[1]) is not int or state[1] not in (winreg.REG_SZ, winreg.REG_EXPAND_SZ):
+        raise ActionError("无效的注册表状态")
+    if any(c in state[0] for c in "\r\n\0"):
+        raise ActionError("注册表值不能包含换行")
+    return [state[0], state[1]]
+
+
+def _broadcast_environment():
+    """通知已运行的程序（资源管理器等）重新读取环境变量，之后新打开的命令行即可生效"""
+    import ctypes
+    HWND_BROADCAST, WM_SETTINGCHANGE, SMTO_ABORTIFHUNG = 0xFFFF, 0x001A, 0x0002
+    result = ctypes.c_ulong()
+    ctypes.windll.user32.SendMessageTimeoutW(HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment",
+                                             SMTO_ABORTIFHUNG, 5000, ctypes.byref(result))
+
+
+def is_admin():
+    """当前进程是否已有管理员（root）权限"""
+    if IS_WINDOWS:
+        import ctypes
+        try:
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except OSError:
+            return False
+    return os.geteuid() == 0
+
+
+# ------------------------------ 环境变量 ------------------------------
+def _parse_env_line(line):
+    name, sep, value = line.partition("=")
+    name = name.strip()
+    if name.startswith("export "):
+        name = name[7:].strip()
+    if not sep or not name or name.startswith("#"):
+        return None, None
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        value = value[1:-1]
+        if line.partition("=")[2].strip()[0] == '"':
+            value = value.replace('\\"', '"').replace("\\\\", "\\")
+    return name, value
+
+
+class EnvAction:
+    """环境变量：Windows 写注册表（用户 / 系统），Linux 写 environment.d（用户）或 /etc/environment（系统）"""
+    ops = ("set", "delete")
+
+    def prepare(self, action):
+        if action.get("scope", SCOPE_USER) not in SCOPES:
+            raise ActionError(f"无效的范围：{action.get('scope')}")
+        action.setdefault("scope", SCOPE_USER)
+        name = action.get("name", "")
+        if not name or "=" in name or any(c.isspace() for c in name):
+            raise ActionError(f"无效的环境变量名：{name}")
+        if action["op"] == "set" and action.get("value") is None:
+            raise ActionError(f"设置环境变量 {name} 需要值")
+        if action["op"] == "set" and any(c in str(action["value"]) for c in "\r\n\0"):
+            # 环境变量文件每行一项，换行会写入额外的变量
+            raise ActionError(f"环境变量 {name} 的值不能包含换行")
+        if not IS_WINDOWS:
+            action["path"] = os.path.expanduser(ENV_FILES[action["scope"]])
+
+    def needs_admin(self, action):
+        return action["scope"] == SCOPE_MACHINE
+
+    def describe(self, action):
+        scope = "系统" if action["scope"] == SCOPE_MACHINE else "用户"
+        if action["op"] == "set":
+            return f"设置{scope}环境变量 {action['name']} = {action['value']}"
+        return f"删除{scope}环境变量 {action['name']}"
+
+    def read(self, action):
+        """当前状态：Windows 为 [值, 注册表类型]，Linux 为值；不存在为 None"""
+        if IS_WINDOWS:
+            root, key = _registry(action["scope"], ENV_REGISTRY)
+            return _reg_read(root, key, action["name"])
+        try:
+            with open(action["path"], "r", encoding="utf-8") as f:
+                for line in f:
+                    name, value = _parse_env_line(line)
+                    if name == action["name"]:
+                        return value
+        except FileNotFoundError:
+            pass
+        return None
+
+    def target(self, action):
+        """修改后的状态（与 read 的格式一致）"""
+        if action["op"] == "delete":
+            return None
+        if IS_WINDOWS:
+            # 含 %变量% 的值保存为可展开字符串（如 PATH）
+            return [action["value"], winreg.REG_EXPAND_SZ if "%" in action["value"] else winreg.REG_SZ]
+        return action["value"]
+
+    def restore_state(self, action, state):
+        """校验批次日志中的待恢复状态（格式与 read 一致），返回新的状态；格式错误抛出 ActionError"""
+        if IS_WINDOWS:
+            return _reg_state(state)
+        if state is not None and (not isinstance(state, str) or any(c in state for c in "\r\n\0")):
+            raise ActionError(f"环境变量 {action['name']} 的待恢复值无效")
+        return state
+
+    def show(self, state):
+        if state is None:
+            return "（未设置）"
+        return state[0] if isinstance(state, list) else state
+
+    def write(self, action, state):
+        if IS_WINDOWS:
+            root, key = _registry(action["scope"], ENV_REGISTRY)
+            _reg_write(root, key, action["name"], state)
+            return
+        lines = []
+        try:
+            with open(action["path"], "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            pass
+        lines = [line for line in lines if _parse_env_line(line)[0] != action["name"]]
+        if state is not None and any(c in state for c in "\r\n\0"):
+            raise ActionError(f"环境变量 {action['name']} 的值不能包含换行")
+        if state is not None:
+            escaped = state.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{action["name"]}="{escaped}"')
+        _write_file(action["path"], "\n".join(lines) + "\n")
+
+
+# ------------------------------ 服务 ------------------------------
+# Windows 服务启动类型（sc qc 输出的编号 -> 启动类型）
+_WINDOWS_START_TYPES = {"2": "auto", "3": "manual", "4": "disabled"}
+_SC_START_TYPES = {"auto": "auto", "manual": "demand", "disabled": "disabled"}
+START_TYPE_TEXT = {"auto": "自动", "manual": "手动", "disabled": "禁用"}
+SERVICE_OP_TEXT = {"start": "启动", "stop": "停止", "restart": "重启"}
+
+
+def _sc_field(output, field):
+    """sc query / sc qc 输出中字段的编号（如 STATE : 4 RUNNING 返回 "4"）"""
+    for line in output.splitlines():
+        name, sep, value = line.partition(":")
+        if sep and name.strip() == field:
+            return value.split()[0] if value.split() else ""
+    return ""
+
+
+class ServiceAction:
+    """系统服务：启动 / 停止 / 重启，启动类型 自动 / 手动 / 禁用（Windows 服务或 systemd 服务，均需管理员权限）"""
+    ops = ("start", "stop", "restart", "auto", "manual", "disabled")
+
+    def prepare(self, action):
+        name = action.get("name", "")
+        if not name or any(c in name for c in "\"'\r\n"):
+            raise ActionError(f"无效的服务名：{name}")
+
+    def needs_admin(self, action):
+        return True
+
+    def describe(self, action):
+        op = action["op"]
+        if op in START_TYPE_TEXT:
+            return f"服务 {action['name']} 启动类型改为{START_TYPE_TEXT[op]}"
+        return f"{SERVICE_OP_TEXT[op]}服务 {action['name']}"
+
+    def read(self, action):
+        """当前状态 {running, start_type}"""
+        name = action["name"]
+        if IS_WINDOWS:
+            try:
+                running = _sc_field(_run(["sc", "query", name]), "STATE") == "4"
+                start_type = _WINDOWS_START_TYPES.get(_sc_field(_run(["sc", "qc", name]), "START_TYPE"), "manual")
+            except ActionError as e:
+                raise ActionError(f"服务 {name} 不存在或无法查询：{e}")
+            return {"running": running, "start_type": start_type}
+        active = subprocess.run(["systemctl", "is-active", "--quiet", name], capture_output=True).returncode == 0
+        enabled = subprocess.run(["systemctl", "is-enabled", name], capture_output=True, text=True).stdout.strip()
+        if not enabled:
+            raise ActionError(f"服务 {name} 不存在")
+        start_type = {"enabled": "auto", "masked": "disabled"}.get(enabled, "manual")
+        return {"running": active, "start_type": start_type}
+
+    def target(self, action, before):
+        op = action["op"]
+        if op in START_TYPE_TEXT:
+            return dict(before, start_type=op)
+        return dict(before, running=op != "stop", restart=op == "restart")
+
+    def restore_state(self, action, state):
+        """只保留已知的启动类型与布尔的运行状态"""
+        if not isinstance(state, dict) or not isinstance(state.get("start_type"), str) \
+                or state["start_type"] not in START_TYPE_TEXT or not isinstance(state.get("running"), bool):
+            raise ActionError(f"服务 {action['name']} 的待恢复状态无效")
+        return {"running": state["running"], "start_type": state["start_type"]}
+
+    def show(self, state):
+        if state is None:
+            return "（未知）"
+        return f"{'运行中' if state['running'] else '已停止'}，{START_TYPE_TEXT[state['start_type']]}启动"
+
+    def write(self, action, state, before):
+        name = action["name"]
+        if state["start_type"] != before["start_type"]:
+            if IS_WINDOWS:
+                _run(["sc", "config", name, "start=", _SC_START_TYPES[state["start_type"]]])
+            else:
+                if before["start_type"] == "disabled":
+                    _run(["systemctl", "unmask", name])
+                if state["start_type"] == "auto":
+                    _run(["systemctl", "enable", name])
+                elif state["start_type"] == "manual":
+                    _run(["systemctl", "disable", name])
+                else:
+                    _run(["systemctl", "mask", name])
+        # net start / net stop 等待服务完全启动/停止后才返回
+        if state.get("restart") or (before["running"] and not state["running"]):
+            if before["running"]:
+                _run(["net", "stop", name, "/y"] if IS_WINDOWS else ["systemctl", "stop", name])
+        if state["running"] and (state.get("restart") or not before["running"]):
+            _run(["net", "start", name] if IS_WINDOWS else ["systemctl", "start", name])
+
+
+# ------------------------------ 开机自启 ------------------------------
+DESKTOP_ENTRY = "[Desktop Entry]\nType=Application\nName={name}\nExec={command}\nX-GNOME-Autostart-enabled=true\n"
+
+
+class AutostartAction:
+    """开机自启：Windows 注册表 Run 项，Linux XDG autostart 的 .desktop 文件"""
+    ops = ("add", "remove")
+
+    def prepare(self, action):
+        if action.get("scope", SCOPE_USER) not in SCOPES:
+            raise ActionError(f"无效的范围：{action.get('scope')}")
+        action.setdefault("scope", SCOPE_USER)
+        name = action.get("name", "")
+        if not name or any(c in name for c in "\\/:*?\"<>|\r\n"):
+            raise ActionError(f"无效的自启动项名称：{name}")
+        if action["op"] == "add" and not action.get("command"):
+            raise ActionError(f"添加自启动项 {name} 需要启动命令")
+        if action["op"] == "add" and any(c in action["command"] for c in "\r\n\0"):
+            raise ActionError(f"自启动项 {name} 的启动命令不能包含换行")
+        if not IS_WINDOWS:
+            action["path"] = os.path.join(os.path.expanduser(AUTOSTART_DIRS[action["scope"]]), name + ".desktop")
+
+    def needs_admin(self, action):
+        return action["scope"] == SCOPE_MACHINE
+
+    def describe(self, action):
+        scope = "所有用户" if action["scope"] == SCOPE_MACHINE else "当前用户"
+        if action["op"] == "add":
+            return f"添加开机自启（{scope}）{action['name']}：{action['command']}"
+        return f"移除开机自启（{scope}）{action['name']}"
+
+    def read(self, action):
+        """当前状态：Windows 为 [命令, 注册表类型]，Linux 为 .desktop 文件内容；不存在为 None"""
+        if IS_WINDOWS:
+            root, key = _registry(action["scope"], RUN_REGISTRY)
+            return _reg_read(root, key, action["name"])
+        try:
+            with open(action["path"], "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def target(self, action):
+        if action["op"] == "remove":
+            return None
+        if IS_WINDOWS:
+            return [action["command"], winreg.REG_SZ]
+        return DESKTOP_ENTRY.format(name=action["name"], command=action["command"])
+
+    def restore_state(self, action, state):
+        """Linux 下不使用日志中的文件内容，取出其中的启动命令校验后按 DESKTOP_ENTRY 重新生成"""
+        if IS_WINDOWS:
+            return _reg_state(state)
+        if state is None:
+            return None
+        if not isinstance(state, str):
+            raise ActionError(f"自启动项 {action['name']} 的待恢复内容无效")
+        commands = [line[5:] for line in state.splitlines() if line.startswith("Exec=")]
+        command = commands[0] if commands else ""
+        if not command.strip() or "\0" in command:
+            raise ActionError(f"自启动项 {action['name']} 的待恢复内容中没有有效的启动命令")
+        return DESKTOP_ENTRY.format(name=action["name"], command=command)
+
+    def show(self, state):
+        if state is None:
+            return "（无）"
+        if isinstance(state, list):
+            return state[0]
+        for line in state.splitlines():
+            if line.startswith("Exec="):
+                return line[5:]
+        return "（已存在）"
+
+    def write(self, action, state):
+        if IS_WINDOWS:
+            root, key = _registry(action["scope"], RUN_REGISTRY)
+            _reg_write(root, key, action["name"], state)
+        elif state is None:
+            _remove_file(action["path"])
+        else:
+            _write_file(action["path"], state)
+
+
+ACTIONS = {"env": EnvAction(), "service": ServiceAction(), "autostart": AutostartAction()}
+
+
+def _target_state(action, before):
+    handler = ACTIONS[action["kind"]]
+    return handler.target(action, before) if action["kind"] == "service" else handler.target(action)
+
+
+def _write_state(action, state, before):
+    handler = ACTIONS[action["kind"]]
+    if action["kind"] == "service":
+        handler.write(action, state, before)
+    else:
+        handler.write(action, state)
+
+
+# ------------------------------ 批次 ------------------------------
+# 用户填写的操作字段（提权子进程只使用这些字段，路径、属主等派生字段重新计算）
+ACTION_FIELDS = ("kind", "op", "name", "value", "command", "scope")
+
+
+def _prepare_action(action):
+    """校验单项操作并补全执行所需的信息（文件路径），返回新的操作；格式错误抛出 ActionError"""
+    action = dict(action)
+    handler = ACTIONS.get(action.get("kind"))
+    if handler is None:
+        raise ActionError(f"未知的操作类型 {action.get('kind')}")
+    if action.get("op") not in handler.ops:
+        raise ActionError(f"{action['kind']} 不支持的操作 {action.get('op')}")
+    handler.prepare(action)
+    return action
+
+
+def prepare_actions(actions):
+    """校验操作并补全执行所需的信息（文件路径），返回新的操作列表；格式错误抛出 ActionError"""
+    prepared = []
+    for index, action in enumerate(actions, 1):
+        try:
+            prepared.append(_prepare_action(action))
+        except ActionError as e:
+            raise ActionError(f"第 {index} 项：{e}")
+    if not prepared:
+        raise ActionError("批次中没有操作")
+    return prepared
+
+
+def preview(actions):
+    """
+    预览（dry-run）：校验并读取每项的当前状态，不做任何修改
+    返回 {steps: [{description, current, target, admin, error}], admin, command}
+    """
+    actions = prepare_actions(actions)
+    steps = []
+    for action in actions:
+        handler = ACTIONS[action["kind"]]
+        step = {"description": handler.describe(action), "admin": handler.needs_admin(action), "error": ""}
+        try:
+            before = handler.read(action)
+            step["current"] = handler.show(before)
+            step["target"] = handler.show(_target_state(action, before))
+        except (ActionError, OSError) as e:
+            step["current"] = step["target"] = ""
+            step["error"] = str(e)
+        steps.append(step)
+    admin = any(step["admin"] for step in steps) and not is_admin()
+    command = child_command("<批次日志>")
+    return {"steps": steps, "admin": admin, "command": " ".join(elevate_command(command) if admin else command)}
+
+
+def child_command(journal_path):
+    """执行批次的子进程命令（打包后为程序本身）"""
+    if getattr(sys, "frozen", False):
+        return [sys.executable, APPLY_ARG, journal_path]
+    return [sys.executable, MAIN_SCRIPT, APPLY_ARG, journal_path]
+
+
+def _ps_quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def elevate_command(command):
+    """包装为提权执行的命令：Windows 通过 UAC 弹窗（等待结束并返回退出码），Linux 优先 pkexec 图形授权，否则 sudo"""
+    if IS_WINDOWS:
+        script = (f"$p = Start-Process -FilePath {_ps_quote(command[0])} "
+                  f"-ArgumentList {_ps_quote(subprocess.list2cmdline(command[1:]))} "
+                  f"-Verb RunAs -WindowStyle Hidden -Wait -PassThru; exit $p.ExitCode")
+        return ["powershell", "-NoProfile", "-NonInteractive", "-Command", script]
+    if shutil.which("pkexec") and (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return ["pkexec"] + command
+    return ["sudo", "--"] + command
+
+
+def _journal_dir():
+    return os.path.abspath(ACTIONS_JOURNAL_DIR)
+
+
+def _save_journal(journal):
+    _write_file(journal["path"], json.dumps(journal, ensure_ascii=False, indent=2), journal.get("owner"))
+
+
+def load_journal(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_journals():
+    """历史批次（新的在前），日志损坏的跳过"""
+    directory = _journal_dir()
+    try:
+        names = sorted((name for name in os.listdir(directory) if name.endswith(".json")), reverse=True)
+    except FileNotFoundError:
+        return []
+    journals = []
+    for name in names:
+        try:
+            journals.append(load_journal(os.path.join(directory, name)))
+        except (OSError, ValueError):
+            continue
+    return journals
+
+
+def _new_journal(title, steps, reverts=None):
+    now = time.time()
+    batch_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}-{os.urandom(2).hex()}"
+    return {
+        "id": batch_id,
+        "path": os.path.join(_journal_dir(), batch_id + ".json"),
+        "title": title,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "status": PENDING,
+        "error": "",
+        "reverts": reverts,
+        "owner": [os.getuid(), os.getgid()] if hasattr(os, "getuid") else None,
+        "admin": any(ACTIONS[step["action"]["kind"]].needs_admin(step["action"]) for step in steps),
+        "steps": steps
+    }
+
+
+def _needs_admin(action):
+    return ACTIONS[action["kind"]].needs_admin(action)
+
+
+def _run_journal(journal):
+    """
+    保存批次日志并执行，返回执行后的日志
+    需要管理员权限时：用户范围的项先在当前进程执行（以当前用户身份写入用户文件/注册表），
+    其余各项在一个提权子进程中执行；子进程失败或未获得授权时撤销当前进程已完成的项
+    """
+    _save_journal(journal)
+    if not journal["admin"] or is_admin():
+        apply_journal(journal["path"])
+        journal = load_journal(journal["path"])
+    else:
+        journal = _run_elevated(journal)
+    if journal["status"] == APPLIED and journal.get("reverts"):
+        try:
+            original = load_journal(journal["reverts"])
+            original["status"] = REVERTED
+            _save_journal(original)
+        except (OSError, ValueError):
+            pass
+    return journal
+
+
+def _run_elevated(journal):
+    """用户范围的项在当前进程执行，成功后启动提权子进程执行其余各项，返回执行后的日志"""
+    user_indexes = [i for i, step in enumerate(journal["steps"]) if not _needs_admin(step["action"])]
+    done, env_changed = _apply_steps(journal, [journal["steps"][i] for i in user_indexes])
+    if journal["error"]:
+        _finish_journal(journal, done, env_changed)
+        return journal
+
+    command = elevate_command(child_command(journal["path"]))
+    kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW} if IS_WINDOWS else {}
+    subprocess.run(command, capture_output=True, **kwargs)
+    if env_changed and IS_WINDOWS:
+        _broadcast_environment()
+    journal = load_journal(journal["path"])
+    if journal["status"] == APPLIED:
+        return journal
+    if journal["status"] == PENDING:
+        # 子进程没有执行（取消了UAC/授权窗口或密码错误），需要管理员权限的项未做任何修改
+        journal["error"] = "未获得管理员授权" + ("，已撤销用户范围的修改" if done else "，未做任何修改")
+        journal["status"] = ROLLED_BACK if done else FAILED
+    # 子进程已回滚它完成的项，这里撤销当前进程完成的项
+    done = [journal["steps"][i] for i in user_indexes if journal["steps"][i]["status"] == APPLIED]
+    if done and not _rollback_steps(journal, done):
+        journal["status"] = FAILED
+    if done and IS_WINDOWS and any(step["action"]["kind"] == "env" for step in done):
+        _broadcast_environment()
+    _save_journal(journal)
+    return journal
+
+
+def execute(actions, title=""):
+    """执行一批操作（单项失败时自动回滚本批次已完成的项），返回批次日志；格式错误抛出 ActionError"""
+    actions = prepare_actions(actions)
+    steps = [{"action": action, "mode": "apply", "status": PENDING, "before": None, "error": ""}
+             for action in actions]
+    return _run_journal(_new_journal(title or ACTIONS[actions[0]["kind"]].describe(actions[0]) +
+                                     (f" 等 {len(actions)} 项" if len(actions) > 1 else ""), steps))
+
+
+def rollback(path):
+    """整批回滚一个已执行的批次：按相反顺序恢复各项修改前的状态（同样只提权一次），返回回滚批次的日志"""
+    original = load_journal(path)
+    if original["status"] == REVERTED:
+        raise ActionError("该批次已回滚")
+    steps = [{"action": step["action"], "mode": "restore", "restore": step["before"], "status": PENDING,
+              "before": None, "error": ""}
+             for step in reversed(original["steps"]) if step["status"] == APPLIED]
+    if not steps:
+        raise ActionError("该批次没有需要回滚的修改")
+    return _run_journal(_new_journal(f"回滚：{original['title']}", steps, reverts=path))
+
+
+def _apply_steps(journal, steps):
+    """依次执行各项：执行前记录当前状态并保存日志，某项失败时停止；返回 (已完成的项, 是否修改了环境变量)"""
+    done = []
+    env_changed = False
+    for step in steps:
+        action = step["action"]
+        try:
+            step["before"] = ACTIONS[action["kind"]].read(action)
+            state = step["restore"] if step["mode"] == "restore" else _target_state(action, step["before"])
+            if action["kind"] == "service" and state is None:
+                raise ActionError("没有可恢复的服务状态")
+            _write_state(action, state, step["before"])
+            step["status"] = APPLIED
+            done.append(step)
+            env_changed = env_changed or action["kind"] == "env"
+        except Exception as e:
+            step["status"] = FAILED
+            step["error"] = str(e)
+            journal["error"] = f"{ACTIONS[action['kind']].describe(action)}：{e}"
+            break
+        finally:
+            _save_journal(journal)
+    return done, env_changed
+
+
+def _rollback_steps(journal, done):
+    """按相反顺序恢复已完成的项，全部恢复成功返回 True"""
+    restored = True
+    for step in reversed(done):
+        try:
+            _write_state(step["action"], step["before"], _target_state(step["action"], step["before"])
+                         if step["mode"] == "apply" else step["restore"])
+            step["status"] = ROLLED_BACK
+        except Exception as e:
+            step["error"] = f"回滚失败：{e}"
+            restored = False
+        _save_journal(journal)
+    return restored
+
+
+def _finish_journal(journal, done, env_changed):
+    """出错时回滚本进程完成的项，设置批次状态并保存"""
+    if journal["error"]:
+        journal["status"] = ROLLED_BACK if _rollback_steps(journal, done) else FAILED
+    else:
+        journal["status"] = APPLIED
+    if env_changed and IS_WINDOWS:
+        _broadcast_environment()
+    _save_journal(journal)
+
+
+def apply_journal(path):
+    """
+    在当前进程执行批次日志中的全部项（无需提权或当前进程已有管理员权限时使用）
+    每项执行前记录当前状态并保存日志；失败时按相反顺序恢复已完成的项；返回退出码
+    """
+    journal = load_journal(path)
+    if journal["status"] != PENDING:
+        return 1
+    done, env_changed = _apply_steps(journal, journal["steps"])
+    _finish_journal(journal, done, env_changed)
+    return 0 if journal["status"] == APPLIED else 1
+
+
+def apply_admin_steps(path):
+    """
+    提权子进程的入口：只执行批次中需要管理员权限的项（用户范围的项已由发起的进程执行）
+    日志文件由当前用户写入，不信任其中的派生字段：每项只保留用户填写的字段重新校验，文件路径按类型、范围和名称重新计算，
+    回滚时的待恢复状态按操作类型的状态格式校验后重新生成，
+    日志的保存位置与属主以命令行给出的文件为准；任一项校验失败时不做任何修改；返回退出码
+    """
+    if os.path.islink(path):
+        return 1
+    journal = load_journal(path)
+    if journal.get("status") != PENDING:
+        return 1
+    journal["path"] = path
+    if hasattr(os, "getuid"):
+        info = os.stat(path)
+        journal["owner"] = [info.st_uid, info.st_gid]
+    steps = []
+    for index, step in enumerate(journal["steps"], 1):
+        if step["status"] != PENDING:
+            continue  # 用户范围的项，已由发起的进程执行
+        try:
+            action = _prepare_action({key: step["action"][key] for key in ACTION_FIELDS if key in step["action"]})
+            if not _needs_admin(action):
+                raise ActionError("用户范围的操作不在提权进程中执行")
+            if step.get("mode") not in ("apply", "restore"):
+                raise ActionError(f"未知的执行方式 {step.get('mode')}")
+            if step["mode"] == "restore":
+                # 待恢复的状态同样来自日志，按操作类型的状态格式校验后重新生成
+                step["restore"] = ACTIONS[action["kind"]].restore_state(action, step.get("restore"))
+        except Exception as e:
+            # 校验在任何修改之前，失败时本进程没有做修改
+            step["status"] = FAILED
+            step["error"] = str(e)
+            journal["error"] = f"第 {index} 项：{e}"
+            journal["status"] = ROLLED_BACK
+            _save_journal(journal)
+            return 1
+        step["action"] = action
+        steps.append(step)
+    done, env_changed = _apply_steps(journal, steps)
+    _finish_journal(journal, done, env_changed)
+    return 0 if journal["status"] == APPLIED else 1
@@ -0,0 +1,80 @@
+import re
+from functools import lru_cache
+
+# 变量占位符：{{var}}，允许两侧空格，变量名支持字母/数字/下划线/点/中划线
+VAR_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][\w.\-]*)\s*\}\}")
+
+
+class CompiledTemplate:
+    """预编译模板（解析一次，多次渲染）"""
+    __slots__ = ("source", "parts", "names", "single_var")
+
+    def __init__(self, source):
+        self.source = source
+        # parts：[(是否变量, 文本或变量名, 原始占位符)]
+        self.parts = []
+        pos = 0
+        for match in VAR_PATTERN.finditer(source):
+            if match.start() > pos:
+                self.parts.append((False, source[pos:match.start()], None))
+            self.parts.append((True, match.group(1), match.group(0)))
+            pos = match.end()
+        if pos < len(source):
+            self.parts.append((False, source[pos:], None))
+        self.names = tuple(name for is_var, name, _ in self.parts if is_var)
+        # 整个模板只有一个占位符时，渲染保留变量原始类型（数字、布尔等）
+        self.single_var = self.names[0] if len(self.parts) == 1 and self.names else None
+
+    def render(self, variables):
+        """渲染模板（未定义的变量保留原占位符）"""
+        if not self.names or not variables:
+            return self.source
+        if self.single_var is not None:
+            return variables.get(self.single_var, self.source)
+        chunks = []
+        for is_var, value, raw in self.parts:
+            if not is_var:
+                chunks.append(value)
+            elif value in variables:
+                chunks.append(str(variables[value]))
+            else:
+                chunks.append(raw)
+        return "".join(chunks)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source):
+    """编译模板（按源字符串缓存，批量/压测时不重复解析）"""
+    return CompiledTemplate(source)
+
+
+def render_template(text, variables):
+    """渲染字符串模板，结果始终为字符串"""
+    if not text or not variables or "{{" not in text:
+        return text
+    template = compile_template(text)
+    if template.single_var is not None:
+        value = template.render(variables)
+        return value if isinstance(value, str) else str(value)
+    return template.render(variables)
+
+
+def render_value(value, variables):
+    """递归渲染 dict/list/str 中的变量（键和值都会渲染）"""
+    if not variables:
+        return value
+    if isinstance(value, str):
+        return compile_template(value).render(variables) if "{{" in value else value
+    if isinstance(value, dict):
+        return {render_template(k, variables) if isinstance(k, str) else k: render_value(v, variables)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [render_value(item, variables) for item in value]
+    return value
+
+
+def find_variables(text):
+    """列出模板中引用的变量名（去重、保持顺序）"""
+    if not text or "{{" not in text:
+        return []
+    return list(dict.fromkeys(compile_template(text).names))
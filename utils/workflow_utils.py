@@ -0,0 +1,243 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import WORKFLOW_MAX_WORKERS
+from utils.request_utils import execute_request, parse_json_field, describe_request_error
+from utils.extract_utils import extract_variables, compile_extractor
+from utils.template_utils import find_variables
+
+
+class WorkflowError(Exception):
+    """工作流定义错误（步骤重名、依赖不存在、循环依赖等）"""
+
+
+def build_plan(steps, apis_by_name):
+    """
+    校验并编译工作流步骤，返回按拓扑序排列的执行计划
+    步骤格式：{name, api, depends_on, extract: {变量: 表达式}, params: {覆盖参数}, headers: {覆盖请求头}}
+    依赖 = depends_on 显式声明 + 引用了其他步骤提取变量的隐式依赖
+    """
+    if not isinstance(steps, list) or not steps:
+        raise WorkflowError("工作流至少需要一个步骤")
+    plans = {}
+    producers = {}  # {变量名: 提取该变量的步骤}
+    for index, step in enumerate(steps, 1):
+        if not isinstance(step, dict):
+            raise WorkflowError(f"第{index}个步骤格式错误，应为JSON对象")
+        for field in ("name", "api"):
+            if step.get(field) is not None and not isinstance(step[field], str):
+                raise WorkflowError(f"第{index}个步骤的{field}应为字符串")
+        name = (step.get("name") or step.get("api") or "").strip()
+        if not name:
+            raise WorkflowError(f"第{index}个步骤缺少name/api")
+        if name in plans:
+            raise WorkflowError(f"步骤名称「{name}」重复")
+        api = apis_by_name.get(step.get("api") or name)
+        if not api:
+            raise WorkflowError(f"步骤「{name}」引用的接口「{step.get('api') or name}」不存在")
+        extract = step.get("extract") or {}
+        if not isinstance(extract, dict):
+            raise WorkflowError(f"步骤「{name}」：extract 应为对象（{{变量: 表达式}}）")
+        depends_on = step.get("depends_on") or []
+        if not isinstance(depends_on, list) or not all(isinstance(dep, str) for dep in depends_on):
+            raise WorkflowError(f"步骤「{name}」：depends_on 应为步骤名称列表")
+        for field in ("params", "headers"):
+            if step.get(field) is not None and not isinstance(step[field], (dict, str)):
+                raise WorkflowError(f"步骤「{name}」：{field} 应为对象")
+        for expr in extract.values():
+            if not isinstance(expr, str):
+                raise WorkflowError(f"步骤「{name}」：extract 的表达式应为字符串")
+            try:
+                compile_extractor(expr)
+            except ValueError as e:
+                raise WorkflowError(f"步骤「{name}」：{str(e)}")
+        for var in extract:
+            producers.setdefault(var, name)
+        plans[name] = {
+            "name": name,
+            "api": api,
+            "params": step.get("params"),
+            "headers": step.get("headers"),
+            "extract": extract,
+            "deps": set(depends_on)
+        }
+
+    for plan in plans.values():
+        for dep in plan["deps"]:
+            if dep not in plans:
+                raise WorkflowError(f"步骤「{plan['name']}」依赖的步骤「{dep}」不存在")
+        for var in _referenced_variables(plan):
+            producer = producers.get(var)
+            if producer and producer != plan["name"]:
+                plan["deps"].add(producer)
+
+    return _topological_order(plans)
+
+
+def _referenced_variables(plan):
+    """步骤请求中引用的全部变量名"""
+    api = plan["api"]
+    texts = [api["url"], str(api.get("params") or ""), str(api.get("headers") or ""),
+             str(plan["params"] or ""), str(plan["headers"] or "")]
+    names = []
+    for text in texts:
+        names.extend(find_variables(text))
+    return names
+
+
+def _topological_order(plans):
+    """拓扑排序（Kahn算法），同时计算每个步骤的祖先集合"""
+    in_degree = {name: len(plan["deps"]) for name, plan in plans.items()}
+    children = {name: [] for name in plans}
+    for name, plan in plans.items():
+        for dep in plan["deps"]:
+            children[dep].append(name)
+    queue = [name for name in plans if in_degree[name] == 0]
+    ordered = []
+    while queue:
+        name = queue.pop(0)
+        ordered.append(plans[name])
+        for child in children[name]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
+    if len(ordered) != len(plans):
+        cycle = [name for name, degree in in_degree.items() if degree > 0]
+        raise WorkflowError(f"存在循环依赖：{', '.join(cycle)}")
+    for plan in ordered:
+        ancestors = set(plan["deps"])
+        for dep in plan["deps"]:
+            ancestors |= plans[dep]["ancestors"]
+        plan["ancestors"] = ancestors
+    return ordered
+
+
+def _merge_field(base, override):
+    """合并接口原有参数/请求头与步骤覆盖值（均为JSON对象时按键覆盖）"""
+    if not override:
+        return base
+    base = parse_json_field(base)
+    override = parse_json_field(override)
+    if isinstance(base, dict) and isinstance(override, dict):
+        return {**base, **override}
+    return override
+
+
+def _run_step(plan, variables):
+    """执行单个步骤（在线程池中运行）"""
+    api = plan["api"]
+    result = execute_request(
+        url=api["url"],
+        method=api["method"],
+        params=_merge_field(api.get("params"), plan["params"]),
+        headers=_merge_field(api.get("headers"), plan["headers"]),
+        variables=variables
+    )
+    extracted = extract_variables(result, plan["extract"])
+    return result, extracted
+
+
+def run_workflow(steps, apis_by_name, variables=None, max_workers=WORKFLOW_MAX_WORKERS, on_step=None):
+    """
+    按依赖关系（DAG）调度执行工作流，无依赖关系的步骤并发执行
+    on_step：每个步骤结束时回调（在调用线程中执行）
+    返回：{success, total_ms, steps: [每步耗时报告], critical_path, variables}
+    """
+    ordered = build_plan(steps, apis_by_name)
+    plans = {plan["name"]: plan for plan in ordered}
+    base_variables = dict(variables or {})
+    reports = {plan["name"]: {"name": plan["name"], "api": plan["api"]["name"], "status": "pending",
+                              "status_code": None, "start_ms": None, "wait_ms": None,
+                              "elapsed_ms": None, "request_ms": None, "extracted": {}, "error": ""}
+               for plan in ordered}
+    outputs = {}
+    ready_at = {}
+    finish_at = {}
+    pending = [plan["name"] for plan in ordered]
+    running = {}
+    t0 = time.perf_counter()
+
+    def now_ms():
+        return round((time.perf_counter() - t0) * 1000, 2)
+
+    def submit(pool, name):
+        plan = plans[name]
+        # 只合并祖先步骤的提取结果，保证并发执行时变量来源确定
+        step_variables = dict(base_variables)
+        for ancestor in ordered:
+            if ancestor["name"] in plan["ancestors"]:
+                step_variables.update(outputs.get(ancestor["name"], {}))
+
+        def task():
+            started = now_ms()
+            return started, _run_step(plan, step_variables)
+
+        running[pool.submit(task)] = name
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = plans[name]["deps"]
+                if any(reports[d]["status"] in ("failed", "skipped") for d in deps):
+                    pending.remove(name)
+                    reports[name]["status"] = "skipped"
+                    reports[name]["error"] = "依赖步骤失败，已跳过"
+                    if on_step:
+                        on_step(reports[name])
+                elif all(reports[d]["status"] == "success" for d in deps):
+                    pending.remove(name)
+                    ready_at[name] = now_ms()
+                    reports[name]["status"] = "running"
+                    submit(pool, name)
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                report = reports[name]
+                finish_at[name] = now_ms()
+                try:
+                    started, (result, extracted) = future.result()
+                    report["start_ms"] = started
+                    report["wait_ms"] = round(started - ready_at[name], 2)
+                    report["request_ms"] = result["elapsed_ms"]
+                    report["status_code"] = result["status_code"]
+                    report["extracted"] = extracted
+                    outputs[name] = extracted
+                    if result["status_code"] >= 400:
+                        report["status"] = "failed"
+                        report["error"] = f"HTTP {result['status_code']}"
+                    else:
+                        report["status"] = "success"
+                except Exception as e:
+                    report["status"] = "failed"
+                    report["error"] = describe_request_error(e)
+                    report["start_ms"] = ready_at[name]
+                report["elapsed_ms"] = round(finish_at[name] - report["start_ms"], 2)
+                if on_step:
+                    on_step(report)
+
+    merged_variables = dict(base_variables)
+    for plan in ordered:
+        merged_variables.update(outputs.get(plan["name"], {}))
+    return {
+        "success": all(r["status"] == "success" for r in reports.values()),
+        "total_ms": now_ms(),
+        "steps": [reports[plan["name"]] for plan in ordered],
+        "critical_path": _critical_path(plans, finish_at),
+        "variables": merged_variables
+    }
+
+
+def _critical_path(plans, finish_at):
+    """关键路径：从最后结束的步骤沿最晚结束的依赖回溯，即决定总耗时的步骤链"""
+    if not finish_at:
+        return []
+    name = max(finish_at, key=finish_at.get)
+    path = [name]
+    while True:
+        deps = [d for d in plans[name]["deps"] if d in finish_at]
+        if not deps:
+            break
+        name = max(deps, key=finish_at.get)
+        path.append(name)
+    return list(reversed(path))